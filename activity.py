@@ -0,0 +1,158 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+class ActivityScheduler:
+    """Drop to a low-power schedule while nobody is signing
+
+    While ACTIVE every frame is captured and searched for a hand. After idle_after seconds
+    without a hand the scheduler goes IDLE: capture slows to one frame per idle_interval,
+    the UI repaints less often, and only every `every`-th frame is looked at, first with a
+    cheap frame difference on a 32x24 grey thumbnail. Motion is a change of more than
+    pixel_threshold grey levels in at least motion_fraction of the thumbnail pixels, so a
+    hand entering a corner counts as much as one in the middle. Motion switches straight
+    back to ACTIVE. A hand that is already in view or moves too slowly to register is
+    caught by running the detector anyway on every detect_every-th idle frame (0 never).
+    idle_after=0 never goes idle.
+
+    CPU and wall time are accumulated per state. Each wake-up records the time from the
+    last check that saw nothing to the first hand found.
+    """
+
+    def __init__(self, idle_after=5.0, idle_interval=0.2, every=2, pixel_threshold=20, motion_fraction=0.01,
+                 detect_every=10, idle_paint_ms=100):
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.every = every
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.detect_every = detect_every
+        self.idle_paint_ms = idle_paint_ms
+
+        self.state = ACTIVE
+        self.last_activity = time.monotonic()
+        self.seen = 0
+        self.thumb = None
+        self.last_quiet = None
+        self.waking_since = None
+
+        self.wall = {ACTIVE: 0.0, IDLE: 0.0}
+        self.cpu = {ACTIVE: 0.0, IDLE: 0.0}
+        self.mark = (time.monotonic(), time.process_time())
+        self.wakeups = []
+        self.false_wakeups = 0
+        self.skipped = 0
+        self.idle_detections = 0
+
+    def capture_delay(self):
+        """Seconds the capture thread waits between frames"""
+        return self.idle_interval if self.state == IDLE else 0.0
+
+    def paint_delay_ms(self, active_ms=10):
+        return self.idle_paint_ms if self.state == IDLE else active_ms
+
+    def should_detect(self, frame):
+        """Worker thread: whether to run the hand detector on this frame"""
+        if self.state == ACTIVE:
+            return True
+        self.seen += 1
+        if self.detect_every and self.seen % self.detect_every == 0:
+            self.idle_detections += 1
+            return True
+        if self.seen % self.every or not self._moved(frame):
+            if self.seen % self.every == 0:
+                self.last_quiet = time.monotonic()
+            self.skipped += 1
+            return False
+        waking_since = self.last_quiet or time.monotonic()
+        self._switch(ACTIVE)
+        self.waking_since = waking_since
+        return True
+
+    def report(self, hand_found):
+        """Worker thread: the result of a detection that should_detect() allowed"""
+        now = time.monotonic()
+        if hand_found:
+            if self.state == IDLE:
+                # Found by an idle detection rather than motion
+                self.waking_since = self.last_quiet or now
+                self._switch(ACTIVE)
+            self.last_activity = now
+            if self.waking_since is not None:
+                self.wakeups.append(now - self.waking_since)
+                self.waking_since = None
+        elif self.idle_after > 0 and self.state == ACTIVE and now - self.last_activity > self.idle_after:
+            if self.waking_since is not None:
+                self.false_wakeups += 1
+                self.waking_since = None
+            self._switch(IDLE)
+
+    def _moved(self, frame):
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(grey, (32, 24), interpolation=cv2.INTER_AREA).astype(np.int16)
+        prev, self.thumb = self.thumb, thumb
+        if prev is None:
+            return False
+        changed = np.count_nonzero(np.abs(thumb - prev) > self.pixel_threshold)
+        return changed >= self.motion_fraction * thumb.size
+
+    def _switch(self, state):
+        self._account()
+        self.state = state
+        self.thumb = None
+        self.seen = 0
+        self.last_quiet = None
+        # A wake-up gets a full idle_after of grace before it can go idle again
+        self.last_activity = time.monotonic()
+
+    def _account(self):
+        wall, cpu = time.monotonic(), time.process_time()
+        self.wall[self.state] += wall - self.mark[0]
+        self.cpu[self.state] += cpu - self.mark[1]
+        self.mark = (wall, cpu)
+
+    def stats(self):
+        """{'state', 'wall', 'cpu_percent', 'wakeups', 'false_wakeups', 'wake_latency_mean/max', 'skipped',
+        'idle_detections'}"""
+        self._account()
+        latencies = self.wakeups
+        return {
+            'state': self.state,
+            'wall': dict(self.wall),
+            'cpu_percent': {s: 100.0 * self.cpu[s] / self.wall[s] if self.wall[s] else 0.0 for s in self.wall},
+            'wakeups': len(latencies),
+            'false_wakeups': self.false_wakeups,
+            'wake_latency_mean': float(np.mean(latencies)) if latencies else None,
+            'wake_latency_max': max(latencies) if latencies else None,
+            'skipped': self.skipped,
+            'idle_detections': self.idle_detections,
+        }
+
+    def summary_text(self):
+        s = self.stats()
+        text = (f"active {s['wall'][ACTIVE]:.0f}s at {s['cpu_percent'][ACTIVE]:.0f}% CPU, "
+                f"idle {s['wall'][IDLE]:.0f}s at {s['cpu_percent'][IDLE]:.0f}% CPU, "
+                f"{s['wakeups']} wake-ups ({s['false_wakeups']} without a hand)")
+        if s['wakeups']:
+            text += f", wake-up latency mean {s['wake_latency_mean']:.2f}s max {s['wake_latency_max']:.2f}s"
+        return text
+
+
+def activity_scheduler_from_env():
+    """SIGN_IDLE_AFTER seconds without a hand (0 disables), SIGN_IDLE_INTERVAL, SIGN_IDLE_EVERY,
+    SIGN_IDLE_PIXEL grey levels and SIGN_IDLE_MOTION fraction of pixels that count as motion,
+    SIGN_IDLE_DETECT_EVERY idle frames between detections without motion (0 never)"""
+    return ActivityScheduler(
+        idle_after=float(os.environ.get("SIGN_IDLE_AFTER", 5.0)),
+        idle_interval=float(os.environ.get("SIGN_IDLE_INTERVAL", 0.2)),
+        every=int(os.environ.get("SIGN_IDLE_EVERY", 2)),
+        pixel_threshold=float(os.environ.get("SIGN_IDLE_PIXEL", 20)),
+        motion_fraction=float(os.environ.get("SIGN_IDLE_MOTION", 0.01)),
+        detect_every=int(os.environ.get("SIGN_IDLE_DETECT_EVERY", 10)),
+    )
@@ -2,20 +2,23 @@ import streamlit as st
 import subprocess
 import sys
 import os
-import pymongo
 import time
 import io
 from dotenv import load_dotenv
-from deep_translator import GoogleTranslator
+from sentence_feed import shared_feed
+from history_store import LIST_FIELDS
+import resources
+from supervisor import RecognizerSupervisor
 
 # Load environment variables
 load_dotenv()
 
 class SignLanguageLogic:
     def __init__(self):
-        self.mongo_client = pymongo.MongoClient('mongodb://localhost:27017/SIGN')
-        self.mongo_db = self.mongo_client['SIGN']
-        self.mongo_collection = self.mongo_db['sentences']
+        # Shared pooled client; creating the logic object on every rerun is cheap
+        self.mongo_client = resources.get_mongo_client()
+        self.mongo_db = self.mongo_client[resources.MONGO_DB]
+        self.mongo_collection = self.mongo_db[resources.MONGO_COLLECTION]
         
         # Language dictionary for translation
         self.lang_dict = {
@@ -42,17 +45,32 @@ class SignLanguageLogic:
         # Control flag for storing text
         self.should_store_text = False
     
+    def health(self):
+        """Status of the shared MongoDB client, translators and TTS engine"""
+        return resources.health()
+    
     def get_language_keys(self):
         """Get sorted language keys with English first"""
         return ['English'] + sorted([k for k in self.lang_dict if k != 'English'])
     
     def launch_sign_detection(self):
-        """Launch the sign language detection window"""
-        python_executable = sys.executable
-        script_path = os.path.join(os.getcwd(), "final_pred.py")
-        os.system(f'start "" "{python_executable}" "{script_path}"')
+        """Launch the sign language detection window, reusing one that is already running"""
+        started, status = RecognizerSupervisor().start()
+        if not started:
+            state = "ready" if status['ready'] else "still starting"
+            return f"Sign language detection is already running (pid {status['pid']}, {state})."
         return "Sign language detection started! Please check for a new window."
     
+    def stop_sign_detection(self):
+        """Close the detection window if it is running"""
+        if RecognizerSupervisor().stop():
+            return "Sign language detection stopped."
+        return "Sign language detection is not running."
+    
+    def detection_status(self):
+        """{'alive', 'ready', 'pid', 'uptime'} of the detection process"""
+        return RecognizerSupervisor().status()
+    
     def get_current_sentence(self):
         """Get the current detected sentence from MongoDB"""
         sentence_doc = self.mongo_collection.find_one({'_id': 'current'})
@@ -60,30 +78,30 @@ class SignLanguageLogic:
             return sentence_doc['sentence']
         return ""
     
+    def get_live_sentence(self):
+        """(version, sentence) from the pushed sentence feed, without a database round trip"""
+        return shared_feed(self.mongo_collection).snapshot()
+    
     def translate_sentence(self, sentence, target_lang):
         """Translate a sentence to the target language"""
         if sentence.strip():
             try:
-                translated_text = GoogleTranslator(source='auto', target=target_lang).translate(sentence)
+                translated_text = resources.get_translation_service().translate(sentence, target_lang)
                 return translated_text
             except Exception as e:
                 return f"Translation error: {e}"
         return ""
     
+    def translate_many(self, sentences, target_langs):
+        """Translate every sentence into every language at once; failures become error strings"""
+        results = resources.get_translation_service().translate_many(sentences, target_langs)
+        return {key: f"Translation error: {value}" if isinstance(value, Exception) else value
+                for key, value in results.items()}
+    
     def speak_text(self, text):
-        """Convert text to speech"""
+        """Queue text for speech; True once queued, otherwise the reason it was not"""
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 150)
-            engine.say(text)
-            engine.runAndWait()
-            return True
-        except RuntimeError as e:
-            if "run loop already started" in str(e):
-                return "Text-to-speech is already running. Please wait a moment."
-            else:
-                return f"Text-to-speech error: {e}"
+            return resources.speak(text, rate=150)
         except Exception as e:
             return f"Text-to-speech error: {e}"
     
@@ -129,14 +147,17 @@ class SignLanguageLogic:
             except Exception as e:
                 return f"Groq API error: {e}"
     
-    def get_detection_history(self, limit=20):
-        """Get detection history from MongoDB"""
-        history_docs = list(self.mongo_collection.find({'_id': {'$ne': 'current'}}).sort('timestamp', -1).limit(limit))
-        return history_docs
+    def get_detection_history(self, limit=20, fields=LIST_FIELDS):
+        """Get the newest detection history entries from MongoDB"""
+        return resources.get_history_store().recent(limit, fields)
+    
+    def get_history_page(self, limit=20, after=None, fields=LIST_FIELDS):
+        """One page of history and the cursor for the next (older) page, or None"""
+        return resources.get_history_store().page(limit, after, fields)
     
     def delete_history_item(self, doc_id):
         """Delete a history item from MongoDB"""
-        self.mongo_collection.delete_one({'_id': doc_id})
+        resources.get_history_store().delete(doc_id)
         return True
     
     def get_last_word_from_sentence(self, sentence):
@@ -233,13 +254,7 @@ class SignLanguageLogic:
     
     def get_last_stored_sentence(self):
         """Get the last stored sentence from history (excluding current)"""
-        last_doc = self.mongo_collection.find_one(
-            {'_id': {'$ne': 'current'}}, 
-            sort=[('timestamp', -1)]
-        )
-        if last_doc and 'sentence' in last_doc:
-            return last_doc['sentence']
-        return None
+        return resources.get_history_store().last_sentence()
     
     def is_consecutive_duplicate(self, new_sentence):
         """Check if the new sentence is the same as the last stored sentence"""
@@ -276,28 +291,9 @@ class SignLanguageLogic:
         if len(sentence_clean) < 2:
             return "Text must be at least 2 characters long to store."
         
-        # Check if this is a consecutive duplicate
-        last_doc = self.mongo_collection.find_one(
-            {'_id': {'$ne': 'current'}}, 
-            sort=[('timestamp', -1)]
-        )
-        is_duplicate = False
-        if last_doc and 'sentence' in last_doc:
-            is_duplicate = sentence_clean == last_doc['sentence'].strip()
-        
-        if is_duplicate:
+        # Duplicate check and insert happen together in the history store
+        if resources.get_history_store().add(current_sentence) is None:
             return "This text is already stored (consecutive duplicate)."
-        
-        # Store the text
-        from datetime import datetime
-        history_doc = {
-            'sentence': sentence_clean,
-            'timestamp': datetime.now(),
-            'full_text': current_sentence,
-            'word_count': len(sentence_clean.split()),
-            'char_count': len(sentence_clean)
-        }
-        self.mongo_collection.insert_one(history_doc)
         return f"Successfully stored: '{sentence_clean}'"
     
     def get_storage_status(self):
@@ -2,13 +2,43 @@ import streamlit as st
 import subprocess
 import sys
 import os
-import pymongo
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.let_it_rain import rain
 import time
 import io
 from dotenv import load_dotenv
-from deep_translator import GoogleTranslator
+from sentence_feed import shared_feed
+from resources import get_collection, get_history_store, get_translation_service, health, speak
+from history_store import OPTION_FIELDS
+from supervisor import RecognizerSupervisor
+
+# The live sentence is repainted from the in-memory feed at most this often (seconds)
+FEED_REFRESH = float(os.environ.get("SIGN_FEED_REFRESH", 0.5))
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@fragment(run_every=FEED_REFRESH)
+def live_sentence(feed, lang_choice, target_lang):
+    """Recent message and its translation; reruns on its own without rerunning the page"""
+    _, recent_sentence = feed.snapshot()
+    if recent_sentence:
+        st.markdown(f"<div style='font-size:1.2em;color:#7b2ff2;font-weight:bold;'>{recent_sentence}</div>", unsafe_allow_html=True)
+        # Translate only when the sentence or the language changed
+        if recent_sentence.strip():
+            key = (recent_sentence, target_lang)
+            if st.session_state.get("live_translation_key") != key:
+                try:
+                    st.session_state["live_translation"] = get_translation_service().translate(recent_sentence, target_lang)
+                    st.session_state["live_translation_error"] = None
+                except Exception as e:
+                    st.session_state["live_translation_error"] = e
+                st.session_state["live_translation_key"] = key
+            if st.session_state.get("live_translation_error") is None:
+                st.markdown(f"<div style='font-size:1.1em;color:#43b97f;'><b>Translated ({lang_choice}):</b> {st.session_state['live_translation']}</div>", unsafe_allow_html=True)
+            else:
+                st.warning(f"Translation error: {st.session_state['live_translation_error']}")
+    else:
+        st.write("No message yet.")
 
 # --- App Logo + Title Header ---
 st.set_page_config(
@@ -117,11 +147,11 @@ if page == "Home":
 
 elif page == "ASL to Text":
     # --- ASL to Text Section (current main logic) ---
-    from deep_translator import GoogleTranslator
-    mongo_client = pymongo.MongoClient('mongodb://localhost:27017/SIGN')
-    mongo_db = mongo_client['SIGN']
-    mongo_collection = mongo_db['sentences']
+    mongo_collection = get_collection()
     load_dotenv()
+    mongo_status = health()['mongo']
+    if mongo_status != 'ok':
+        st.warning(f"MongoDB unavailable: {mongo_status}")
     
     # Language selection (English default, scrollable)
     lang_dict = {
@@ -148,50 +178,36 @@ elif page == "ASL to Text":
     lang_choice = st.selectbox("Select language for translation:", lang_keys, index=0)
     target_lang = lang_dict[lang_choice]
     
-    if st.button("Launch Sign Language Detection", help="Open the sign language detection window."):
-        python_executable = sys.executable  # Path to the current Python interpreter
-        script_path = os.path.join(os.getcwd(), "final_pred.py")
-        os.system(f'start "" "{python_executable}" "{script_path}"')
-        st.success("Sign language detection started! Please check for a new window.")
+    supervisor = RecognizerSupervisor()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        if st.button("Launch Sign Language Detection", help="Open the sign language detection window."):
+            started, detection = supervisor.start()
+            if started:
+                st.success("Sign language detection started! Please check for a new window.")
+            else:
+                st.info(f"Sign language detection is already running (pid {detection['pid']}).")
+    with col2:
+        if st.button("⏹ Stop Detection", help="Close the sign language detection window."):
+            st.info("Sign language detection stopped." if supervisor.stop() else "Sign language detection is not running.")
     
     st.markdown("<hr style='border:1px solid #eee; margin:2em 0;'>", unsafe_allow_html=True)
     colored_header(
         label="Recent Message",
-        description="Latest detected sentence, with options to speak, refresh, or correct.",
+        description="Latest detected sentence, updated live, with options to speak or correct.",
         color_name="blue-70"
     )
-    col1, col2, col3, col4 = st.columns([5, 1, 1, 3])
+    feed = shared_feed(mongo_collection)
+    col1, col2, col4 = st.columns([5, 1, 3])
     with col1:
-        sentence_doc = mongo_collection.find_one({'_id': 'current'})
-        if sentence_doc and 'sentence' in sentence_doc:
-            recent_sentence = sentence_doc['sentence']
-            st.markdown(f"<div style='font-size:1.2em;color:#7b2ff2;font-weight:bold;'>{recent_sentence}</div>", unsafe_allow_html=True)
-            # Translate the sentence
-            if recent_sentence.strip():
-                try:
-                    translated_text = GoogleTranslator(source='auto', target=target_lang).translate(recent_sentence)
-                    st.markdown(f"<div style='font-size:1.1em;color:#43b97f;'><b>Translated ({lang_choice}):</b> {translated_text}</div>", unsafe_allow_html=True)
-                except Exception as e:
-                    st.warning(f"Translation error: {e}")
-        else:
-            recent_sentence = ""
-            st.write("No message yet.")
+        live_sentence(feed, lang_choice, target_lang)
+    # Buttons act on the sentence as it is when they are pressed
+    _, recent_sentence = feed.snapshot()
     with col2:
         if st.button("🔊", help="Speak the recent message"):
-            try:
-                import pyttsx3
-                engine = pyttsx3.init()
-                engine.setProperty('rate', 150)
-                engine.say(recent_sentence)
-                engine.runAndWait()
-            except RuntimeError as e:
-                if "run loop already started" in str(e):
-                    st.warning("Text-to-speech is already running. Please wait a moment.")
-                else:
-                    st.error(f"Text-to-speech error: {e}")
-    with col3:
-        if st.button("🔄", help="Refresh the recent message"):
-            st.rerun()
+            result = speak(recent_sentence, rate=150)
+            if result != True:
+                st.warning(result)
     with col4:
         st.markdown("<span style='color:#f357a8;font-weight:bold;'>LLM Model:</span> Llama-3", unsafe_allow_html=True)
         if st.button("✨ Correct Grammar & Spelling", help="Use Groq LLM and SpellChecker"):
@@ -289,9 +305,7 @@ elif page == "Text/Voice to Sign":
     # Method 2: Recently Detected Word
     st.markdown("**2. Use Recently Detected Word:**")
     # Fetch latest detected sentence from MongoDB
-    mongo_client = pymongo.MongoClient('mongodb://localhost:27017/SIGN')
-    mongo_db = mongo_client['SIGN']
-    mongo_collection = mongo_db['sentences']
+    mongo_collection = get_collection()
     sentence_doc = mongo_collection.find_one({'_id': 'current'})
     
     if sentence_doc and 'sentence' in sentence_doc and sentence_doc['sentence'].strip():
@@ -313,7 +327,7 @@ elif page == "Text/Voice to Sign":
     # Method 2.5: Select from History
     st.markdown("**2.5. Select from History:**")
     # Fetch recent history for selection
-    history_docs = list(mongo_collection.find({'_id': {'$ne': 'current'}}).sort('timestamp', -1).limit(10))
+    history_docs = get_history_store().recent(10, OPTION_FIELDS)
     if history_docs:
         history_options = []
         for doc in history_docs:
@@ -423,9 +437,7 @@ elif page == "AI Assistant":
         <div style='font-size:1.2em; color:#222; margin-bottom:1em;'>🤖 <b>Ask the AI Assistant</b></div>
     """, unsafe_allow_html=True)
     # Fetch latest detected sentence from MongoDB
-    mongo_client = pymongo.MongoClient('mongodb://localhost:27017/SIGN')
-    mongo_db = mongo_client['SIGN']
-    mongo_collection = mongo_db['sentences']
+    mongo_collection = get_collection()
     sentence_doc = mongo_collection.find_one({'_id': 'current'})
     if sentence_doc and 'sentence' in sentence_doc and sentence_doc['sentence'].strip():
         detected_question = sentence_doc['sentence']
@@ -491,19 +503,9 @@ elif page == "AI Assistant":
     ai_answer = st.session_state.get("ai_answer", "")
     if ai_answer and ai_answer.lower() != "cannot answer":
         if st.button("🔊 Speak AI Response", key="speak_ai_response"):
-            try:
-                import pyttsx3
-                engine = pyttsx3.init()
-                engine.setProperty('rate', 150)
-                engine.say(ai_answer)
-                engine.runAndWait()
-            except RuntimeError as e:
-                if "run loop already started" in str(e):
-                    st.warning("Text-to-speech is already running. Please wait a moment.")
-                else:
-                    st.error(f"Text-to-speech error: {e}")
-            except Exception as e:
-                st.error(f"Text-to-speech error: {e}")
+            result = speak(ai_answer, rate=150)
+            if result != True:
+                st.warning(result)
     st.markdown("</div>", unsafe_allow_html=True)
 
 
@@ -1,11 +1,37 @@
+import os
 import streamlit as st
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.let_it_rain import rain
 from app_logic import SignLanguageLogic
+from history_store import OPTION_FIELDS
 
 # Initialize the logic class
 logic = SignLanguageLogic()
 
+# The live sentence is repainted from the in-memory feed at most this often (seconds)
+FEED_REFRESH = float(os.environ.get("SIGN_FEED_REFRESH", 0.5))
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@fragment(run_every=FEED_REFRESH)
+def live_sentence(lang_choice, target_lang):
+    """Recent message and its translation; reruns on its own without rerunning the page"""
+    _, recent_sentence = logic.get_live_sentence()
+    if recent_sentence:
+        st.markdown(f"<div style='font-size:1.2em;color:#7b2ff2;font-weight:bold;'>{recent_sentence}</div>", unsafe_allow_html=True)
+        # Translate only when the sentence or the language changed
+        key = (recent_sentence, target_lang)
+        if st.session_state.get("live_translation_key") != key:
+            st.session_state["live_translation"] = logic.translate_sentence(recent_sentence, target_lang)
+            st.session_state["live_translation_key"] = key
+        translated_text = st.session_state["live_translation"]
+        if translated_text and not translated_text.startswith("Translation error"):
+            st.markdown(f"<div style='font-size:1.1em;color:#43b97f;'><b>Translated ({lang_choice}):</b> {translated_text}</div>", unsafe_allow_html=True)
+        elif translated_text.startswith("Translation error"):
+            st.warning(translated_text)
+    else:
+        st.write("No message yet.")
+
 # --- App Logo + Title Header ---
 st.set_page_config(
     page_title="SignBridge AI",
@@ -124,10 +150,26 @@ elif page == "ASL to Text":
     lang_choice = st.selectbox("Select language for translation:", lang_keys, index=0)
     target_lang = logic.lang_dict[lang_choice]
     
-    # Launch detection button
-    if st.button("Launch Sign Language Detection", help="Open the sign language detection window."):
-        result = logic.launch_sign_detection()
-        st.success(result)
+    # Launch detection button; a running detection window is reused
+    col1, col2, col3 = st.columns([2, 1, 2])
+    with col1:
+        if st.button("Launch Sign Language Detection", help="Open the sign language detection window."):
+            st.success(logic.launch_sign_detection())
+    with col2:
+        if st.button("⏹ Stop", key="stop_detection_btn", help="Close the sign language detection window."):
+            st.info(logic.stop_sign_detection())
+    with col3:
+        detection = logic.detection_status()
+        if detection['ready']:
+            st.markdown(f"🟢 **Detection:** running ({detection['uptime'] / 60:.0f} min)")
+        elif detection['alive']:
+            st.markdown("🟡 **Detection:** starting…")
+        else:
+            st.markdown("⚪ **Detection:** not running")
+    
+    mongo_status = logic.health()['mongo']
+    if mongo_status != 'ok':
+        st.warning(f"MongoDB unavailable: {mongo_status}")
     
     # Storage Control Section
     st.markdown("<hr style='border:1px solid #eee; margin:1em 0;'>", unsafe_allow_html=True)
@@ -177,23 +219,15 @@ elif page == "ASL to Text":
     # Recent Message Section
     colored_header(
         label="Recent Message",
-        description="Latest detected sentence, with options to speak, refresh, or correct.",
+        description="Latest detected sentence, updated live, with options to speak or correct.",
         color_name="blue-70"
     )
     
-    col1, col2, col3, col4 = st.columns([5, 1, 1, 3])
+    col1, col2, col3 = st.columns([5, 1, 3])
     with col1:
-        recent_sentence = logic.get_current_sentence()
-        if recent_sentence:
-            st.markdown(f"<div style='font-size:1.2em;color:#7b2ff2;font-weight:bold;'>{recent_sentence}</div>", unsafe_allow_html=True)
-            # Translate the sentence
-            translated_text = logic.translate_sentence(recent_sentence, target_lang)
-            if translated_text and not translated_text.startswith("Translation error"):
-                st.markdown(f"<div style='font-size:1.1em;color:#43b97f;'><b>Translated ({lang_choice}):</b> {translated_text}</div>", unsafe_allow_html=True)
-            elif translated_text.startswith("Translation error"):
-                st.warning(translated_text)
-        else:
-            st.write("No message yet.")
+        live_sentence(lang_choice, target_lang)
+    # Buttons act on the sentence as it is when they are pressed
+    _, recent_sentence = logic.get_live_sentence()
     
     with col2:
         if st.button("🔊", help="Speak the recent message"):
@@ -202,10 +236,6 @@ elif page == "ASL to Text":
                 st.warning(result)
     
     with col3:
-        if st.button("🔄", help="Refresh the recent message"):
-            st.rerun()
-    
-    with col4:
         st.markdown("<span style='color:#f357a8;font-weight:bold;'>LLM Model:</span> Llama-3", unsafe_allow_html=True)
         if st.button("✨ Correct Grammar & Spelling", help="Use Groq LLM and SpellChecker"):
             if recent_sentence.strip():
@@ -239,10 +269,15 @@ elif page == "ASL to Text":
     with col2:
         if st.button("🗑️ Clear All History", key="clear_all_history_btn", type="secondary"):
             result = logic.clear_all_history()
+            st.session_state["history_cursors"] = [None]
             st.success(result)
             st.rerun()
     
-    history_docs = logic.get_detection_history(20)
+    # Keyset pagination: the cursor of every page shown so far, newest page first
+    if "history_cursors" not in st.session_state:
+        st.session_state["history_cursors"] = [None]
+    history_cursors = st.session_state["history_cursors"]
+    history_docs, next_cursor = logic.get_history_page(20, history_cursors[-1])
     if history_docs:
         for i, doc in enumerate(history_docs):
             timestamp = doc.get('timestamp', 'Unknown time')
@@ -277,6 +312,31 @@ elif page == "ASL to Text":
                         logic.delete_history_item(doc['_id'])
                         st.success("Deleted from history!")
                         st.rerun()
+        
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            if len(history_cursors) > 1 and st.button("◀ Newer", key="history_newer_btn"):
+                history_cursors.pop()
+                st.rerun()
+        with col2:
+            if next_cursor is not None and st.button("Older ▶", key="history_older_btn"):
+                history_cursors.append(next_cursor)
+                st.rerun()
+        
+        with st.expander("🌐 Translate this page"):
+            history_langs = st.multiselect("Languages:", lang_keys, key="history_langs")
+            if history_langs and st.button("Translate", key="translate_history_btn"):
+                sentences = [doc.get('sentence', '') for doc in history_docs]
+                codes = [logic.lang_dict[lang] for lang in history_langs]
+                with st.spinner("Translating..."):
+                    translations = logic.translate_many(sentences, codes)
+                st.table([
+                    {'Sentence': sentence, **{lang: translations[(sentence, code)] for lang, code in zip(history_langs, codes)}}
+                    for sentence in dict.fromkeys(sentences)
+                ])
+    elif len(history_cursors) > 1:
+        st.session_state["history_cursors"] = [None]
+        st.rerun()
     else:
         st.info("No detection history yet. Start using sign language detection to build history!")
     
@@ -325,7 +385,7 @@ elif page == "Text/Voice to Sign":
     
     # Method 2.5: Select from History
     st.markdown("**2.5. Select from History:**")
-    history_docs = logic.get_detection_history(10)
+    history_docs = logic.get_detection_history(10, OPTION_FIELDS)
     
     if history_docs:
         history_options = []
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from classifiers import CNN_MODEL_PATH
+from cnn_inference import CNN_BACKENDS, CnnRunner
+from skeleton import SkeletonRenderer, skeleton_shift
+
+
+def synthetic_skeletons(n, seed=0):
+    """Render n random hand-sized skeletons the way final_pred.py feeds the CNN"""
+    rng = np.random.default_rng(seed)
+    renderer = SkeletonRenderer()
+    images = []
+    for _ in range(n):
+        w, h = rng.integers(120, 260, size=2)
+        pts = np.column_stack([rng.integers(0, w, 21), rng.integers(0, h, 21)])
+        images.append(renderer.render(pts, skeleton_shift(w, h)).copy())
+    return np.stack(images)
+
+
+def benchmark(runner, images):
+    """Time single-frame calls; returns (fps, mean ms, p95 ms, probabilities)"""
+    times = []
+    probs = []
+    for image in images:
+        start = time.perf_counter()
+        probs.append(runner(image[None])[0])
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000.0
+    return 1000.0 / times.mean(), times.mean(), np.percentile(times, 95), np.stack(probs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CNN inference backends on single-frame latency")
+    parser.add_argument("--model", default=CNN_MODEL_PATH)
+    parser.add_argument("--backends", default=",".join(CNN_BACKENDS), help="comma separated subset of " + ",".join(CNN_BACKENDS))
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    images = synthetic_skeletons(args.frames)
+    reference = None
+    print(f"{'backend':<10}{'fps':>9}{'mean ms':>10}{'p95 ms':>9}{'startup s':>11}{'max |dp|':>11}{'agree':>8}")
+    for backend in args.backends.split(","):
+        backend = backend.strip()
+        start = time.perf_counter()
+        try:
+            runner = CnnRunner(args.model, backend)
+            runner.warmup()
+        except ImportError as e:
+            print(f"{backend:<10}skipped: {e}")
+            continue
+        startup = time.perf_counter() - start
+
+        fps, mean_ms, p95_ms, probs = benchmark(runner, images)
+        if reference is None:
+            reference = probs
+        diff = np.abs(probs - reference).max()
+        agree = (probs.argmax(axis=1) == reference.argmax(axis=1)).mean()
+        print(f"{backend:<10}{fps:>9.1f}{mean_ms:>10.2f}{p95_ms:>9.2f}{startup:>11.2f}{diff:>11.2e}{agree:>8.1%}")
@@ -0,0 +1,177 @@
+import argparse
+import json
+import time
+from collections import defaultdict
+
+import cv2
+
+from frame_sources import CaptureSource, bbox_from_pts, open_source
+from group_rules import RuleEngine, rules_palm_from_env, top_two
+from motion_gate import MotionGate
+from profiling import StageProfiler
+from skeleton import SkeletonRenderer, skeleton_input, skeleton_palm_from_env
+
+
+def run(source, tracker, classifier, limit=None, flip=False, profiler=None, gate=None, skeleton_palm=None,
+        rules_palm=None):
+    """Run detect -> render -> predict -> rules over every item of a frame source
+
+    With a motion_gate.MotionGate, frames whose landmarks have not moved reuse the last
+    symbol. skeleton_palm draws every skeleton at that palm size (see skeleton.skeleton_input)
+    and rules_palm rescales hands for the rules (see group_rules.RuleEngine).
+    Returns (frames, seconds, {label: [correct, total]}, frames without a hand).
+    """
+    profiler = profiler or StageProfiler()
+    renderer = SkeletonRenderer()
+    rules = RuleEngine(palm=rules_palm)
+    per_label = defaultdict(lambda: [0, 0])
+    frames = missed = 0
+    start = time.monotonic()
+    for item in source:
+        if limit and frames >= limit:
+            break
+        frames += 1
+
+        if 'pts' in item:
+            pts = item['pts']
+            x, y, w, h = item.get('bbox') or bbox_from_pts(pts)
+        else:
+            image = cv2.flip(item['image'], 1) if flip else item['image']
+            hand, _ = tracker.detect(image)
+            if not hand:
+                missed += 1
+                if gate:
+                    gate.reset()
+                if item['label'] is not None:
+                    per_label[item['label']][1] += 1
+                continue
+            pts = hand['lmList']
+            x, y, w, h = hand['bbox']
+
+        symbol = gate.lookup(pts) if gate else None
+        if symbol is None:
+            with profiler.measure("render"):
+                skeleton = renderer.render(*skeleton_input(pts, w, h, tracker.offset, skeleton_palm))
+            with profiler.measure("inference"):
+                prob = classifier.predict(image=skeleton, pts=pts)
+            with profiler.measure("rules"):
+                ch1, ch2 = top_two(prob)
+                symbol = rules.classify(ch1, ch2, pts)
+            if gate:
+                gate.store(symbol)
+
+        if item['label'] is not None:
+            stats = per_label[item['label']]
+            stats[0] += str(symbol).strip().upper() == str(item['label']).strip().upper()
+            stats[1] += 1
+    return frames, time.monotonic() - start, dict(per_label), missed
+
+
+def detection_ms(snapshot, frames):
+    """Mean hand search cost per frame: full-frame detection, roi tracking and cropping"""
+    total = sum(snapshot[s]['mean'] * snapshot[s]['count'] for s in ("track", "detect", "crop") if s in snapshot)
+    return total / frames if frames else 0.0
+
+
+if __name__ == "__main__":
+    from classifiers import load_classifier
+    from hand_tracking import DETECTION_MODES, HandTracker
+
+    parser = argparse.ArgumentParser(description="Benchmark the recognizer without a camera")
+    parser.add_argument("source", help="video file, image directory (e.g. AtoZ_3.1), .jsonl landmark recording or camera index")
+    parser.add_argument("--label", default=None, help="expected symbol for every frame of an unlabelled source")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many frames")
+    parser.add_argument("--mode", choices=DETECTION_MODES, default="cascade", help="hand detection mode")
+    parser.add_argument("--classifier", default=None, help="cnn, landmark or remote (default SIGN_CLASSIFIER)")
+    parser.add_argument("--no-flip", action="store_true", help="do not mirror camera/video frames")
+    parser.add_argument("--json", default=None, help="append the report as a JSON line to this file")
+    parser.add_argument("--detect-scale", type=float, default=1.0, help="resize factor for palm detection")
+    parser.add_argument("--skeleton-palm", type=float, default=skeleton_palm_from_env() or 0,
+                        help="palm size in pixels for rendered skeletons, 0 for the crop size")
+    parser.add_argument("--rules-palm", type=float, default=rules_palm_from_env() or 0,
+                        help="palm size in pixels the rules rescale hands to, 0 for the crop pixels")
+    parser.add_argument("--compare-palm", type=float, default=0,
+                        help="run again with skeletons and rules at this palm size and compare per-letter accuracy")
+    parser.add_argument("--compare-mode", choices=DETECTION_MODES, default=None,
+                        help="run again with this hand detection mode and compare the detection cost")
+    parser.add_argument("--motion-tolerance", type=float, default=0.0,
+                        help="reuse the last symbol while landmarks move less than this many palm sizes")
+    args = parser.parse_args()
+
+    source = open_source(args.source, args.label)
+    profiler = StageProfiler(window=100000)
+    tracker = HandTracker(mode=args.mode, profiler=profiler, detect_scale=args.detect_scale)
+    classifier = load_classifier(args.classifier)
+    # Recorded video comes straight from the webcam, which the recognizers mirror
+    flip = isinstance(source, CaptureSource) and not args.no_flip
+
+    gate = MotionGate(args.motion_tolerance) if args.motion_tolerance > 0 else None
+
+    frames, seconds, per_label, missed = run(source, tracker, classifier, args.limit, flip, profiler, gate,
+                                             args.skeleton_palm or None, args.rules_palm or None)
+    source.release()
+
+    compared = None
+    if args.compare_palm:
+        palm_profiler = StageProfiler()
+        palm_tracker = HandTracker(mode=args.mode, profiler=palm_profiler, detect_scale=args.detect_scale)
+        source = open_source(args.source, args.label)
+        _, _, compared, _ = run(source, palm_tracker, classifier, args.limit, flip, palm_profiler,
+                                MotionGate(args.motion_tolerance) if gate else None,
+                                args.compare_palm, args.compare_palm)
+        source.release()
+
+    compared_mode = None
+    if args.compare_mode:
+        mode_profiler = StageProfiler(window=100000)
+        mode_tracker = HandTracker(mode=args.compare_mode, profiler=mode_profiler, detect_scale=args.detect_scale)
+        source = open_source(args.source, args.label)
+        mode_frames, _, _, mode_missed = run(source, mode_tracker, classifier, args.limit, flip, mode_profiler,
+                                             MotionGate(args.motion_tolerance) if gate else None,
+                                             args.skeleton_palm or None, args.rules_palm or None)
+        source.release()
+        compared_mode = {'mode': args.compare_mode, 'detection_ms': detection_ms(mode_profiler.snapshot(), mode_frames),
+                         'missed': mode_missed, 'tracking': mode_tracker.tracking_stats()}
+
+    print(f"{frames} frames in {seconds:.2f} s: {frames / seconds if seconds else 0.0:.1f} fps, {missed} without a hand")
+    print(profiler.summary_text())
+    if gate:
+        print("Motion gate:", gate.summary_text(profiler.snapshot()))
+    if args.mode == "roi":
+        stats = tracker.tracking_stats()
+        print(f"Tracking: {stats['hits']} hits, {stats['redetections']} re-detections ({stats['hit_rate']:.0%} hit rate)")
+    if compared_mode is not None:
+        before = detection_ms(profiler.snapshot(), frames)
+        after = compared_mode['detection_ms']
+        print(f"Hand search per frame: {args.mode} {before:.1f} ms, {missed} without a hand -> "
+              f"{args.compare_mode} {after:.1f} ms, {compared_mode['missed']} without a hand ({after - before:+.1f} ms)")
+    if per_label:
+        correct = sum(c for c, _ in per_label.values())
+        total = sum(t for _, t in per_label.values())
+        for label in sorted(per_label):
+            c, t = per_label[label]
+            print(f"{label:>10}: {c / t:6.1%} ({c}/{t})")
+        print(f"{'overall':>10}: {correct / total:6.1%} ({correct}/{total})")
+
+    if compared is not None:
+        print(f"Per-letter accuracy, as run above vs skeletons and rules at palm {args.compare_palm:g} px:")
+        for label in sorted(set(per_label) | set(compared)):
+            a, b = per_label.get(label, [0, 0]), compared.get(label, [0, 0])
+            ra = a[0] / a[1] if a[1] else 0.0
+            rb = b[0] / b[1] if b[1] else 0.0
+            print(f"{label:>10}: {ra:6.1%} -> {rb:6.1%} ({rb - ra:+.1%})")
+
+    if args.json:
+        report = {
+            'source': args.source, 'mode': args.mode, 'detect_scale': args.detect_scale,
+            'skeleton_palm': args.skeleton_palm, 'rules_palm': args.rules_palm, 'frames': frames, 'seconds': seconds,
+            'missed': missed, 'stages': profiler.snapshot(),
+            'motion_tolerance': args.motion_tolerance, 'gate_skipped': gate.skipped if gate else 0,
+            'tracking': tracker.tracking_stats(), 'detection_ms': detection_ms(profiler.snapshot(), frames),
+            'compare_mode': compared_mode,
+            'accuracy': {label: c / t for label, (c, t) in per_label.items()},
+            'compare_palm': args.compare_palm,
+            'compare_accuracy': {label: c / t for label, (c, t) in (compared or {}).items()},
+        }
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
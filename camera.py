@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from profiling import get_logger
+from paths import STATE_DIR
+
+log = get_logger("sign.camera")
+
+BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+
+# Tried in order by probe(). The empty entry is whatever the driver does unconfigured;
+# MJPG lets USB webcams deliver full frame rates that YUYV only reaches at low resolution.
+CANDIDATES = (
+    {},
+    {'fourcc': 'MJPG', 'width': 640, 'height': 480, 'fps': 30, 'buffer': 1},
+    {'fourcc': 'MJPG', 'width': 640, 'height': 480, 'fps': 60, 'buffer': 1},
+    {'fourcc': 'MJPG', 'width': 1280, 'height': 720, 'fps': 30, 'buffer': 1},
+    {'fourcc': 'YUYV', 'width': 640, 'height': 480, 'fps': 30, 'buffer': 1},
+)
+
+
+def open_camera(index=0, backend="any", fourcc=None, width=None, height=None, fps=None, buffer=None):
+    """cv2.VideoCapture for a camera index with the given format, size, rate and driver buffer"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown camera backend '{backend}', expected one of {tuple(BACKENDS)}")
+    capture = cv2.VideoCapture(index, BACKENDS[backend])
+    if not capture.isOpened():
+        raise IOError(f"Cannot open camera {index} ({backend})")
+    # V4L2 negotiates the pixel format first; size and rate are then chosen within it
+    if fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    if width:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height:
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        capture.set(cv2.CAP_PROP_FPS, fps)
+    if buffer:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer)
+    return capture
+
+
+def fourcc_name(capture):
+    code = int(capture.get(cv2.CAP_PROP_FOURCC))
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00 ") or None
+
+
+def frame_age_ms(capture):
+    """Age of the last frame read, from the driver timestamp; None where the backend has none
+
+    V4L2 stamps each buffer with the monotonic clock when the frame is captured, so this
+    is the glass-to-frame latency minus the exposure time.
+    """
+    stamp = capture.get(cv2.CAP_PROP_POS_MSEC)
+    if stamp <= 0:
+        return None
+    age = 1000.0 * time.monotonic() - stamp
+    return age if 0 <= age < 5000 else None
+
+
+def measure(capture, frames=30, warmup=5):
+    """Delivered frame rate and frame latency of an open camera, or None if it delivers nothing
+
+    Returns {'width', 'height', 'fourcc', 'fps', 'latency_ms', 'latency_source', 'buffered'}.
+    latency_ms is the median driver timestamp age; backends without timestamps get one
+    frame interval, a lower bound. buffered counts the frames that come back at once after
+    a 0.25 s stall: 1 means only the newest frame was waiting, more means a slow loop
+    reads stale frames first.
+    """
+    for _ in range(warmup):
+        capture.read()
+    ages = []
+    shape = None
+    delivered = 0
+    start = time.monotonic()
+    for _ in range(frames):
+        ok, frame = capture.read()
+        if not ok:
+            break
+        shape = frame.shape
+        delivered += 1
+        age = frame_age_ms(capture)
+        if age is not None:
+            ages.append(age)
+    if shape is None:
+        return None
+    seconds = time.monotonic() - start
+    fps = delivered / seconds if seconds else 0.0
+    interval = 1.0 / fps if fps else 0.0
+
+    # Queued frames come back much faster than the camera produces new ones
+    time.sleep(0.25)
+    buffered = 0
+    for _ in range(8):
+        start = time.monotonic()
+        ok, _ = capture.read()
+        if not ok or time.monotonic() - start > 0.3 * interval:
+            break
+        buffered += 1
+
+    return {
+        'width': shape[1], 'height': shape[0], 'fourcc': fourcc_name(capture), 'fps': fps,
+        'latency_ms': float(np.median(ages)) if ages else 1000.0 * interval,
+        'latency_source': "driver" if ages else "estimate",
+        'buffered': buffered,
+    }
+
+
+def describe(settings, result=None):
+    text = " ".join(f"{k}={v}" for k, v in settings.items()) or "driver defaults"
+    if result:
+        text += (f": {result['fourcc']} {result['width']}x{result['height']} {result['fps']:.1f} fps, "
+                 f"{result['latency_ms']:.0f} ms ({result['latency_source']}), {result['buffered']} buffered")
+    return text
+
+
+def probe(index=0, backend="any", candidates=CANDIDATES, min_width=640, min_height=480, min_fps=20.0,
+          frames=30):
+    """Measure every candidate setting and return (best settings, [(settings, result)])
+
+    The best setting is the lowest-latency one (to 5 ms), then the fastest, among those that deliver
+    at least min_width x min_height at min_fps; if none does, among all that delivered.
+    """
+    results = []
+    for settings in candidates:
+        try:
+            capture = open_camera(index, backend, **settings)
+        except IOError as e:
+            log.warning("%s", e)
+            continue
+        try:
+            result = measure(capture, frames)
+        finally:
+            capture.release()
+        if result is None:
+            continue
+        log.info("Camera %d %s", index, describe(settings, result))
+        results.append((settings, result))
+
+    good = [(s, r) for s, r in results
+            if r['width'] >= min_width and r['height'] >= min_height and r['fps'] >= min_fps]
+    if not good:
+        log.warning("No camera setting delivers %dx%d at %.0f fps", min_width, min_height, min_fps)
+    pool = good or results
+    if not pool:
+        return {}, results
+    best = min(pool, key=lambda sr: (round(sr[1]['latency_ms'] / 5.0), -sr[1]['fps']))
+    return best[0], results
+
+
+def _cache_path(backend, index):
+    return os.path.join(STATE_DIR, f"camera-{backend}-{index}.json")
+
+
+def camera_settings_from_env(index=0, probe_missing=True):
+    """(backend, settings) for a camera: explicit SIGN_CAMERA_* values, else a cached probe
+
+    SIGN_CAMERA_BACKEND picks the backend. SIGN_CAMERA_FOURCC, SIGN_CAMERA_SIZE (640x480),
+    SIGN_CAMERA_FPS and SIGN_CAMERA_BUFFER fix the settings. Otherwise the first start
+    probes the camera and caches the choice in STATE_DIR; SIGN_CAMERA_PROBE=1 probes again,
+    SIGN_CAMERA_PROBE=0 keeps the driver defaults. With probe_missing=False a probe that is
+    due returns settings None instead, and the caller runs probe_camera_settings() later.
+    """
+    backend = os.environ.get("SIGN_CAMERA_BACKEND", "any").strip().lower()
+    settings = {}
+    if os.environ.get("SIGN_CAMERA_FOURCC"):
+        settings['fourcc'] = os.environ["SIGN_CAMERA_FOURCC"]
+    if os.environ.get("SIGN_CAMERA_SIZE"):
+        settings['width'], settings['height'] = (int(v) for v in os.environ["SIGN_CAMERA_SIZE"].split("x"))
+    if os.environ.get("SIGN_CAMERA_FPS"):
+        settings['fps'] = float(os.environ["SIGN_CAMERA_FPS"])
+    if os.environ.get("SIGN_CAMERA_BUFFER"):
+        settings['buffer'] = int(os.environ["SIGN_CAMERA_BUFFER"])
+    mode = os.environ.get("SIGN_CAMERA_PROBE", "auto")
+    if settings or mode == "0":
+        return backend, settings
+
+    cache = _cache_path(backend, index)
+    if mode != "1" and os.path.exists(cache):
+        with open(cache, encoding="utf-8") as f:
+            return backend, json.load(f)
+    if not probe_missing:
+        return backend, None
+    return backend, probe_camera_settings(index, backend)
+
+
+def probe_camera_settings(index=0, backend="any"):
+    """Probe a camera that nothing else has open and cache the best settings in STATE_DIR
+
+    SIGN_CAMERA_MIN (640x480@20) is the minimum quality the probe accepts.
+    """
+    size, _, fps = os.environ.get("SIGN_CAMERA_MIN", "640x480@20").partition("@")
+    min_width, min_height = (int(v) for v in size.split("x"))
+    settings, _ = probe(index, backend, min_width=min_width, min_height=min_height, min_fps=float(fps or 0))
+    log.info("Camera %d: using %s", index, describe(settings))
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(_cache_path(backend, index), "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+    return settings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure frame rate and latency of each camera setting")
+    parser.add_argument("index", nargs="?", type=int, default=0, help="camera index")
+    parser.add_argument("--backend", choices=tuple(BACKENDS), default="any")
+    parser.add_argument("--frames", type=int, default=60, help="frames timed per setting")
+    parser.add_argument("--min", default="640x480@20", help="minimum WIDTHxHEIGHT@FPS to accept")
+    args = parser.parse_args()
+
+    size, _, fps = args.min.partition("@")
+    min_width, min_height = (int(v) for v in size.split("x"))
+    best, results = probe(args.index, args.backend, min_width=min_width, min_height=min_height,
+                          min_fps=float(fps or 0), frames=args.frames)
+    for settings, result in results:
+        print(("* " if settings == best else "  ") + describe(settings, result))
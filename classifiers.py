@@ -0,0 +1,179 @@
+import os
+
+import numpy as np
+
+from cnn_inference import CnnRunner, backend_from_env
+from landmarks import NUM_GROUPS, normalize_landmarks
+
+CNN_MODEL_PATH = 'cnn8grps_rad1_model.h5'
+LANDMARK_MODEL_PATH = 'landmark_model.npz'
+
+# "cnn" classifies the rendered 400x400 skeleton, "landmark" the normalized landmark vector,
+# "remote" forwards frames to inference_server.py
+CLASSIFIER_KINDS = ("cnn", "landmark", "remote")
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    e = np.exp(logits)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class CnnClassifier:
+    """The original Keras CNN over the rendered skeleton image
+
+    backend picks how the forward pass runs (see cnn_inference.CNN_BACKENDS); it defaults
+    to SIGN_CNN_BACKEND and the runner is warmed up here so the first frame is not slow.
+    """
+
+    input_kind = "image"
+
+    def __init__(self, model_path=CNN_MODEL_PATH, backend=None):
+        self.runner = CnnRunner(model_path, backend or backend_from_env())
+        self.runner.warmup()
+
+    def predict(self, image=None, pts=None):
+        """Return the 8 group probabilities for one 400x400x3 skeleton image"""
+        batch = image.reshape(1, 400, 400, 3)
+        return self.runner(batch)[0]
+
+    def predict_batch(self, images):
+        """Return (n, 8) group probabilities for a stacked (n, 400, 400, 3) batch"""
+        return self.runner(np.asarray(images))
+
+
+class LandmarkClassifier:
+    """Nearest-centroid or small MLP classifier over normalized landmark vectors"""
+
+    input_kind = "landmarks"
+
+    def __init__(self, kind, dims, params, temperature=1.0):
+        self.kind = kind
+        self.dims = dims
+        self.params = params
+        self.temperature = temperature
+
+    @classmethod
+    def load(cls, path=LANDMARK_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            kind = str(data['kind'])
+            dims = int(data['dims'])
+            temperature = float(data['temperature'])
+            params = {k: data[k] for k in data.files if k not in ('kind', 'dims', 'temperature')}
+        return cls(kind, dims, params, temperature)
+
+    def save(self, path=LANDMARK_MODEL_PATH):
+        np.savez(path, kind=self.kind, dims=self.dims, temperature=self.temperature, **self.params)
+
+    def predict_batch(self, vectors):
+        """Return (n, 8) group probabilities for (n, 21 * dims) normalized vectors"""
+        x = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        p = self.params
+        if self.kind == "centroid":
+            d2 = ((x[:, None, :] - p['centroids'][None, :, :]) ** 2).sum(axis=2)
+            return _softmax(-d2 / self.temperature).astype(np.float32)
+        hidden = np.maximum(x @ p['w1'] + p['b1'], 0.0)
+        return _softmax(hidden @ p['w2'] + p['b2']).astype(np.float32)
+
+    def normalize(self, pts):
+        return normalize_landmarks(pts, self.dims)
+
+    def predict(self, image=None, pts=None):
+        """Return the 8 group probabilities for one set of 21 landmarks"""
+        return self.predict_batch(self.normalize(pts))[0]
+
+
+def train_centroid(x, y, dims, temperature=0.05):
+    """Fit one centroid per group; groups missing from y never win"""
+    centroids = np.full((NUM_GROUPS, x.shape[1]), 1e3, dtype=np.float32)
+    for g in range(NUM_GROUPS):
+        if np.any(y == g):
+            centroids[g] = x[y == g].mean(axis=0)
+    return LandmarkClassifier("centroid", dims, {'centroids': centroids}, temperature)
+
+
+def train_mlp(x, y, dims, hidden=64, epochs=300, lr=0.01, batch_size=256, seed=0):
+    """Fit a one-hidden-layer ReLU MLP with softmax cross-entropy and Adam"""
+    rng = np.random.default_rng(seed)
+    n, d = x.shape
+    params = {
+        'w1': (rng.standard_normal((d, hidden)) * np.sqrt(2.0 / d)).astype(np.float32),
+        'b1': np.zeros(hidden, np.float32),
+        'w2': (rng.standard_normal((hidden, NUM_GROUPS)) * np.sqrt(2.0 / hidden)).astype(np.float32),
+        'b2': np.zeros(NUM_GROUPS, np.float32),
+    }
+    m = {k: np.zeros_like(v) for k, v in params.items()}
+    v = {k: np.zeros_like(v) for k, v in params.items()}
+    onehot = np.eye(NUM_GROUPS, dtype=np.float32)[y]
+    step = 0
+    for _ in range(epochs):
+        order = rng.permutation(n)
+        for start in range(0, n, batch_size):
+            idx = order[start:start + batch_size]
+            xb, tb = x[idx], onehot[idx]
+            h_pre = xb @ params['w1'] + params['b1']
+            h = np.maximum(h_pre, 0.0)
+            probs = _softmax(h @ params['w2'] + params['b2'])
+
+            g_out = (probs - tb) / len(idx)
+            g_h = (g_out @ params['w2'].T) * (h_pre > 0)
+            grads = {
+                'w1': xb.T @ g_h, 'b1': g_h.sum(axis=0),
+                'w2': h.T @ g_out, 'b2': g_out.sum(axis=0),
+            }
+            step += 1
+            for k in params:
+                m[k] = 0.9 * m[k] + 0.1 * grads[k]
+                v[k] = 0.999 * v[k] + 0.001 * grads[k] ** 2
+                m_hat = m[k] / (1 - 0.9 ** step)
+                v_hat = v[k] / (1 - 0.999 ** step)
+                params[k] -= (lr * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+    return LandmarkClassifier("mlp", dims, params)
+
+
+def load_classifier(kind=None):
+    """Build the classifier selected by kind or the SIGN_CLASSIFIER environment variable"""
+    kind = (kind or os.environ.get("SIGN_CLASSIFIER", "cnn")).strip().lower()
+    if kind == "cnn":
+        return CnnClassifier()
+    if kind == "landmark":
+        return LandmarkClassifier.load(os.environ.get("SIGN_LANDMARK_MODEL", LANDMARK_MODEL_PATH))
+    if kind == "remote":
+        from inference_server import RemoteClassifier
+        input_kind = os.environ.get("SIGN_REMOTE_INPUT", "image")
+        # SIGN_REMOTE_FALLBACK names the local classifier used while the server is down, "none" for none
+        fallback = os.environ.get("SIGN_REMOTE_FALLBACK", "cnn" if input_kind == "image" else "landmark")
+        return RemoteClassifier(input_kind=input_kind,
+                                timeout=float(os.environ.get("SIGN_REMOTE_TIMEOUT", 1.0)),
+                                fallback=None if fallback == "none" else lambda: load_classifier(fallback))
+    raise ValueError(f"Unknown classifier '{kind}', expected one of {CLASSIFIER_KINDS}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the landmark classifier from extract_landmarks.py output")
+    parser.add_argument("dataset", help="npz file written by extract_landmarks.py")
+    parser.add_argument("--kind", choices=("centroid", "mlp"), default="mlp")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction of samples kept for validation")
+    parser.add_argument("-o", "--output", default=LANDMARK_MODEL_PATH)
+    args = parser.parse_args()
+
+    with np.load(args.dataset, allow_pickle=False) as data:
+        x, y, dims = data['x'], data['y'], int(data['dims'])
+
+    order = np.random.default_rng(0).permutation(len(x))
+    n_val = int(len(x) * args.holdout)
+    val, train = order[:n_val], order[n_val:]
+
+    if args.kind == "centroid":
+        clf = train_centroid(x[train], y[train], dims)
+    else:
+        clf = train_mlp(x[train], y[train], dims, epochs=args.epochs)
+
+    if n_val:
+        acc = float((clf.predict_batch(x[val]).argmax(axis=1) == y[val]).mean())
+        print(f"Validation accuracy: {acc:.3f} on {n_val} samples")
+    clf.save(args.output)
+    print(f"Saved {args.kind} classifier to {args.output}")
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+# keras:    model.predict, the original path (data adapter, callbacks, NumPy conversion per call)
+# direct:   model(x, training=False), one eager forward pass
+# function: the forward pass traced once into a tf.function graph
+# xla:      the same graph compiled with XLA
+# tflite:   exported TensorFlow Lite flatbuffer run by the TFLite interpreter
+# onnx:     exported ONNX graph run by onnxruntime on CPU
+CNN_BACKENDS = ("keras", "direct", "function", "xla", "tflite", "onnx")
+
+INPUT_SHAPE = (400, 400, 3)
+
+
+def backend_from_env(default="function"):
+    backend = os.environ.get("SIGN_CNN_BACKEND", default).strip().lower()
+    if backend not in CNN_BACKENDS:
+        raise ValueError(f"Unknown CNN backend '{backend}', expected one of {CNN_BACKENDS}")
+    return backend
+
+
+def _exported_path(model_path, extension):
+    return os.path.splitext(model_path)[0] + extension
+
+
+def _is_fresh(path, source):
+    return os.path.exists(path) and (not os.path.exists(source) or os.path.getmtime(path) >= os.path.getmtime(source))
+
+
+class CnnRunner:
+    """Run the skeleton CNN through the selected backend; call with a (n, 400, 400, 3) batch"""
+
+    def __init__(self, model_path, backend="function", num_threads=None):
+        if backend not in CNN_BACKENDS:
+            raise ValueError(f"Unknown CNN backend '{backend}', expected one of {CNN_BACKENDS}")
+        self.model_path = model_path
+        self.backend = backend
+        self.num_threads = num_threads or os.cpu_count()
+        self._model = None
+        self._run = getattr(self, f"_build_{backend}")()
+
+    def __call__(self, batch):
+        return np.asarray(self._run(np.asarray(batch, dtype=np.float32)), dtype=np.float32)
+
+    def warmup(self, runs=3):
+        """Trigger tracing, compilation and allocation before the first real frame"""
+        dummy = np.full((1,) + INPUT_SHAPE, 255, np.float32)
+        for _ in range(runs):
+            self(dummy)
+
+    def keras_model(self):
+        if self._model is None:
+            from keras.models import load_model
+            self._model = load_model(self.model_path)
+        return self._model
+
+    def _build_keras(self):
+        model = self.keras_model()
+        return lambda batch: model.predict(batch, verbose=0)
+
+    def _build_direct(self):
+        model = self.keras_model()
+        return lambda batch: model(batch, training=False).numpy()
+
+    def _build_function(self, jit_compile=False):
+        import tensorflow as tf
+        model = self.keras_model()
+        forward = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32)],
+            jit_compile=jit_compile,
+        )
+        return lambda batch: forward(tf.constant(batch)).numpy()
+
+    def _build_xla(self):
+        return self._build_function(jit_compile=True)
+
+    def _build_tflite(self):
+        path = _exported_path(self.model_path, ".tflite")
+        if not _is_fresh(path, self.model_path):
+            import tensorflow as tf
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.keras_model())
+            with open(path, "wb") as f:
+                f.write(converter.convert())
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        interpreter = Interpreter(model_path=path, num_threads=self.num_threads)
+        interpreter.allocate_tensors()
+        input_index = interpreter.get_input_details()[0]['index']
+        output_index = interpreter.get_output_details()[0]['index']
+
+        def run(batch):
+            # The exported graph has a fixed batch of 1
+            out = []
+            for sample in batch:
+                interpreter.set_tensor(input_index, sample[None])
+                interpreter.invoke()
+                out.append(interpreter.get_tensor(output_index)[0])
+            return np.stack(out)
+        return run
+
+    def _build_onnx(self):
+        import onnxruntime as ort
+        path = _exported_path(self.model_path, ".onnx")
+        if not _is_fresh(path, self.model_path):
+            import tensorflow as tf
+            import tf2onnx
+            spec = (tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32, name="input"),)
+            tf2onnx.convert.from_keras(self.keras_model(), input_signature=spec, output_path=path)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.num_threads
+        session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        return lambda batch: session.run(None, {input_name: batch})[0]
@@ -1,6 +1,8 @@
 import cv2
 from cvzone.HandTrackingModule import HandDetector
 from cvzone.ClassificationModule import Classifier
+from skeleton import SkeletonRenderer, skeleton_shift
+from frame_sources import source_from_env
 import numpy as np
 import os, os.path
 from keras.models import load_model
@@ -10,7 +12,7 @@ import traceback
 
 #model = load_model('C:\\Users\\devansh raval\\PycharmProjects\\pythonProject\\cnn9.h5')
 
-capture = cv2.VideoCapture(0)
+capture = source_from_env()
 
 hd = HandDetector(maxHands=1)
 hd2 = HandDetector(maxHands=1)
@@ -29,13 +31,14 @@ step = 1
 flag=False
 suv=0
 #C:\Users\devansh raval\PycharmProjects\pythonProject
-white=np.ones((400,400),np.uint8)*255
-cv2.imwrite("white.jpg",white)
+renderer = SkeletonRenderer()
 
 
 while True:
     try:
-        _, frame = capture.read()
+        ok, frame = capture.read()
+        if not ok:
+            break
         frame = cv2.flip(frame, 1)
         hands= hd.findHands(frame, draw=False, flipType=True)
         img_final=img_final1=img_final2=0
@@ -87,44 +90,13 @@ while True:
             hand = hands[0]
             x, y, w, h = hand['bbox']
             image = frame[y - offset:y + h + offset, x - offset:x + w + offset]
-            white = cv2.imread("white.jpg")
+            white = renderer.clear()
             # img_final=img_final1=img_final2=0
             handz = hd2.findHands(image, draw=False, flipType=True)
             if handz:
                 hand = handz[0]
                 pts = hand['lmList']
-                # x1,y1,w1,h1=hand['bbox']
-
-                os = ((400 - w) // 2) - 15
-                os1 = ((400 - h) // 2) - 15
-                for t in range(0, 4, 1):
-                    cv2.line(white, (pts[t][0] + os, pts[t][1] + os1), (pts[t + 1][0] + os, pts[t + 1][1] + os1),
-                             (0, 255, 0), 3)
-                for t in range(5, 8, 1):
-                    cv2.line(white, (pts[t][0] + os, pts[t][1] + os1), (pts[t + 1][0] + os, pts[t + 1][1] + os1),
-                             (0, 255, 0), 3)
-                for t in range(9, 12, 1):
-                    cv2.line(white, (pts[t][0] + os, pts[t][1] + os1), (pts[t + 1][0] + os, pts[t + 1][1] + os1),
-                             (0, 255, 0), 3)
-                for t in range(13, 16, 1):
-                    cv2.line(white, (pts[t][0] + os, pts[t][1] + os1), (pts[t + 1][0] + os, pts[t + 1][1] + os1),
-                             (0, 255, 0), 3)
-                for t in range(17, 20, 1):
-                    cv2.line(white, (pts[t][0] + os, pts[t][1] + os1), (pts[t + 1][0] + os, pts[t + 1][1] + os1),
-                             (0, 255, 0), 3)
-                cv2.line(white, (pts[5][0] + os, pts[5][1] + os1), (pts[9][0] + os, pts[9][1] + os1), (0, 255, 0),
-                         3)
-                cv2.line(white, (pts[9][0] + os, pts[9][1] + os1), (pts[13][0] + os, pts[13][1] + os1), (0, 255, 0),
-                         3)
-                cv2.line(white, (pts[13][0] + os, pts[13][1] + os1), (pts[17][0] + os, pts[17][1] + os1),
-                         (0, 255, 0), 3)
-                cv2.line(white, (pts[0][0] + os, pts[0][1] + os1), (pts[5][0] + os, pts[5][1] + os1), (0, 255, 0),
-                         3)
-                cv2.line(white, (pts[0][0] + os, pts[0][1] + os1), (pts[17][0] + os, pts[17][1] + os1), (0, 255, 0),
-                         3)
-
-                for i in range(21):
-                    cv2.circle(white, (pts[i][0] + os, pts[i][1] + os1), 2, (0, 0, 255), 1)
+                white = renderer.render(pts, skeleton_shift(w, h))
 
                 cv2.imshow("skeleton", white)
                 # cv2.imshow("5", skeleton5)
@@ -1,65 +1,40 @@
 import cv2
-from cvzone.HandTrackingModule import HandDetector
+from hand_tracking import HandTracker, detect_scale_from_env, detection_mode_from_env
+from skeleton import SkeletonRenderer, skeleton_input, skeleton_palm_from_env
+from frame_sources import source_from_env
 import numpy as np
 import os as oss
 
-capture = cv2.VideoCapture(0)
-hd = HandDetector(maxHands=1)
-hd2 = HandDetector(maxHands=1)
+capture = source_from_env()
 
 count = len(oss.listdir("AtoZ_3.1/A"))
 c_dir = 'A'
 
 offset = 15
+tracker = HandTracker(mode=detection_mode_from_env(), offset=offset, detect_scale=detect_scale_from_env())
 step = 1
 flag=False
 suv=0
 
-white=np.ones((400,400),np.uint8)*255
-cv2.imwrite("white.jpg",white)
+renderer = SkeletonRenderer()
+# Training skeletons are drawn at the same palm size the recognizer uses
+skeleton_palm = skeleton_palm_from_env()
 
 while True:
-    _, frame = capture.read()
+    ok, frame = capture.read()
+    if not ok:
+        break
     frame = cv2.flip(frame, 1)
-    hands= hd.findHands(frame, draw=False, flipType=True)
-    white = cv2.imread("white.jpg")
+    hand, _ = tracker.detect(frame)
 
-    if hands:
-        hand = hands[0]
+    if hand:
         x, y, w, h = hand['bbox']
-        image =np.array( frame[y - offset:y + h + offset, x - offset:x + w + offset])
-
-        handz,imz = hd2.findHands(image, draw=True, flipType=True)
-        if handz:
-            hand = handz[0]
-            pts = hand['lmList']
-            # x1,y1,w1,h1=hand['bbox']
-            os=((400-w)//2)-15
-            os1=((400-h)//2)-15
-            for t in range(0,4,1):
-                cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-            for t in range(5,8,1):
-                cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-            for t in range(9,12,1):
-                cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-            for t in range(13,16,1):
-                cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-            for t in range(17,20,1):
-                cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-            cv2.line(white, (pts[5][0]+os, pts[5][1]+os1), (pts[9][0]+os, pts[9][1]+os1), (0, 255, 0), 3)
-            cv2.line(white, (pts[9][0]+os, pts[9][1]+os1), (pts[13][0]+os, pts[13][1]+os1), (0, 255, 0), 3)
-            cv2.line(white, (pts[13][0]+os, pts[13][1]+os1), (pts[17][0]+os, pts[17][1]+os1), (0, 255, 0), 3)
-            cv2.line(white, (pts[0][0]+os, pts[0][1]+os1), (pts[5][0]+os, pts[5][1]+os1), (0, 255, 0), 3)
-            cv2.line(white, (pts[0][0]+os, pts[0][1]+os1), (pts[17][0]+os, pts[17][1]+os1), (0, 255, 0), 3)
-
-            skeleton0=np.array(white)
-            zz=np.array(white)
-            for i in range(21):
-                cv2.circle(white,(pts[i][0]+os,pts[i][1]+os1),2,(0 , 0 , 255),1)
-
-            skeleton1=np.array(white)
+        pts = hand['lmList']
+        # Copy out of the shared canvas, it is saved on a later key press
+        skeleton1 = np.array(renderer.render(*skeleton_input(pts, w, h, offset, skeleton_palm)))
+        landmarks1 = np.array(pts)
 
-            cv2.imshow("1",skeleton1)
+        cv2.imshow("1",skeleton1)
 
     frame = cv2.putText(frame, "dir=" + str(c_dir) + "  count=" + str(count), (50,50),
                         cv2.FONT_HERSHEY_SIMPLEX,
@@ -90,6 +65,8 @@ while True:
             flag=False
         if step%3==0:
             cv2.imwrite(f"AtoZ_3.1/{c_dir}/{count}.jpg",skeleton1)
+            # Raw landmarks next to the image, read by extract_landmarks.py
+            np.save(f"AtoZ_3.1/{c_dir}/{count}.npy",landmarks1)
             count += 1
             suv += 1
         step+=1
@@ -0,0 +1,98 @@
+import argparse
+import os
+
+import numpy as np
+
+from landmarks import LETTER_GROUPS, normalize_landmarks, palm_size_stats
+
+# Fewer vectors than this cannot train a usable model; the run fails instead of writing them
+MIN_SAMPLES = 260
+
+
+def load_landmarks(image_path):
+    """Landmarks for one dataset image from its .npy sidecar, or None without one
+
+    The dataset images are skeleton drawings on a white canvas, not photos, so a hand
+    detector finds nothing in them. Only images collected by data_collection_final.py
+    since it started writing sidecars can be converted.
+    """
+    sidecar = os.path.splitext(image_path)[0] + ".npy"
+    if not os.path.exists(sidecar):
+        return None
+    return np.load(sidecar)
+
+
+def extract(dataset_dir, dims=2, min_samples=MIN_SAMPLES):
+    """Walk dataset_dir/<letter>/*.jpg and return normalized vectors, group labels and letters
+
+    Raises ValueError when fewer than min_samples images have landmark sidecars.
+    """
+    xs, ys, letters = [], [], []
+    images = 0
+    for letter in sorted(os.listdir(dataset_dir)):
+        if letter.upper() not in LETTER_GROUPS:
+            continue
+        letter_dir = os.path.join(dataset_dir, letter)
+        found = skipped = 0
+        for name in sorted(os.listdir(letter_dir)):
+            if not name.lower().endswith((".jpg", ".jpeg", ".png")):
+                continue
+            images += 1
+            pts = load_landmarks(os.path.join(letter_dir, name))
+            if pts is None or len(pts) != 21:
+                skipped += 1
+                continue
+            xs.append(normalize_landmarks(pts, dims))
+            ys.append(LETTER_GROUPS[letter.upper()])
+            letters.append(letter.upper())
+            found += 1
+        print(f"{letter}: {found} samples, {skipped} without landmarks")
+
+    if len(xs) < min_samples:
+        raise ValueError(f"Only {len(xs)} of {images} images in {dataset_dir} have .npy landmark sidecars "
+                         f"(need {min_samples}); re-collect the dataset with data_collection_final.py")
+
+    x = np.array(xs, dtype=np.float32).reshape(len(xs), 21 * dims)
+    return x, np.array(ys, dtype=np.int64), np.array(letters)
+
+
+def palm_stats(dataset_dir):
+    """Palm size distribution in crop pixels, {letter: stats} plus 'all', from the landmark sidecars"""
+    per_letter = {}
+    for letter in sorted(os.listdir(dataset_dir)):
+        letter_dir = os.path.join(dataset_dir, letter)
+        if letter.upper() not in LETTER_GROUPS or not os.path.isdir(letter_dir):
+            continue
+        per_letter[letter.upper()] = [np.load(os.path.join(letter_dir, name))
+                                      for name in sorted(os.listdir(letter_dir)) if name.endswith(".npy")]
+    stats = {letter: palm_size_stats(sets) for letter, sets in per_letter.items()}
+    stats['all'] = palm_size_stats([pts for sets in per_letter.values() for pts in sets])
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Turn the AtoZ_3.1 dataset into landmark vectors")
+    parser.add_argument("dataset_dir", nargs="?", default="AtoZ_3.1")
+    parser.add_argument("--dims", type=int, choices=(2, 3), default=2, help="use (x, y) or (x, y, z)")
+    parser.add_argument("-o", "--output", default="landmarks_AtoZ_3.1.npz")
+    parser.add_argument("--min-samples", type=int, default=MIN_SAMPLES,
+                        help="fail when fewer images than this have landmarks")
+    parser.add_argument("--palm-stats", action="store_true",
+                        help="only print the palm size distribution, to check landmarks.PALM_REFERENCE")
+    args = parser.parse_args()
+
+    if args.palm_stats:
+        for letter, stats in palm_stats(args.dataset_dir).items():
+            if stats['count']:
+                print(f"{letter:>4}: {stats['count']:5d} hands, palm median {stats['p50']:.0f} px "
+                      f"(5-95%: {stats['p5']:.0f}-{stats['p95']:.0f})")
+            else:
+                print(f"{letter:>4}: no landmark sidecars")
+        raise SystemExit(0)
+
+    try:
+        x, y, letters = extract(args.dataset_dir, args.dims, args.min_samples)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    np.savez_compressed(args.output, x=x, y=y, letters=letters, dims=args.dims)
+    print(f"Wrote {len(x)} vectors to {args.output}")
@@ -1,79 +1,85 @@
-print("VERY TOP OF FILE")
-import numpy as np
-print("Imported numpy")
-import math
-print("Imported math")
-import cv2
-print("Imported cv2")
+import time
+STARTED = time.monotonic()  # before the imports below, for the startup report
+
 import os, sys
-print("Imported os, sys")
-import pyttsx3
-print("Imported pyttsx3")
-from keras.models import load_model
-print("Imported keras.models.load_model")
-from cvzone.HandTrackingModule import HandDetector
-print("Imported cvzone.HandTrackingModule.HandDetector")
+import signal
+import threading
 from string import ascii_uppercase
-print("Imported ascii_uppercase")
-import enchant
-print("Imported enchant")
+
+import numpy as np
+import cv2
 import tkinter as tk
-print("Imported tkinter")
 from PIL import Image, ImageTk
-print("Imported PIL.Image, ImageTk")
-import pymongo
-print("Imported pymongo")
-
-print("All imports successful")
 
-print("Before enchant.Dict")
-ddd = enchant.Dict("en-US")
-print("Created enchant.Dict")
+from profiling import get_logger, profiler_from_env
+from skeleton import SkeletonRenderer, skeleton_input, skeleton_palm_from_env
+from group_rules import RuleEngine, rules_palm_from_env, top_two
+from recording import LandmarkRecorder
+from pipeline import END_OF_STREAM, CapturePipeline
+from frame_sources import CameraSource, source_from_env
+from startup import StartupLoader, startup_budget_from_env
+from temporal import apply_edits, decoder_from_env
+from motion_gate import motion_gate_from_env
+from activity import IDLE, activity_scheduler_from_env
+from quality import quality_controller_from_env
+from supervisor import mark_ready
+import resources
+
+log = get_logger("sign.app")
+profiler = profiler_from_env()
 
-print("Before HandDetector hd")
-hd = HandDetector(maxHands=1)
-print("Created HandDetector hd")
+offset = 29
 
-print("Before HandDetector hd2")
-hd2 = HandDetector(maxHands=1)
-print("Created HandDetector hd2")
+renderer = SkeletonRenderer()
+# Crop size by default, as the CNN was trained; SIGN_SKELETON_PALM / SIGN_RULES_PALM rescale hands
+skeleton_palm = skeleton_palm_from_env()
+rules = RuleEngine(palm=rules_palm_from_env())
 
-offset = 29
-print("Set offset")
+# Set SIGN_RECORD_LANDMARKS=frames.jsonl to capture frames for replay_rules.py
+recorder = LandmarkRecorder(os.environ["SIGN_RECORD_LANDMARKS"]) if os.environ.get("SIGN_RECORD_LANDMARKS") else None
 
 os.environ["THEANO_FLAGS"] = "device=cuda, assert_no_cpu_op=True"
-print("Set THEANO_FLAGS")
 
 # Application :
 
 class Application:
 
     def __init__(self):
-        print("Application __init__ started")
-        self.vs = cv2.VideoCapture(0)
-        print("VideoCapture initialized")
+        # SIGN_SOURCE selects a camera index, video file or image directory. A camera without
+        # cached settings starts on the driver defaults and is probed in the background.
+        self.vs = source_from_env(probe_camera=False)
         self.current_image = None
-        self.model = load_model('cnn8grps_rad1_model.h5')
-        print("Model loaded")
-        self.speak_engine=pyttsx3.init()
-        self.speak_engine.setProperty("rate",100)
-        voices=self.speak_engine.getProperty("voices")
-        self.speak_engine.setProperty("voice",voices[0].id)
+
+        # The window and camera come up straight away; everything slow to import or build
+        # loads in parallel, and each part is used as soon as its task has finished
+        self.loader = StartupLoader(origin=STARTED, budget=startup_budget_from_env())
+        self.loader.milestone("imports")
+        self.loader.start({
+            "tracker": self.load_tracker,
+            "classifier": self.load_classifier,
+            "dictionary": self.load_dictionary,
+            "speech": self.load_speech,
+            "mongo": self.load_publisher,
+        })
+        self.predicted = False
 
         self.ct = {}
         self.ct['blank'] = 0
         self.blank_flag = 0
         self.space_flag=False
         self.next_flag=True
-        self.prev_char=""
-        self.count=-1
-        self.ten_prev_char=[]
-        for i in range(10):
-            self.ten_prev_char.append(" ")
+        # SIGN_DECODER picks how per-frame symbols become committed characters
+        self.decoder = decoder_from_env()
+        # Static holds reuse the last prediction instead of rendering and inferring again
+        self.gate = motion_gate_from_env()
+        self.skeleton = None
+        # With nobody in front of the camera, capture, detection and repaints slow down
+        self.activity = activity_scheduler_from_env()
+        # Under load, resolution, inference rate and repaint rate drop to keep the latency budget
+        self.quality = quality_controller_from_env()
 
         for i in ascii_uppercase:
             self.ct[i] = 0
-        print("Loaded model from disk")
 
         self.root = tk.Tk()
         self.root.title("✋ Sign Language To Text Conversion")
@@ -150,105 +156,222 @@ class Application:
         self.word3 = " "
         self.word4 = " "
 
-        print("GUI setup complete, starting video loop")
-        self.video_loop()
-
-        # MongoDB setup
-        self.mongo_client = pymongo.MongoClient('mongodb://localhost:27017/SIGN')
-        self.mongo_db = self.mongo_client['SIGN']
-        self.mongo_collection = self.mongo_db['sentences']
-        
         # Control flag for storing text
         self.should_store_text = False
 
-    def video_loop(self):
+        # SIGN_PROFILE_OVERLAY=1 paints FPS and per-stage percentiles over the camera panel
+        self.overlay = None
+        if os.environ.get("SIGN_PROFILE_OVERLAY") == "1" and profiler.enabled:
+            self.overlay = tk.Label(self.root, bg='#000000', fg='#2ecc71', font=("Courier", 10), justify='left')
+            self.overlay.place(x=105, y=8)
+        self.painted = 0
+        self.fps_since = time.monotonic()
+
+        # Loading progress until every background task has finished
+        self.status = tk.Label(self.root, bg='#2c3e50', fg='#f1c40f', font=("Arial", 12))
+        self.status.place(x=700, y=60)
+
+        # Capture and recognition run on their own threads; the Tk loop only paints.
+        # state_lock guards the sentence state shared with the button callbacks.
+        self.state_lock = threading.Lock()
+        self.pipeline = CapturePipeline(self.read_frame, self.process_frame, profiler=profiler,
+                                        pace=self.activity.capture_delay)
+        self.pipeline.start()
+        if isinstance(self.vs, CameraSource) and self.vs.settings is None:
+            threading.Thread(target=self.probe_camera, name="camera-probe", daemon=True).start()
+
+        # Closed by the supervisor with SIGTERM (CTRL_BREAK on Windows); shut down on the Tk thread
+        self.ready = False
+        for name in ("SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), lambda *_: self.root.after(0, self.destructor))
+
+        self.loader.milestone("window")
+        log.debug("GUI setup complete, starting video loop")
+        self.video_loop()
+
+    # Background loading tasks; each returns the object it built
+
+    def load_tracker(self, loader):
+        with loader.phase("tracker", "import"):
+            from hand_tracking import HandTracker, detect_scale_from_env, detection_mode_from_env
+        with loader.phase("tracker", "init"):
+            tracker = HandTracker(mode=detection_mode_from_env(), offset=offset, profiler=profiler,
+                                  detect_scale=detect_scale_from_env())
+        log.debug("Created HandTracker, mode = %s", tracker.mode)
+        return tracker
+
+    def load_classifier(self, loader):
+        with loader.phase("classifier", "import"):
+            from classifiers import load_classifier
+        with loader.phase("classifier", "init"):
+            classifier = load_classifier()
+        log.info("Model loaded: %s", type(classifier).__name__)
+        return classifier
+
+    def load_dictionary(self, loader):
+        with loader.phase("dictionary", "import"):
+            import enchant
+            from suggestions import SuggestionService
+        with loader.phase("dictionary", "init"):
+            dictionary = enchant.Dict("en-US")
+        return SuggestionService(dictionary, self.set_suggestions, profiler=profiler)
+
+    def load_speech(self, loader):
+        """Speech runs on its own thread so the video loop keeps going while it talks"""
+        from tts import tts_worker_from_env
+        worker = tts_worker_from_env(rate=100, voice_index=0)
+        worker.started.wait()
+        if worker.engine is None:
+            raise RuntimeError("no text-to-speech engine")
+        return worker
+
+    def load_publisher(self, loader):
+        with loader.phase("mongo", "import"):
+            from sentence_publisher import SentencePublisher
+        with loader.phase("mongo", "init"):
+            collection = resources.get_collection()
+        return SentencePublisher(collection, profiler=profiler)
+
+    def probe_camera(self):
+        """First start on this camera: probe its settings and reopen it with the best ones
+
+        The probe holds the camera for several seconds, so it waits until nobody is signing
+        (straight away with SIGN_IDLE_AFTER=0); the choice is cached for the next start.
+        """
+        from camera import describe, probe_camera_settings
+        while self.activity.idle_after > 0 and self.activity.state != IDLE:
+            time.sleep(0.5)
+        log.info("Probing %s settings", self.vs.name)
+        try:
+            self.vs.reconfigure(lambda: probe_camera_settings(self.vs.index, self.vs.backend))
+        except Exception as e:
+            log.error("Camera probe failed: %s", e)
+            return
+        log.info("%s: switched to %s", self.vs.name, describe(self.vs.settings))
+
+    def read_frame(self):
+        """Capture thread: grab the next mirrored camera frame"""
         ok, frame = self.vs.read()
-        cv2image = cv2.flip(frame, 1)
-        if cv2image.any:
-            hands = hd.findHands(cv2image, draw=False, flipType=True)
-            cv2image_copy=np.array(cv2image)
-            cv2image = cv2.cvtColor(cv2image, cv2.COLOR_BGR2RGB)
-            self.current_image = Image.fromarray(cv2image)
+        if not ok:
+            # A camera drops a frame now and then; a video or image directory has ended
+            return END_OF_STREAM if self.vs.exhausted else None
+        self.capture_width = frame.shape[1]
+        scale = self.quality.scale()
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.flip(frame, 1)
+
+    def process_frame(self, frame, times):
+        """Worker thread: detect, render, classify and update the sentence for one frame"""
+        result = {'frame': cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), 'skeleton': None}
+        tracker = self.loader.value("tracker")
+        if tracker is None:
+            return result
+        if not self.activity.should_detect(frame) or not self.quality.should_infer():
+            return result
+        hand, _ = tracker.detect(frame)
+        self.activity.report(hand is not None)
+
+        if hand:
+            x, y, w, h = hand['bbox']
+
+            self.ccc += 1
+            self.pts = hand['lmList']
+            scale = frame.shape[1] / self.capture_width
+            if scale != 1.0:
+                # Skeletons and rules are in camera pixels whatever resolution the quality level runs at
+                self.pts = [[offset + (v - offset) / scale for v in pt[:2]] + list(pt[2:]) for pt in self.pts]
+                w, h = int(w / scale), int(h / scale)
+
+            cached = self.gate.lookup(self.pts)
+            if cached is None:
+                with times.measure("render"):
+                    res = renderer.render(*skeleton_input(self.pts, w, h, offset, skeleton_palm))
+                # The renderer reuses its canvas, so hand the painter its own copy
+                self.skeleton = res.copy()
+                self.predict(res)
+            else:
+                self.predict(None, cached)
+            result['skeleton'] = self.skeleton
+        else:
+            self.gate.reset()
+        return result
+
+    def video_loop(self):
+        result = self.pipeline.latest()
+        if result is None and self.pipeline.finished():
+            if self.pipeline.error is not None:
+                log.error("%s failed: %s", self.vs.name, self.pipeline.error)
+            else:
+                log.info("%s has no more frames", self.vs.name)
+            self.destructor()
+            return
+        if result is not None:
+            self.loader.milestone("first_frame")
+            if not self.ready and self.loader.done():
+                # Every part has loaded and the camera is delivering frames
+                self.ready = True
+                loaded = self.loader.milestone("loaded")
+                self.status.config(text=f"✓ Ready in {loaded:.1f}s")
+                mark_ready(startup=self.loader.report())
+            self.current_image = Image.fromarray(result['frame'])
             imgtk = ImageTk.PhotoImage(image=self.current_image)
             self.panel.imgtk = imgtk
             self.panel.config(image=imgtk)
 
-            if hands[0]:
-                hand = hands[0]
-                map = hand[0]
-                x, y, w, h=map['bbox']
-                image = cv2image_copy[y - offset:y + h + offset, x - offset:x + w + offset]
-
-                white = cv2.imread("white.jpg")
-                # img_final=img_final1=img_final2=0
-                if image.all:
-                    handz = hd2.findHands(image, draw=False, flipType=True)
-                    self.ccc += 1
-                    if handz[0]:
-                        hand = handz[0]
-                        handmap=hand[0]
-                        self.pts = handmap['lmList']
-                        # x1,y1,w1,h1=hand['bbox']
-
-                        os = ((400 - w) // 2) - 15
-                        os1 = ((400 - h) // 2) - 15
-                        for t in range(0, 4, 1):
-                            cv2.line(white, (self.pts[t][0] + os, self.pts[t][1] + os1), (self.pts[t + 1][0] + os, self.pts[t + 1][1] + os1),
-                                     (0, 255, 0), 3)
-                        for t in range(5, 8, 1):
-                            cv2.line(white, (self.pts[t][0] + os, self.pts[t][1] + os1), (self.pts[t + 1][0] + os, self.pts[t + 1][1] + os1),
-                                     (0, 255, 0), 3)
-                        for t in range(9, 12, 1):
-                            cv2.line(white, (self.pts[t][0] + os, self.pts[t][1] + os1), (self.pts[t + 1][0] + os, self.pts[t + 1][1] + os1),
-                                     (0, 255, 0), 3)
-                        for t in range(13, 16, 1):
-                            cv2.line(white, (self.pts[t][0] + os, self.pts[t][1] + os1), (self.pts[t + 1][0] + os, self.pts[t + 1][1] + os1),
-                                     (0, 255, 0), 3)
-                        for t in range(17, 20, 1):
-                            cv2.line(white, (self.pts[t][0] + os, self.pts[t][1] + os1), (self.pts[t + 1][0] + os, self.pts[t + 1][1] + os1),
-                                     (0, 255, 0), 3)
-                        cv2.line(white, (self.pts[5][0] + os, self.pts[5][1] + os1), (self.pts[9][0] + os, self.pts[9][1] + os1), (0, 255, 0),
-                                 3)
-                        cv2.line(white, (self.pts[9][0] + os, self.pts[9][1] + os1), (self.pts[13][0] + os, self.pts[13][1] + os1), (0, 255, 0),
-                                 3)
-                        cv2.line(white, (self.pts[13][0] + os, self.pts[13][1] + os1), (self.pts[17][0] + os, self.pts[17][1] + os1),
-                                 (0, 255, 0), 3)
-                        cv2.line(white, (self.pts[0][0] + os, self.pts[0][1] + os1), (self.pts[5][0] + os, self.pts[5][1] + os1), (0, 255, 0),
-                                 3)
-                        cv2.line(white, (self.pts[0][0] + os, self.pts[0][1] + os1), (self.pts[17][0] + os, self.pts[17][1] + os1), (0, 255, 0),
-                                 3)
-
-                        for i in range(21):
-                            cv2.circle(white, (self.pts[i][0] + os, self.pts[i][1] + os1), 2, (0, 0, 255), 1)
-
-                        res=white
-                        self.predict(res)
-
-                        self.current_image2 = Image.fromarray(res)
-
-                        imgtk = ImageTk.PhotoImage(image=self.current_image2)
-
-                        self.panel2.imgtk = imgtk
-                        self.panel2.config(image=imgtk)
-
-                        self.panel3.config(text=self.current_symbol, font=("Courier", 30))
-
-                        #self.panel4.config(text=self.word, font=("Courier", 30))
-
-                        self.b1.config(text=self.word1, font=("Courier", 20), wraplength=825, command=self.action1)
-                        self.b2.config(text=self.word2, font=("Courier", 20), wraplength=825,  command=self.action2)
-                        self.b3.config(text=self.word3, font=("Courier", 20), wraplength=825,  command=self.action3)
-                        self.b4.config(text=self.word4, font=("Courier", 20), wraplength=825,  command=self.action4)
+            if result['skeleton'] is not None:
+                self.current_image2 = Image.fromarray(result['skeleton'])
 
-            self.panel5.config(text=self.str, font=("Courier", 30), wraplength=1025)
-        self.root.after(1, self.video_loop)
+                imgtk = ImageTk.PhotoImage(image=self.current_image2)
+
+                self.panel2.imgtk = imgtk
+                self.panel2.config(image=imgtk)
 
-    def distance(self,x,y):
-        return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
+                self.panel3.config(text=self.current_symbol, font=("Courier", 30))
+
+                #self.panel4.config(text=self.word, font=("Courier", 30))
+
+                self.b1.config(text=self.word1, font=("Courier", 20), wraplength=825, command=self.action1)
+                self.b2.config(text=self.word2, font=("Courier", 20), wraplength=825,  command=self.action2)
+                self.b3.config(text=self.word3, font=("Courier", 20), wraplength=825,  command=self.action3)
+                self.b4.config(text=self.word4, font=("Courier", 20), wraplength=825,  command=self.action4)
+
+            self.panel5.config(text=self.str, font=("Courier", 30), wraplength=1025)
+            self.painted += 1
+            if self.activity.state != IDLE:
+                # Idle frames skip detection and would read as spare capacity
+                self.quality.observe(self.pipeline.last_processing)
+        if not self.ready:
+            self.status.config(text="Loading  " + self.loader.status_text())
+        self.update_profile()
+        self.root.after(self.activity.paint_delay_ms(self.quality.paint_ms()), self.video_loop)
+
+    def update_profile(self):
+        """Refresh the overlay and the JSON lines export twice a second"""
+        elapsed = time.monotonic() - self.fps_since
+        if elapsed < 0.5:
+            return
+        fps = self.painted / elapsed
+        self.painted = 0
+        self.fps_since = time.monotonic()
+        tracker = self.loader.value("tracker")
+        tracking = tracker.tracking_stats() if tracker is not None else None
+        profiler.maybe_export({'fps': fps, 'dropped_frames': self.pipeline.dropped_frames(),
+                               'gate_checked': self.gate.checked, 'gate_skipped': self.gate.skipped,
+                               'tracking': tracking, 'activity': self.activity.state,
+                               'quality_level': self.quality.level})
+        if self.overlay is not None:
+            track_text = f"  track {tracking['hit_rate']:.0%}" if tracking and tracker.mode == "roi" else ""
+            self.overlay.config(text=f"{fps:5.1f} fps  dropped {self.pipeline.dropped_frames()}  "
+                                     f"gate {self.gate.skip_ratio():.0%}{track_text}  {self.activity.state}  q{self.quality.level}\n"
+                                     + profiler.summary_text())
 
     def update_mongo_sentence(self):
-        # Always update the current sentence
-        self.mongo_collection.update_one({'_id': 'current'}, {'$set': {'sentence': self.str}}, upsert=True)
+        # Hand the current sentence to the write-behind publisher; it only writes changes
+        publisher = self.loader.value("mongo")
+        if publisher is not None:
+            publisher.publish(self.str)
         
         # Only store in history if explicitly requested (not during automatic detection)
         # This will be called when the Store button is clicked
@@ -258,533 +381,144 @@ class Application:
         """Manually store the current text in history"""
         sentence_clean = self.str.strip()
         if len(sentence_clean) < 2:
-            print("Text must be at least 2 characters long to store.")
+            log.warning("Text must be at least 2 characters long to store.")
             return
         
-        # Check if this is a consecutive duplicate
-        last_doc = self.mongo_collection.find_one(
-            {'_id': {'$ne': 'current'}}, 
-            sort=[('timestamp', -1)]
-        )
-        is_duplicate = False
-        if last_doc and 'sentence' in last_doc:
-            is_duplicate = sentence_clean == last_doc['sentence'].strip()
-        
-        if is_duplicate:
-            print("This text is already stored (consecutive duplicate).")
+        # Duplicate check and insert happen together in the history store
+        if resources.get_history_store().add(self.str) is None:
+            log.warning("This text is already stored (consecutive duplicate).")
             return
-        
-        # Store the text
-        from datetime import datetime
-        history_doc = {
-            'sentence': sentence_clean,
-            'timestamp': datetime.now(),
-            'full_text': self.str,
-            'word_count': len(sentence_clean.split()),
-            'char_count': len(sentence_clean)
-        }
-        self.mongo_collection.insert_one(history_doc)
-        print(f"Successfully stored: '{sentence_clean}'")
+        log.info("Successfully stored: '%s'", sentence_clean)
 
     def action1(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str = self.str[:idx_word]
-        self.str = self.str + self.word1.upper()
+        with self.state_lock:
+            self.replace_word(self.word1)
         self.update_mongo_sentence()
 
     def action2(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str=self.str[:idx_word]
-        self.str=self.str+self.word2.upper()
+        with self.state_lock:
+            self.replace_word(self.word2)
         self.update_mongo_sentence()
 
     def action3(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str = self.str[:idx_word]
-        self.str = self.str + self.word3.upper()
+        with self.state_lock:
+            self.replace_word(self.word3)
         self.update_mongo_sentence()
 
     def action4(self):
+        with self.state_lock:
+            self.replace_word(self.word4)
+        self.update_mongo_sentence()
+
+    def replace_word(self, suggestion):
         idx_space = self.str.rfind(" ")
         idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
         self.str = self.str[:idx_word]
-        self.str = self.str + self.word4.upper()
-        self.update_mongo_sentence()
+        self.str = self.str + suggestion.upper()
 
     def speak_fun(self):
-        self.speak_engine.say(self.str)
-        self.speak_engine.runAndWait()
+        tts = self.loader.value("speech")
+        if tts is not None:
+            tts.say(self.str)
 
     def clear_fun(self):
-        self.str=" "
-        self.word1 = " "
-        self.word2 = " "
-        self.word3 = " "
-        self.word4 = " "
+        suggester = self.loader.value("dictionary")
+        if suggester is not None:
+            suggester.cancel()
+        with self.state_lock:
+            self.str=" "
+            self.word1 = " "
+            self.word2 = " "
+            self.word3 = " "
+            self.word4 = " "
         self.update_mongo_sentence()
 
-    def predict(self, test_image):
-        white=test_image
-        white = white.reshape(1, 400, 400, 3)
-        prob = np.array(self.model.predict(white)[0], dtype='float32')
-        ch1 = np.argmax(prob, axis=0)
-        prob[ch1] = 0
-        ch2 = np.argmax(prob, axis=0)
-        prob[ch2] = 0
-        ch3 = np.argmax(prob, axis=0)
-        prob[ch3] = 0
-
-        pl = [ch1, ch2]
-
-        # condition for [Aemnst]
-        l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-             [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-             [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 0
-
-        # condition for [o][s]
-        l = [[2, 2], [2, 1]]
-        if pl in l:
-            if (self.pts[5][0] < self.pts[4][0]):
-                ch1 = 0
-                print("++++++++++++++++++")
-                # print("00000")
-
-        # condition for [c0][aemnst]
-        l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[4][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][
-                0] and self.pts[0][0] > self.pts[20][0]) and self.pts[5][0] > self.pts[4][0]:
-                ch1 = 2
-
-        # condition for [c0][aemnst]
-        l = [[6, 0], [6, 6], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) < 52:
-                ch1 = 2
-
-
-        # condition for [gh][bdfikruvw]
-        l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1] and self.pts[0][0] < self.pts[8][
-                0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 3
-
-
-
-        # con for [gh][l]
-        l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 3
-
-        # con for [gh][pqz]
-        l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[2][1] + 15 < self.pts[16][1]:
-                ch1 = 3
-
-        # con for [l][x]
-        l = [[6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) > 55:
-                ch1 = 4
-
-        # con for [l][d]
-        l = [[1, 4], [1, 6], [1, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) > 50) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 4
-
-        # con for [l][gh]
-        l = [[3, 6], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[0][0]):
-                ch1 = 4
-
-        # con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[1][0] < self.pts[12][0]):
-                ch1 = 4
-
-        # con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[1][0] < self.pts[12][0]):
-                ch1 = 4
-
-        # con for [gh][z]
-        l = [[3, 6], [3, 5], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]) and self.pts[4][1] > self.pts[10][1]:
-                ch1 = 5
-
-        # con for [gh][pq]
-        l = [[3, 2], [3, 1], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][1] + 17 > self.pts[8][1] and self.pts[4][1] + 17 > self.pts[12][1] and self.pts[4][1] + 17 > self.pts[16][1] and self.pts[4][
-                1] + 17 > self.pts[20][1]:
-                ch1 = 5
-
-        # con for [l][pqz]
-        l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 5
-
-        # con for [pqz][aemnst]
-        l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[0][0] < self.pts[8][0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 5
-
-        # con for [pqz][yj]
-        l = [[5, 7], [5, 2], [5, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[3][0] < self.pts[0][0]:
-                ch1 = 7
-
-        # con for [l][yj]
-        l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[6][1] < self.pts[8][1]:
-                ch1 = 7
-
-        # con for [x][yj]
-        l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[18][1] > self.pts[20][1]:
-                ch1 = 7
-
-        # condition for [x][aemnst]
-        l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] > self.pts[16][0]:
-                ch1 = 6
-
-
-        # condition for [yj][x]
-        print("2222  ch1=+++++++++++++++++", ch1, ",", ch2)
-        l = [[7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[18][1] < self.pts[20][1] and self.pts[8][1] < self.pts[10][1]:
-                ch1 = 6
-
-        # condition for [c0][x]
-        l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) > 50:
-                ch1 = 6
-
-        # con for [l][x]
-
-        l = [[4, 6], [4, 2], [4, 1], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) < 60:
-                ch1 = 6
-
-        # con for [x][d]
-        l = [[1, 4], [1, 6], [1, 0], [1, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 > 0:
-                ch1 = 6
-
-        # con for [b][pqz]
-        l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0],
-             [6, 3], [6, 4], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 1
-
-        # con for [f][pqz]
-        l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1],
-             [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and
-                    self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and
-                    self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        # con for [d][pqz]
-        fg = 19
-        # print("_________________ch1=",ch1," ch2=",ch2)
-        l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[4][1] > self.pts[14][1]):
-                ch1 = 1
-
-        l = [[4, 1], [4, 2], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) < 50) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 1
-
-        l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[14][1] < self.pts[4][1]):
-                ch1 = 1
-
-        l = [[6, 6], [6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 < 0:
-                ch1 = 1
-
-        # con for [i][pqz]
-        l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] > self.pts[20][1])):
-                ch1 = 1
-
-        # con for [yj][bfdi]
-        l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[5][0] + 15) and (
-            (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-             self.pts[18][1] > self.pts[20][1])):
-                ch1 = 7
-
-        # con for [uvr]
-        l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1])) and self.pts[4][1] > self.pts[14][1]:
-                ch1 = 1
-
-        # con for [w]
-        fg = 13
-        l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if not (self.pts[0][0] + fg < self.pts[8][0] and self.pts[0][0] + fg < self.pts[12][0] and self.pts[0][0] + fg < self.pts[16][0] and
-                    self.pts[0][0] + fg < self.pts[20][0]) and not (
-                    self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][
-                0]) and self.distance(self.pts[4], self.pts[11]) < 50:
-                ch1 = 1
-
-        # con for [w]
-
-        l = [[5, 0], [5, 5], [0, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1]:
-                ch1 = 1
-
-        # -------------------------condn for 8 groups  ends
-
-        # -------------------------condn for subgroups  starts
-        #
-        if ch1 == 0:
-            ch1 = 'S'
-            if self.pts[4][0] < self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0]:
-                ch1 = 'A'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][
-                0] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'T'
-            if self.pts[4][1] > self.pts[8][1] and self.pts[4][1] > self.pts[12][1] and self.pts[4][1] > self.pts[16][1] and self.pts[4][1] > self.pts[20][1]:
-                ch1 = 'E'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][0] > self.pts[14][0] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'M'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][1] < self.pts[18][1] and self.pts[4][1] < self.pts[14][1]:
-                ch1 = 'N'
-
-        if ch1 == 2:
-            if self.distance(self.pts[12], self.pts[4]) > 42:
-                ch1 = 'C'
-            else:
-                ch1 = 'O'
-
-        if ch1 == 3:
-            if (self.distance(self.pts[8], self.pts[12])) > 72:
-                ch1 = 'G'
-            else:
-                ch1 = 'H'
-
-        if ch1 == 7:
-            if self.distance(self.pts[8], self.pts[4]) > 42:
-                ch1 = 'Y'
-            else:
-                ch1 = 'J'
-
-        if ch1 == 4:
-            ch1 = 'L'
-
-        if ch1 == 6:
-            ch1 = 'X'
-
-        if ch1 == 5:
-            if self.pts[4][0] > self.pts[12][0] and self.pts[4][0] > self.pts[16][0] and self.pts[4][0] > self.pts[20][0]:
-                if self.pts[8][1] < self.pts[5][1]:
-                    ch1 = 'Z'
-                else:
-                    ch1 = 'Q'
-            else:
-                ch1 = 'P'
-
-        if ch1 == 1:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'B'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 'D'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'F'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'I'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 'W'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]) and self.pts[4][1] < self.pts[9][1]:
-                ch1 = 'K'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) < 8) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 'U'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) >= 8) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]) and (self.pts[4][1] > self.pts[9][1]):
-                ch1 = 'V'
-
-            if (self.pts[8][0] > self.pts[12][0]) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 'R'
-
-        if ch1 == 1 or ch1 =='E' or ch1 =='S' or ch1 =='X' or ch1 =='Y' or ch1 =='B':
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1=" "
-
-
-
-        print(self.pts[4][0] < self.pts[5][0])
-        if ch1 == 'E' or ch1=='Y' or ch1=='B':
-            if (self.pts[4][0] < self.pts[5][0]) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1="next"
-
-
-        if ch1 == 'Next' or 'B' or 'C' or 'H' or 'F' or 'X':
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and (self.pts[4][1] < self.pts[8][1] and self.pts[4][1] < self.pts[12][1] and self.pts[4][1] < self.pts[16][1] and self.pts[4][1] < self.pts[20][1]) and (self.pts[4][1] < self.pts[6][1] and self.pts[4][1] < self.pts[10][1] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]):
-                ch1 = 'Backspace'
-
-
-        if ch1=="next" and self.prev_char!="next":
-            if self.ten_prev_char[(self.count-2)%10]!="next":
-                if self.ten_prev_char[(self.count-2)%10]=="Backspace":
-                    self.str=self.str[0:-1]
-                else:
-                    if self.ten_prev_char[(self.count - 2) % 10] != "Backspace":
-                        self.str = self.str + self.ten_prev_char[(self.count-2)%10]
-            else:
-                if self.ten_prev_char[(self.count - 0) % 10] != "Backspace":
-                    self.str = self.str + self.ten_prev_char[(self.count - 0) % 10]
-
-
-        if ch1=="  " and self.prev_char!="  ":
-            self.str = self.str + "  "
-
-        self.prev_char=ch1
-        self.current_symbol=ch1
-        self.count += 1
-        self.ten_prev_char[self.count%10]=ch1
+    def predict(self, test_image, cached=None):
+        """Classify the skeleton, or take (prob, symbol) from the motion gate, and decode it"""
+        classifier = self.loader.value("classifier")
+        if classifier is None:
+            return
+        if cached is not None:
+            prob, ch1 = cached
+        else:
+            with profiler.measure("inference"):
+                prob = classifier.predict(image=test_image, pts=self.pts)
+            with profiler.measure("rules"):
+                ch1, ch2 = top_two(prob)
+                ch1 = rules.classify(ch1, ch2, self.pts)
+            self.gate.store((prob, ch1))
+        if not self.predicted:
+            self.predicted = True
+            self.loader.milestone("first_prediction")
+            self.loader.log_report()
+        if recorder:
+            recorder.write(self.pts, prob, ch1)
+
+        with self.state_lock:
+            self.str = apply_edits(self.str, self.decoder.step(ch1, float(np.max(prob))))
+            self.current_symbol = self.decoder.current
+            sentence = self.str
         # Update MongoDB after every prediction
         self.update_mongo_sentence()
 
 
-        if len(self.str.strip())!=0:
-            st=self.str.rfind(" ")
-            ed=len(self.str)
-            word=self.str[st+1:ed]
+        if len(sentence.strip())!=0:
+            st=sentence.rfind(" ")
+            ed=len(sentence)
+            word=sentence[st+1:ed]
             self.word=word
+            suggester = self.loader.value("dictionary")
             if len(word.strip())!=0:
-                ddd.check(word)
-                lenn = len(ddd.suggest(word))
-                if lenn >= 4:
-                    self.word4 = ddd.suggest(word)[3]
-
-                if lenn >= 3:
-                    self.word3 = ddd.suggest(word)[2]
-
-                if lenn >= 2:
-                    self.word2 = ddd.suggest(word)[1]
-
-                if lenn >= 1:
-                    self.word1 = ddd.suggest(word)[0]
+                if suggester is not None:
+                    suggester.request(word)
             else:
+                if suggester is not None:
+                    suggester.cancel()
                 self.word1 = " "
                 self.word2 = " "
                 self.word3 = " "
                 self.word4 = " "
 
 
+    def set_suggestions(self, word, suggestions):
+        """Called by the suggestion service; fewer than four suggestions leave the rest as they were"""
+        if len(suggestions) >= 4:
+            self.word4 = suggestions[3]
+        if len(suggestions) >= 3:
+            self.word3 = suggestions[2]
+        if len(suggestions) >= 2:
+            self.word2 = suggestions[1]
+        if len(suggestions) >= 1:
+            self.word1 = suggestions[0]
+
     def destructor(self):
-        print(self.ten_prev_char)
+        self.pipeline.stop()
+        for name in ("dictionary", "speech", "mongo"):
+            part = self.loader.value(name)
+            if part is not None:
+                part.stop()
+        resources.shutdown()
+        publisher = self.loader.value("mongo")
+        if publisher is not None:
+            log.info("Sentence writes: %d, failed attempts: %d", publisher.writes, publisher.failures)
+        suggester = self.loader.value("dictionary")
+        if suggester is not None:
+            log.info("Suggestion cache: %d hits, %d misses", suggester.hits, suggester.misses)
+        if not self.predicted:
+            self.loader.log_report()
+        log.info("Motion gate: %s", self.gate.summary_text(profiler.snapshot()))
+        tracker = self.loader.value("tracker")
+        if tracker is not None and tracker.mode == "roi":
+            log.info("Hand tracking: %s", tracker.tracking_stats())
+        log.info("Activity: %s", self.activity.summary_text())
+        log.info("Quality: %s", self.quality.summary_text())
+        log.info("Stage latency (ms):\n%s", profiler.summary_text())
+        log.info("Dropped frames: %d", self.pipeline.dropped_frames())
+        profiler.close()
         self.root.destroy()
         self.vs.release()
         cv2.destroyAllWindows()
 
 
-print("Starting Application...")
-print("Before Application instantiation")
+
 (Application()).root.mainloop()
-print("After mainloop")
@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from camera import camera_settings_from_env, open_camera
+from recording import read_recording
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def bbox_from_pts(pts):
+    """(x, y, w, h) extent of a landmark set, for sources that did not record the detector bbox"""
+    pts = np.asarray(pts)[:, :2]
+    x0, y0 = pts.min(axis=0)
+    x1, y1 = pts.max(axis=0)
+    return int(x0), int(y0), int(x1 - x0), int(y1 - y0)
+
+
+class CaptureSource:
+    """Frames from a cv2.VideoCapture; read() and release() match cv2.VideoCapture"""
+
+    def __init__(self, capture, name):
+        self.capture = capture
+        self.name = name
+        self.exhausted = False
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        self.capture.release()
+
+    def __iter__(self):
+        while True:
+            ok, frame = self.read()
+            if not ok:
+                return
+            yield {'image': frame, 'label': None}
+
+
+class CameraSource(CaptureSource):
+    """Live webcam
+
+    backend and settings are passed to camera.open_camera (fourcc, width, height, fps, buffer);
+    settings None opens the driver defaults for a camera that has not been probed yet.
+    A failed read is a dropped frame; `exhausted` only turns True for file sources that ran out.
+    """
+
+    def __init__(self, index=0, backend="any", settings=None):
+        super().__init__(open_camera(index, backend, **(settings or {})), f"camera {index}")
+        self.index = index
+        self.backend = backend
+        self.settings = settings
+        self.lock = threading.Lock()
+
+    def read(self):
+        with self.lock:
+            return self.capture.read()
+
+    def reconfigure(self, choose):
+        """Close the camera, call choose() while it is free and reopen it with the settings returned
+
+        read() waits until the camera is open again.
+        """
+        with self.lock:
+            self.capture.release()
+            try:
+                self.settings = choose()
+            finally:
+                self.capture = open_camera(self.index, self.backend, **(self.settings or {}))
+
+
+class VideoFileSource(CaptureSource):
+    """Recorded video; paced=True replays at the file's frame rate instead of as fast as possible"""
+
+    def __init__(self, path, label=None, paced=False):
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise IOError(f"Cannot open video '{path}'")
+        super().__init__(capture, path)
+        self.label = label
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.interval = 1.0 / fps if paced and fps > 0 else 0.0
+        self.next_time = 0.0
+
+    def read(self):
+        if self.interval:
+            delay = self.next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time = max(self.next_time, time.monotonic()) + self.interval
+        ok, frame = self.capture.read()
+        if not ok:
+            self.exhausted = True
+        return ok, frame
+
+    def __iter__(self):
+        for item in super().__iter__():
+            item['label'] = self.label
+            yield item
+
+
+class ImageDirSource:
+    """Images in dir/<letter>/ (the AtoZ_3.1 layout) or directly in dir
+
+    The sub-directory name is the label. A .npy landmark sidecar written by
+    data_collection_final.py is attached as 'pts' so detection can be skipped.
+    """
+
+    def __init__(self, root, label=None):
+        self.name = root
+        self.files = []
+        for dirpath, _, filenames in sorted(os.walk(root)):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(dirpath, filename)
+                    sub = os.path.relpath(dirpath, root)
+                    self.files.append((path, label or (sub.upper() if sub != "." else None)))
+        self.position = 0
+        self.exhausted = False
+
+    def __len__(self):
+        return len(self.files)
+
+    def read(self):
+        while self.position < len(self.files):
+            path, _ = self.files[self.position]
+            self.position += 1
+            image = cv2.imread(path)
+            if image is not None:
+                return True, image
+        self.exhausted = True
+        return False, None
+
+    def release(self):
+        self.position = len(self.files)
+
+    def __iter__(self):
+        for path, label in self.files:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            item = {'image': image, 'label': label, 'name': path}
+            sidecar = os.path.splitext(path)[0] + ".npy"
+            if os.path.exists(sidecar):
+                item['pts'] = np.load(sidecar)
+            yield item
+
+
+class LandmarkStreamSource:
+    """Frames recorded by recording.LandmarkRecorder; the recorded symbol is the label"""
+
+    def __init__(self, path, label=None):
+        self.name = path
+        self.path = path
+        self.label = label
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        for record in read_recording(self.path):
+            item = {'pts': np.asarray(record['pts']), 'label': self.label or record.get('symbol')}
+            if 'bbox' in record:
+                item['bbox'] = tuple(record['bbox'])
+            yield item
+
+
+def open_source(spec, label=None, paced=False):
+    """Camera index, image directory, .jsonl landmark recording or video file"""
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, label)
+    if spec.endswith(".jsonl"):
+        return LandmarkStreamSource(spec, label)
+    return VideoFileSource(spec, label, paced)
+
+
+def source_from_env(default="0", probe_camera=True):
+    """Frame source for the interactive scripts: SIGN_SOURCE, else the default webcam
+
+    Cameras are opened with the settings from camera.camera_settings_from_env. With
+    probe_camera=False a camera that is due a probe opens with the driver defaults and
+    settings None; CameraSource.reconfigure(probe) can switch it later.
+    """
+    spec = os.environ.get("SIGN_SOURCE", default)
+    if spec.isdigit():
+        return CameraSource(int(spec), *camera_settings_from_env(int(spec), probe_missing=probe_camera))
+    source = open_source(spec, paced=True)
+    if not hasattr(source, "read"):
+        raise ValueError(f"{source.name} has no images; replay it with benchmark_pipeline.py")
+    return source
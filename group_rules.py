@@ -0,0 +1,295 @@
+import os
+from bisect import bisect_right
+
+import numpy as np
+
+from landmarks import scale_to_palm
+
+# The CNN predicts one of 8 letter groups:
+# [0->aemnst][1->bfdiuvwkr][2->co][3->gh][4->l][5->pqz][6->x][7->yj]
+# The rules below re-assign the group from the top-2 prediction using hand geometry,
+# then pick the letter inside the group and finally detect the control gestures.
+
+FINGER_TIPS = np.array([8, 12, 16, 20])
+FINGER_PIPS = np.array([6, 10, 14, 18])
+
+# Pairwise distances used by the rules, computed once per frame
+DISTANCE_PAIRS = ((8, 16), (4, 11), (12, 4), (8, 12), (8, 4), (6, 10))
+_DIST_A = np.array([a for a, _ in DISTANCE_PAIRS])
+_DIST_B = np.array([b for _, b in DISTANCE_PAIRS])
+_DIST_INDEX = {pair: i for i, pair in enumerate(DISTANCE_PAIRS)}
+
+
+_BIT_WEIGHTS = np.array([1, 2, 4, 8])
+_MASKS = {}
+
+
+def _finger_masks(pattern):
+    masks = _MASKS.get(pattern)
+    if masks is None:
+        up = sum(1 << i for i, c in enumerate(pattern) if c == 'U')
+        down = sum(1 << i for i, c in enumerate(pattern) if c == 'D')
+        masks = _MASKS[pattern] = (up, down)
+    return masks
+
+
+class HandFeatures:
+    """Per-frame finger states and distances shared by every rule
+
+    p holds the crop landmarks as they are, so the thresholds below are the original pixel
+    counts. With palm set, the hand is first scaled about the wrist so its palm measures
+    that many pixels, and the thresholds hold at any capture resolution or distance.
+
+    vector holds [up x4, down x4, distances x6]; a finger is "up" when its PIP joint is
+    below its tip in image coordinates and "down" when it is above, exactly like the
+    original pts[pip][1] > pts[tip][1] comparisons.
+    """
+
+    __slots__ = ('p', 'up', 'down', 'dist', 'vector', 'up_bits', 'down_bits')
+
+    def __init__(self, pts, palm=None):
+        p = scale_to_palm(pts, palm) if palm else np.asarray(pts)[:, :2]
+        pip_y = p[FINGER_PIPS, 1]
+        tip_y = p[FINGER_TIPS, 1]
+        diff = p[_DIST_A] - p[_DIST_B]
+
+        self.p = p
+        self.up = pip_y > tip_y
+        self.down = pip_y < tip_y
+        self.dist = np.sqrt((diff * diff).sum(axis=1))
+        self.vector = np.concatenate([self.up, self.down, self.dist])
+        self.up_bits = int(self.up @ _BIT_WEIGHTS)
+        self.down_bits = int(self.down @ _BIT_WEIGHTS)
+
+    def d(self, a, b):
+        return self.dist[_DIST_INDEX[(a, b)]]
+
+    def fingers(self, pattern):
+        """Match the index..pinky states against a pattern of U (up), D (down) and . (any)"""
+        up_mask, down_mask = _finger_masks(pattern)
+        return (self.up_bits & up_mask) == up_mask and (self.down_bits & down_mask) == down_mask
+
+
+def _wrist_right_of_tips(f):
+    return bool((f.p[0, 0] > f.p[FINGER_TIPS, 0]).all())
+
+
+def _wrist_left_of_tips(f, margin=0):
+    return bool((f.p[0, 0] + margin < f.p[FINGER_TIPS, 0]).all())
+
+
+# Predicate ID -> test on HandFeatures. IDs are referenced by the rule tables below.
+# Lengths are in crop pixels, or in pixels of the rescaled hand with RuleEngine(palm=...).
+PREDICATES = {
+    'all_curled': lambda f: f.fingers('DDDD'),
+    'thumb_right_of_index_mcp': lambda f: f.p[5, 0] < f.p[4, 0],
+    'c_shape': lambda f: bool((f.p[0, 0] > f.p[[8, 4, 12, 16, 20], 0]).all()) and f.p[5, 0] > f.p[4, 0],
+    'index_ring_close': lambda f: f.d(8, 16) < 52,
+    'index_pointing_sideways': lambda f: f.fingers('U.DD') and _wrist_left_of_tips(f),
+    'thumb_right_of_wrist': lambda f: f.p[4, 0] > f.p[0, 0],
+    'ring_tip_below_thumb_cmc': lambda f: f.p[2, 1] + 15 < f.p[16, 1],
+    'thumb_far_from_middle': lambda f: f.d(4, 11) > 55,
+    'index_only_thumb_out': lambda f: f.d(4, 11) > 50 and f.fingers('UDDD'),
+    'thumb_left_of_wrist': lambda f: f.p[4, 0] < f.p[0, 0],
+    'thumb_cmc_left_of_middle_tip': lambda f: f.p[1, 0] < f.p[12, 0],
+    'index_only_thumb_low': lambda f: f.fingers('UDDD') and f.p[4, 1] > f.p[10, 1],
+    'thumb_near_tips_height': lambda f: bool((f.p[4, 1] + 17 > f.p[FINGER_TIPS, 1]).all()),
+    'wrist_left_of_tips': lambda f: _wrist_left_of_tips(f),
+    'thumb_ip_left_of_wrist': lambda f: f.p[3, 0] < f.p[0, 0],
+    'index_curled': lambda f: f.fingers('D...'),
+    'pinky_up': lambda f: f.fingers('...U'),
+    'index_mcp_right_of_ring_tip': lambda f: f.p[5, 0] > f.p[16, 0],
+    'pinky_and_index_hooked': lambda f: f.fingers('...D') and f.p[8, 1] < f.p[10, 1],
+    'index_ring_apart': lambda f: f.d(8, 16) > 50,
+    'thumb_near_middle': lambda f: f.d(4, 11) < 60,
+    'thumb_left_of_index_mcp': lambda f: f.p[5, 0] - f.p[4, 0] - 15 > 0,
+    'all_up': lambda f: f.fingers('UUUU'),
+    'index_down_others_up': lambda f: f.fingers('DUUU'),
+    'middle_ring_pinky_up': lambda f: f.fingers('.UUU'),
+    'index_only_thumb_under_ring': lambda f: f.fingers('UDDD') and f.p[2, 0] < f.p[0, 0] and f.p[4, 1] > f.p[14, 1],
+    'index_only_thumb_close': lambda f: f.d(4, 11) < 50 and f.fingers('UDDD'),
+    'thumb_right_of_index_mcp_margin': lambda f: f.p[5, 0] - f.p[4, 0] - 15 < 0,
+    'pinky_only': lambda f: f.fingers('DDDU'),
+    'pinky_only_thumb_in': lambda f: f.p[4, 0] < f.p[5, 0] + 15 and f.fingers('DDDU'),
+    'two_up_thumb_low': lambda f: f.fingers('UUDD') and f.p[4, 1] > f.p[14, 1],
+    'w_spread': lambda f: (not _wrist_left_of_tips(f, 13) and not _wrist_right_of_tips(f)
+                           and f.d(4, 11) < 50),
+    'three_up': lambda f: f.fingers('UUU.'),
+
+    # Letters inside a group
+    'thumb_left_of_pips': lambda f: bool((f.p[4, 0] < f.p[FINGER_PIPS, 0]).all()),
+    't_shape': lambda f: (f.p[4, 0] > f.p[6, 0] and bool((f.p[4, 0] < f.p[[10, 14, 18], 0]).all())
+                          and f.p[4, 1] < f.p[14, 1] and f.p[4, 1] < f.p[18, 1]),
+    'thumb_below_tips': lambda f: bool((f.p[4, 1] > f.p[FINGER_TIPS, 1]).all()),
+    'm_shape': lambda f: bool((f.p[4, 0] > f.p[[6, 10, 14], 0]).all()) and f.p[4, 1] < f.p[18, 1],
+    'n_shape': lambda f: (f.p[4, 0] > f.p[6, 0] and f.p[4, 0] > f.p[10, 0]
+                          and f.p[4, 1] < f.p[18, 1] and f.p[4, 1] < f.p[14, 1]),
+    'c_open': lambda f: f.d(12, 4) > 42,
+    'g_spread': lambda f: f.d(8, 12) > 72,
+    'y_spread': lambda f: f.d(8, 4) > 42,
+    'thumb_outside_fingers': lambda f: bool((f.p[4, 0] > f.p[[12, 16, 20], 0]).all()),
+    'z_shape': lambda f: bool((f.p[4, 0] > f.p[[12, 16, 20], 0]).all()) and f.p[8, 1] < f.p[5, 1],
+    'fingers_UUUU': lambda f: f.fingers('UUUU'),
+    'fingers_UDDD': lambda f: f.fingers('UDDD'),
+    'fingers_DUUU': lambda f: f.fingers('DUUU'),
+    'fingers_DDDU': lambda f: f.fingers('DDDU'),
+    'fingers_UUUD': lambda f: f.fingers('UUUD'),
+    'k_shape': lambda f: f.fingers('UUDD') and f.p[4, 1] < f.p[9, 1],
+    'u_shape': lambda f: (f.d(8, 12) - f.d(6, 10)) < 8 and f.fingers('UUDD'),
+    'v_shape': lambda f: (f.d(8, 12) - f.d(6, 10)) >= 8 and f.fingers('UUDD') and f.p[4, 1] > f.p[9, 1],
+    'r_shape': lambda f: f.p[8, 0] > f.p[12, 0] and f.fingers('UUDD'),
+
+    # Control gestures
+    'space': lambda f: f.fingers('UDDU'),
+    'next': lambda f: f.p[4, 0] < f.p[5, 0] and f.fingers('UUUU'),
+    'backspace': lambda f: (_wrist_right_of_tips(f)
+                            and bool((f.p[4, 1] < f.p[FINGER_TIPS, 1]).all())
+                            and bool((f.p[4, 1] < f.p[FINGER_PIPS, 1]).all())),
+}
+
+# Group re-assignment, evaluated in order against the current (ch1, ch2) pair.
+# Each entry is (comment, [(ch1, ch2), ...], predicate ID, new ch1).
+GROUP_RULES = [
+    ("[Aemnst]", [(5, 2), (5, 3), (3, 5), (3, 6), (3, 0), (3, 2), (6, 4), (6, 1), (6, 2), (6, 6), (6, 7), (6, 0),
+                  (6, 5), (4, 1), (1, 0), (1, 1), (6, 3), (1, 6), (5, 6), (5, 1), (4, 5), (1, 4), (1, 5), (2, 0),
+                  (2, 6), (4, 6), (5, 7), (7, 6), (2, 5), (7, 1), (5, 4), (7, 0), (7, 5), (7, 2)],
+     'all_curled', 0),
+    ("[o][s]", [(2, 2), (2, 1)], 'thumb_right_of_index_mcp', 0),
+    ("[c0][aemnst]", [(0, 0), (0, 6), (0, 2), (0, 5), (0, 1), (0, 7), (5, 2), (7, 6), (7, 1)], 'c_shape', 2),
+    ("[c0][x]", [(6, 0), (6, 6), (6, 2)], 'index_ring_close', 2),
+    ("[gh][bdfikruvw]", [(1, 4), (1, 5), (1, 6), (1, 3), (1, 0)], 'index_pointing_sideways', 3),
+    ("[gh][l]", [(4, 6), (4, 1), (4, 5), (4, 3), (4, 7)], 'thumb_right_of_wrist', 3),
+    ("[gh][pqz]", [(5, 3), (5, 0), (5, 7), (5, 4), (5, 2), (5, 1), (5, 5)], 'ring_tip_below_thumb_cmc', 3),
+    ("[l][x]", [(6, 4), (6, 1), (6, 2)], 'thumb_far_from_middle', 4),
+    ("[l][d]", [(1, 4), (1, 6), (1, 1)], 'index_only_thumb_out', 4),
+    ("[l][gh]", [(3, 6), (3, 4)], 'thumb_left_of_wrist', 4),
+    # The original checked [l][c0] twice in a row; the repeat can never fire and is omitted
+    ("[l][c0]", [(2, 2), (2, 5), (2, 4)], 'thumb_cmc_left_of_middle_tip', 4),
+    ("[gh][z]", [(3, 6), (3, 5), (3, 4)], 'index_only_thumb_low', 5),
+    ("[gh][pq]", [(3, 2), (3, 1), (3, 6)], 'thumb_near_tips_height', 5),
+    ("[l][pqz]", [(4, 4), (4, 5), (4, 2), (7, 5), (7, 6), (7, 0)], 'thumb_right_of_wrist', 5),
+    ("[pqz][aemnst]", [(0, 2), (0, 6), (0, 1), (0, 5), (0, 0), (0, 7), (0, 4), (0, 3), (2, 7)],
+     'wrist_left_of_tips', 5),
+    ("[pqz][yj]", [(5, 7), (5, 2), (5, 6)], 'thumb_ip_left_of_wrist', 7),
+    ("[l][yj]", [(4, 6), (4, 2), (4, 4), (4, 1), (4, 5), (4, 7)], 'index_curled', 7),
+    ("[x][yj]", [(6, 7), (0, 7), (0, 1), (0, 0), (6, 4), (6, 6), (6, 5), (6, 1)], 'pinky_up', 7),
+    ("[x][aemnst]", [(0, 4), (0, 2), (0, 3), (0, 1), (0, 6)], 'index_mcp_right_of_ring_tip', 6),
+    ("[yj][x]", [(7, 2)], 'pinky_and_index_hooked', 6),
+    ("[c0][x]", [(2, 1), (2, 2), (2, 6), (2, 7), (2, 0)], 'index_ring_apart', 6),
+    ("[l][x]", [(4, 6), (4, 2), (4, 1), (4, 4)], 'thumb_near_middle', 6),
+    ("[x][d]", [(1, 4), (1, 6), (1, 0), (1, 2)], 'thumb_left_of_index_mcp', 6),
+    ("[b][pqz]", [(5, 0), (5, 1), (5, 4), (5, 5), (5, 6), (6, 1), (7, 6), (0, 2), (7, 1), (7, 4), (6, 6), (7, 2),
+                  (6, 3), (6, 4), (7, 5)],
+     'all_up', 1),
+    ("[f][pqz]", [(6, 1), (6, 0), (0, 3), (6, 4), (2, 2), (0, 6), (6, 2), (7, 6), (4, 6), (4, 1), (4, 2), (0, 2),
+                  (7, 1), (7, 4), (6, 6), (7, 2), (7, 5)],
+     'index_down_others_up', 1),
+    ("[f][x]", [(6, 1), (6, 0), (4, 2), (4, 1), (4, 6), (4, 4)], 'middle_ring_pinky_up', 1),
+    ("[d][pqz]", [(5, 0), (3, 4), (3, 0), (3, 1), (3, 5), (5, 5), (5, 4), (5, 1), (7, 6)],
+     'index_only_thumb_under_ring', 1),
+    ("[d][l]", [(4, 1), (4, 2), (4, 4)], 'index_only_thumb_close', 1),
+    ("[d][gh]", [(3, 4), (3, 0), (3, 1), (3, 5), (3, 6)], 'index_only_thumb_under_ring', 1),
+    ("[d][x]", [(6, 6), (6, 4), (6, 1), (6, 2)], 'thumb_right_of_index_mcp_margin', 1),
+    ("[i][pqz]", [(5, 4), (5, 5), (5, 1), (0, 3), (0, 7), (5, 0), (0, 2), (6, 2), (7, 5), (7, 1), (7, 6), (7, 7)],
+     'pinky_only', 1),
+    ("[yj][bfdi]", [(1, 5), (1, 7), (1, 1), (1, 6), (1, 3), (1, 0)], 'pinky_only_thumb_in', 7),
+    ("[uvr]", [(5, 5), (5, 0), (5, 4), (5, 1), (4, 6), (4, 1), (7, 6), (3, 0), (3, 5)], 'two_up_thumb_low', 1),
+    ("[w]", [(3, 5), (3, 0), (3, 6), (5, 1), (4, 1), (2, 0), (5, 0), (5, 5)], 'w_spread', 1),
+    ("[w]", [(5, 0), (5, 5), (0, 1)], 'three_up', 1),
+]
+
+# Letter inside each group: (default, [(letter, predicate ID), ...]); the last matching entry wins.
+# Group 1 keeps the integer 1 when no letter matches, as before.
+LETTER_RULES = {
+    0: ('S', [('A', 'thumb_left_of_pips'), ('T', 't_shape'), ('E', 'thumb_below_tips'),
+              ('M', 'm_shape'), ('N', 'n_shape')]),
+    1: (1, [('B', 'fingers_UUUU'), ('D', 'fingers_UDDD'), ('F', 'fingers_DUUU'), ('I', 'fingers_DDDU'),
+            ('W', 'fingers_UUUD'), ('K', 'k_shape'), ('U', 'u_shape'), ('V', 'v_shape'), ('R', 'r_shape')]),
+    2: ('O', [('C', 'c_open')]),
+    3: ('H', [('G', 'g_spread')]),
+    4: ('L', []),
+    5: ('P', [('Q', 'thumb_outside_fingers'), ('Z', 'z_shape')]),
+    6: ('X', []),
+    7: ('J', [('Y', 'y_spread')]),
+}
+
+# Control gestures, in order: (symbols they can replace or None for any, predicate ID, new symbol)
+# Backspace has always been checked regardless of the current symbol.
+CONTROL_RULES = [
+    ((1, 'E', 'S', 'X', 'Y', 'B'), 'space', " "),
+    (('E', 'Y', 'B'), 'next', "next"),
+    (None, 'backspace', 'Backspace'),
+]
+
+
+class RuleEngine:
+    """Table-driven evaluation of GROUP_RULES, LETTER_RULES and CONTROL_RULES
+
+    palm rescales every hand to that palm size in pixels first (see HandFeatures); None
+    applies the rules to the crop pixels, as the original recognizer did.
+    """
+
+    def __init__(self, group_rules=GROUP_RULES, letter_rules=LETTER_RULES, control_rules=CONTROL_RULES,
+                 predicates=PREDICATES, palm=None):
+        self.predicates = predicates
+        self.palm = palm
+        self.letter_rules = letter_rules
+        self.control_rules = control_rules
+
+        # (ch1, ch2) -> ordered rule positions and [(position, predicate ID, new ch1), ...]
+        self.positions = {}
+        self.by_pair = {}
+        for pos, (_, pairs, predicate, target) in enumerate(group_rules):
+            if predicate not in predicates:
+                raise KeyError(f"Unknown predicate '{predicate}'")
+            for pair in dict.fromkeys(pairs):
+                self.positions.setdefault(pair, []).append(pos)
+                self.by_pair.setdefault(pair, []).append((pos, predicate, target))
+
+    def resolve_group(self, ch1, ch2, features):
+        """Apply the group rules in order, only visiting rules listed for the current pair"""
+        ch1, ch2 = int(ch1), int(ch2)
+        last = -1
+        while True:
+            positions = self.positions.get((ch1, ch2))
+            if not positions:
+                return ch1
+            i = bisect_right(positions, last)
+            if i == len(positions):
+                return ch1
+            last, predicate, target = self.by_pair[(ch1, ch2)][i]
+            if self.predicates[predicate](features):
+                ch1 = target
+
+    def resolve_letter(self, group, features):
+        default, candidates = self.letter_rules[group]
+        symbol = default
+        for letter, predicate in candidates:
+            if self.predicates[predicate](features):
+                symbol = letter
+        return symbol
+
+    def resolve_control(self, symbol, features):
+        for sources, predicate, replacement in self.control_rules:
+            if (sources is None or symbol in sources) and self.predicates[predicate](features):
+                symbol = replacement
+        return symbol
+
+    def classify(self, ch1, ch2, pts):
+        """Map the top-2 CNN groups and the crop landmarks to a letter or control symbol"""
+        features = HandFeatures(pts, self.palm)
+        group = self.resolve_group(ch1, ch2, features)
+        return self.resolve_control(self.resolve_letter(group, features), features)
+
+
+def rules_palm_from_env():
+    """SIGN_RULES_PALM: palm size in pixels the rules rescale hands to, 0 (default) for the crop pixels"""
+    return float(os.environ.get("SIGN_RULES_PALM", 0)) or None
+
+
+def top_two(prob):
+    """Indices of the two most likely groups, ties resolved like np.argmax"""
+    prob = np.array(prob, dtype='float32')
+    ch1 = int(np.argmax(prob))
+    prob[ch1] = 0
+    return ch1, int(np.argmax(prob))
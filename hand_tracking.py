@@ -0,0 +1,188 @@
+import os
+import time
+from contextlib import nullcontext
+
+import cv2
+from cvzone.HandTrackingModule import HandDetector
+
+# "cascade" runs MediaPipe on the full frame and again on the hand crop,
+# "single" runs it once and maps the landmarks into crop coordinates,
+# "roi" searches only around the previous frame's hand and goes back to a full-frame
+# search when the hand is lost or reaches the edge of that region.
+DETECTION_MODES = ("cascade", "single", "roi")
+
+
+def detection_mode_from_env(default="cascade"):
+    """Read the hand detection mode from SIGN_DETECTION_MODE"""
+    mode = os.environ.get("SIGN_DETECTION_MODE", default).strip().lower()
+    if mode not in DETECTION_MODES:
+        raise ValueError(f"Unknown detection mode '{mode}', expected one of {DETECTION_MODES}")
+    return mode
+
+
+def hand_list(result):
+    """Normalise the return value of HandDetector.findHands across cvzone versions"""
+    # Some cvzone releases return (hands, img) even with draw=False
+    if isinstance(result, tuple):
+        result = result[0]
+    return result or []
+
+
+def detect_scale_from_env(default=1.0):
+    """SIGN_DETECT_SCALE: resize factor for the frame the palm detector sees (e.g. 0.5)"""
+    return float(os.environ.get("SIGN_DETECT_SCALE", default))
+
+
+def scale_hand(hand, factor):
+    """Map a cvzone hand found on a resized frame back to the original frame"""
+    x, y, w, h = hand['bbox']
+    scaled = dict(hand)
+    scaled['bbox'] = (int(x * factor), int(y * factor), int(w * factor), int(h * factor))
+    scaled['lmList'] = [[int(v * factor) for v in pt] for pt in hand['lmList']]
+    if 'center' in hand:
+        scaled['center'] = tuple(int(v * factor) for v in hand['center'])
+    return scaled
+
+
+def hand_score(detector, index=0):
+    """MediaPipe's confidence for the index-th hand of the last findHands call, or None
+
+    cvzone's hand dicts carry no score, so it is read from the handedness
+    classification MediaPipe returns alongside the landmarks.
+    """
+    handedness = getattr(getattr(detector, 'results', None), 'multi_handedness', None)
+    if not handedness or index >= len(handedness):
+        return None
+    return handedness[index].classification[0].score
+
+
+def to_crop_space(lm_list, origin):
+    """Translate full-frame landmarks into the coordinate space of a crop"""
+    x0, y0 = origin
+    return [[pt[0] - x0, pt[1] - y0] + list(pt[2:]) for pt in lm_list]
+
+
+class HandTracker:
+    """Find the first hand in a frame and return its crop and crop-space landmarks
+
+    With detect_scale below 1 the full-frame search runs on a resized copy of the frame
+    and the hand is mapped back; the crop and its landmarks stay at full resolution.
+
+    In "roi" mode the previous hand's bbox, grown by roi_margin of its size on each side,
+    is the only region searched. A hand found there counts as a track hit; no hand, a
+    MediaPipe score below min_score or a hand touching an inner edge of the region (it may be
+    leaving) falls back to a full-frame re-detection. MediaPipe already skips palm
+    detection between frames of a full-frame search, so whether the smaller region pays
+    for the second graph depends on the camera; benchmark_pipeline.py --compare-mode
+    measures both on the same frames.
+    """
+
+    def __init__(self, mode="cascade", offset=29, max_hands=1, profiler=None, detect_scale=1.0,
+                 roi_margin=0.5, min_score=0.7):
+        if mode not in DETECTION_MODES:
+            raise ValueError(f"Unknown detection mode '{mode}', expected one of {DETECTION_MODES}")
+        self.mode = mode
+        self.offset = offset
+        self.detect_scale = detect_scale
+        # Optional profiling.StageProfiler; splits the time into "detect" and "crop"
+        self.profiler = profiler
+        self.detector = HandDetector(maxHands=max_hands)
+        # The second graph runs on the hand crop (cascade) or the tracked region (roi)
+        self.crop_detector = HandDetector(maxHands=max_hands) if mode in ("cascade", "roi") else None
+
+        self.roi_margin = roi_margin
+        self.min_score = min_score
+        self.roi = None
+        self.track_hits = 0
+        self.redetections = 0
+
+        self.frames = 0
+        self.total_time = 0.0
+
+    def detect(self, frame):
+        """Return (hand, crop) where hand holds the full-frame 'bbox' and crop-space 'lmList'"""
+        start = time.perf_counter()
+        try:
+            return self._detect(frame)
+        finally:
+            self.frames += 1
+            self.total_time += time.perf_counter() - start
+
+    def _measure(self, stage):
+        return self.profiler.measure(stage) if self.profiler else nullcontext()
+
+    def _track(self, frame):
+        """The hand inside the region around the previous bbox, in full-frame coordinates, or None"""
+        x, y, w, h = self.roi
+        mx, my = int(w * self.roi_margin), int(h * self.roi_margin)
+        x0, y0 = max(x - mx, 0), max(y - my, 0)
+        x1, y1 = min(x + w + mx, frame.shape[1]), min(y + h + my, frame.shape[0])
+        region = frame[y0:y1, x0:x1]
+        if region.size == 0:
+            return None
+        hands = hand_list(self.crop_detector.findHands(region, draw=False, flipType=True))
+        if not hands:
+            return None
+        score = hand_score(self.crop_detector)
+        if score is not None and score < self.min_score:
+            return None
+
+        bx, by, bw, bh = hands[0]['bbox']
+        # Edges of the region that are not frame edges; a hand touching one may be cut off
+        if ((x0 > 0 and bx <= 0) or (y0 > 0 and by <= 0)
+                or (x1 < frame.shape[1] and bx + bw >= x1 - x0) or (y1 < frame.shape[0] and by + bh >= y1 - y0)):
+            return None
+        return {'bbox': (bx + x0, by + y0, bw, bh), 'lmList': to_crop_space(hands[0]['lmList'], (-x0, -y0))}
+
+    def tracking_stats(self):
+        """{'hits', 'redetections', 'hit_rate'} of the roi mode"""
+        total = self.track_hits + self.redetections
+        return {'hits': self.track_hits, 'redetections': self.redetections,
+                'hit_rate': self.track_hits / total if total else 0.0}
+
+    def _detect(self, frame):
+        if self.mode == "roi" and self.roi is not None:
+            with self._measure("track"):
+                hand = self._track(frame)
+            if hand is not None:
+                self.track_hits += 1
+                return self._crop(frame, hand)
+            self.redetections += 1
+
+        with self._measure("detect"):
+            if self.detect_scale == 1.0:
+                hands = hand_list(self.detector.findHands(frame, draw=False, flipType=True))
+            else:
+                small = cv2.resize(frame, None, fx=self.detect_scale, fy=self.detect_scale,
+                                   interpolation=cv2.INTER_AREA)
+                hands = [scale_hand(hand, 1.0 / self.detect_scale)
+                         for hand in hand_list(self.detector.findHands(small, draw=False, flipType=True))]
+        if not hands:
+            self.roi = None
+            return None, None
+        return self._crop(frame, hands[0])
+
+    def _crop(self, frame, hand):
+        with self._measure("crop"):
+            x, y, w, h = hand['bbox']
+            self.roi = (x, y, w, h)
+            x0, y0 = x - self.offset, y - self.offset
+            crop = frame[y0:y + h + self.offset, x0:x + w + self.offset]
+            if crop.size == 0:
+                return None, None
+
+            if self.mode != "cascade":
+                pts = to_crop_space(hand['lmList'], (x0, y0))
+            else:
+                handz = hand_list(self.crop_detector.findHands(crop, draw=False, flipType=True))
+                if not handz:
+                    return None, crop
+                pts = handz[0]['lmList']
+
+        return {'bbox': (x, y, w, h), 'lmList': pts}, crop
+
+    def mean_ms(self):
+        """Average detection time per frame in milliseconds"""
+        if not self.frames:
+            return 0.0
+        return 1000.0 * self.total_time / self.frames
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# Documents in the sentences collection that are not history entries
+CURRENT_ID = 'current'
+LAST_STORED_ID = 'last_stored'
+HISTORY_FILTER = {'_id': {'$nin': [CURRENT_ID, LAST_STORED_ID]}}
+HISTORY_SORT = [('timestamp', DESCENDING), ('_id', DESCENDING)]
+
+# Projections for each page; full_text is never needed for listing
+LIST_FIELDS = {'sentence': 1, 'timestamp': 1, 'word_count': 1, 'char_count': 1}
+OPTION_FIELDS = {'sentence': 1, 'timestamp': 1}
+
+
+class HistoryStore:
+    """Stored sentences in the shared 'sentences' collection
+
+    History is read newest first through the (timestamp, _id) index with keyset
+    pagination. The consecutive-duplicate check is a conditional upsert on the
+    'last_stored' marker document: of two identical stores only one can change it.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def ensure_indexes(self):
+        """Create the history index and seed the duplicate marker from existing history"""
+        self.collection.create_index(HISTORY_SORT, name='history_timestamp')
+        if self.collection.find_one({'_id': LAST_STORED_ID}, {'_id': 1}) is None:
+            latest = self.collection.find_one(HISTORY_FILTER, {'sentence': 1}, sort=HISTORY_SORT)
+            if latest and 'sentence' in latest:
+                self.collection.update_one({'_id': LAST_STORED_ID},
+                                           {'$setOnInsert': {'sentence': latest['sentence'].strip()}}, upsert=True)
+
+    def page(self, limit=20, after=None, fields=LIST_FIELDS):
+        """One page of history, newest first; returns (docs, cursor for the next page or None)
+
+        after is the cursor returned with the previous page.
+        """
+        query = dict(HISTORY_FILTER)
+        if after is not None:
+            ts, last_id = after
+            query['$or'] = [{'timestamp': {'$lt': ts}}, {'timestamp': ts, '_id': {'$lt': last_id}}]
+        docs = list(self.collection.find(query, fields).sort(HISTORY_SORT).limit(limit + 1))
+        if len(docs) > limit:
+            docs = docs[:limit]
+            return docs, (docs[-1].get('timestamp'), docs[-1]['_id'])
+        return docs, None
+
+    def recent(self, limit=20, fields=LIST_FIELDS):
+        return self.page(limit, fields=fields)[0]
+
+    def last_sentence(self):
+        doc = self.collection.find_one(HISTORY_FILTER, {'sentence': 1}, sort=HISTORY_SORT)
+        if doc and 'sentence' in doc:
+            return doc['sentence']
+        return None
+
+    def add(self, full_text):
+        """Store full_text unless it repeats the last stored sentence; returns the stored
+        sentence, or None for a consecutive duplicate"""
+        sentence = full_text.strip()
+        try:
+            previous = self.collection.find_one_and_update(
+                {'_id': LAST_STORED_ID, 'sentence': {'$ne': sentence}},
+                {'$set': {'sentence': sentence}},
+                upsert=True, projection={'sentence': 1}, return_document=ReturnDocument.BEFORE)
+        except DuplicateKeyError:
+            # The marker exists and already holds this sentence
+            return None
+
+        doc = {
+            'sentence': sentence,
+            'timestamp': datetime.now(),
+            'full_text': full_text,
+            'word_count': len(sentence.split()),
+            'char_count': len(sentence)
+        }
+        try:
+            self.collection.insert_one(doc)
+        except Exception:
+            # Put the marker back so the sentence can be stored again
+            if previous is None:
+                self.collection.delete_one({'_id': LAST_STORED_ID, 'sentence': sentence})
+            else:
+                self.collection.update_one({'_id': LAST_STORED_ID, 'sentence': sentence},
+                                           {'$set': {'sentence': previous.get('sentence', '')}})
+            raise
+        return sentence
+
+    def delete(self, doc_id):
+        self.collection.delete_one({'_id': doc_id})
+        # The marker must follow the newest remaining entry
+        latest = self.last_sentence()
+        self.collection.update_one({'_id': LAST_STORED_ID}, {'$set': {'sentence': (latest or '').strip()}},
+                                   upsert=True)
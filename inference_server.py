@@ -0,0 +1,308 @@
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from profiling import get_logger
+
+log = get_logger("sign.inference")
+
+# Every message is a 1-byte kind and a 4-byte payload length followed by the payload
+HEADER = struct.Struct('!cI')
+KIND_IMAGE = b'I'       # 400x400x3 uint8 skeleton image
+KIND_LANDMARKS = b'L'   # (21, dims) float32 crop-space landmarks
+KIND_PROB = b'P'        # 8 float32 group probabilities
+KIND_ERROR = b'E'       # utf-8 error message
+
+IMAGE_SHAPE = (400, 400, 3)
+DEFAULT_UNIX_ADDRESS = '/tmp/sign_inference.sock'
+DEFAULT_TCP_ADDRESS = '127.0.0.1:8765'
+
+
+def default_address():
+    """SIGN_INFERENCE_ADDRESS, else a Unix socket where supported and a loopback port elsewhere"""
+    fallback = DEFAULT_UNIX_ADDRESS if hasattr(socket, 'AF_UNIX') else DEFAULT_TCP_ADDRESS
+    return os.environ.get("SIGN_INFERENCE_ADDRESS", fallback)
+
+
+def _parse_address(address):
+    if '/' not in address and ':' in address:
+        host, port = address.rsplit(':', 1)
+        return socket.AF_INET, (host, int(port))
+    return socket.AF_UNIX, address
+
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if not k:
+            raise ConnectionError("connection closed")
+        got += k
+    return buf
+
+
+def send_message(sock, kind, payload):
+    sock.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_message(sock):
+    kind, length = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return kind, _recv_exact(sock, length)
+
+
+class MicroBatcher:
+    """Group samples submitted from many threads into batches for one model call
+
+    A batch is closed when it reaches max_batch samples or when max_wait seconds have
+    passed since its first sample arrived.
+    """
+
+    def __init__(self, predict_batch, max_batch=16, max_wait=0.005):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.samples = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, sample):
+        future = Future()
+        self.queue.put((sample, future))
+        return future
+
+    def stop(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def mean_batch_size(self):
+        return self.samples / self.batches if self.batches else 0.0
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is None:
+            return None
+        items = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.queue.put(None)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if items is None:
+                return
+            try:
+                probs = self.predict_batch([sample for sample, _ in items])
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.samples += len(items)
+            for (_, future), prob in zip(items, probs):
+                future.set_result(prob)
+
+
+class InferenceServer:
+    """Load the models once and serve group probabilities to many capture clients"""
+
+    def __init__(self, address=None, image_model=None, landmark_model=None, max_batch=16, max_wait=0.005):
+        self.address = address or default_address()
+        self.batchers = {}
+        if image_model is not None:
+            self.batchers[KIND_IMAGE] = MicroBatcher(
+                lambda batch: image_model.predict_batch(np.stack(batch)), max_batch, max_wait)
+        if landmark_model is not None:
+            self.batchers[KIND_LANDMARKS] = MicroBatcher(
+                lambda batch: landmark_model.predict_batch(
+                    np.stack([landmark_model.normalize(pts) for pts in batch])),
+                max_batch, max_wait)
+        self._sock = None
+        self._running = False
+
+    def serve_forever(self):
+        family, addr = _parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(addr)
+        self._sock.listen()
+        self._running = True
+        log.info("Inference server listening on %s", self.address)
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._sock.accept()
+                except OSError:
+                    break
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if not self._running:
+            return
+        self._running = False
+        self._sock.close()
+        family, addr = _parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+        for kind, batcher in self.batchers.items():
+            batcher.stop()
+            log.info("%s: %d samples in %d batches (mean batch %.2f)",
+                     kind.decode(), batcher.samples, batcher.batches, batcher.mean_batch_size())
+
+    def _decode(self, kind, payload):
+        if kind == KIND_IMAGE:
+            return np.frombuffer(payload, np.uint8).reshape(IMAGE_SHAPE)
+        return np.frombuffer(payload, np.float32).reshape(21, -1)
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    kind, payload = recv_message(conn)
+                except (ConnectionError, OSError):
+                    return
+                batcher = self.batchers.get(kind)
+                try:
+                    if batcher is None:
+                        raise ValueError(f"No model loaded for request kind {kind!r}")
+                    prob = batcher.submit(self._decode(kind, payload)).result()
+                    send_message(conn, KIND_PROB, np.asarray(prob, np.float32).tobytes())
+                except (ConnectionError, OSError):
+                    return
+                except Exception as e:
+                    send_message(conn, KIND_ERROR, str(e).encode('utf-8'))
+
+
+class RemoteClassifier:
+    """Classifier that forwards each frame to a running InferenceServer
+
+    Every request has `timeout` seconds to complete. A stalled, stopped or restarted server
+    closes the connection; frames then go to the local classifier built by fallback() on
+    first use, and a new connection is tried every retry_after seconds. Without a fallback
+    the connection error is raised.
+    """
+
+    def __init__(self, address=None, input_kind="image", timeout=1.0, fallback=None, retry_after=5.0):
+        self.input_kind = input_kind
+        self.address = address or default_address()
+        self.timeout = timeout
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.local = None
+        self.sock = None
+        self.retry_at = 0.0
+        self.failures = 0
+        try:
+            self._connect()
+        except OSError as e:
+            self._disconnect(e)
+
+    def _connect(self):
+        family, addr = _parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(addr)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def _disconnect(self, error):
+        """Drop the connection; a timed-out reply would otherwise arrive as the next frame's answer"""
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.failures += 1
+        self.retry_at = time.monotonic() + self.retry_after
+        log.warning("Inference server %s unavailable (%s), %s", self.address, error,
+                    "using the local classifier" if self.fallback else "no fallback")
+        if self.fallback is None:
+            raise ConnectionError(f"Inference server {self.address} unavailable: {error}")
+
+    def _remote(self, image, pts):
+        if self.input_kind == "image":
+            send_message(self.sock, KIND_IMAGE, np.ascontiguousarray(image, np.uint8).tobytes())
+        else:
+            send_message(self.sock, KIND_LANDMARKS, np.ascontiguousarray(pts, np.float32).tobytes())
+        kind, payload = recv_message(self.sock)
+        if kind == KIND_ERROR:
+            raise RuntimeError(payload.decode('utf-8'))
+        return np.frombuffer(payload, np.float32).copy()
+
+    def predict(self, image=None, pts=None):
+        if self.sock is None and time.monotonic() >= self.retry_at:
+            try:
+                self._connect()
+                log.info("Reconnected to inference server %s", self.address)
+            except OSError as e:
+                self._disconnect(e)
+        if self.sock is not None:
+            try:
+                return self._remote(image, pts)
+            except OSError as e:
+                # socket.timeout and ConnectionError are both OSErrors
+                self._disconnect(e)
+        if self.fallback is None:
+            raise ConnectionError(f"Inference server {self.address} unavailable")
+        if self.local is None:
+            self.local = self.fallback()
+        return self.local.predict(image=image, pts=pts)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from classifiers import CNN_MODEL_PATH, LANDMARK_MODEL_PATH, CnnClassifier, LandmarkClassifier
+    from cnn_inference import CNN_BACKENDS, backend_from_env
+
+    parser = argparse.ArgumentParser(description="Serve the sign classifiers to many capture clients")
+    parser.add_argument("--address", default=None, help="Unix socket path or host:port")
+    parser.add_argument("--model", default=CNN_MODEL_PATH)
+    parser.add_argument("--backend", choices=CNN_BACKENDS, default=None, help="CNN backend (default SIGN_CNN_BACKEND)")
+    parser.add_argument("--landmark-model", default=LANDMARK_MODEL_PATH)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="longest a request waits for its batch")
+    args = parser.parse_args()
+
+    image_model = CnnClassifier(args.model, args.backend or backend_from_env()) if os.path.exists(args.model) else None
+    landmark_model = LandmarkClassifier.load(args.landmark_model) if os.path.exists(args.landmark_model) else None
+    if image_model is None and landmark_model is None:
+        parser.error("no model found to serve")
+
+    server = InferenceServer(args.address, image_model, landmark_model, args.max_batch, args.max_wait_ms / 1000.0)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
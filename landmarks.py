@@ -0,0 +1,75 @@
+import numpy as np
+
+WRIST = 0
+MIDDLE_MCP = 9
+
+# [0->aemnst][1->bfdiuvwkr][2->co][3->gh][4->l][5->pqz][6->x][7->yj]
+LETTER_GROUPS = {
+    'A': 0, 'E': 0, 'M': 0, 'N': 0, 'S': 0, 'T': 0,
+    'B': 1, 'D': 1, 'F': 1, 'I': 1, 'K': 1, 'R': 1, 'U': 1, 'V': 1, 'W': 1,
+    'C': 2, 'O': 2,
+    'G': 3, 'H': 3,
+    'L': 4,
+    'P': 5, 'Q': 5, 'Z': 5,
+    'X': 6,
+    'J': 7, 'Y': 7,
+}
+NUM_GROUPS = 8
+
+# Nominal palm size in crop pixels for palm-normalised rules and skeletons. It has not been
+# measured against the training data: check it with `python extract_landmarks.py
+# --palm-stats` before enabling SIGN_RULES_PALM or SIGN_SKELETON_PALM, and retrain the CNN
+# on skeletons drawn at the chosen size.
+PALM_REFERENCE = 100.0
+
+# A palm seen edge-on or tilted looks short. Rescaling never trusts a measured palm outside
+# these multiples of PALM_REFERENCE, so the hand is resized by at most 2x either way.
+PALM_LIMITS = (0.5, 2.0)
+
+
+def landmark_array(pts, dims=2):
+    """Return landmarks as a float32 (21, dims) array"""
+    return np.asarray(pts, dtype=np.float32)[:, :dims]
+
+
+def palm_size(pts):
+    """Wrist to middle-finger knuckle distance, used as the hand-relative unit"""
+    pts = np.asarray(pts, dtype=np.float32)
+    return float(np.linalg.norm(pts[MIDDLE_MCP, :2] - pts[WRIST, :2]))
+
+
+def normalize_landmarks(pts, dims=2):
+    """Flatten landmarks relative to the wrist and scaled by palm size"""
+    arr = landmark_array(pts, dims)
+    scale = palm_size(arr) or 1.0
+    return ((arr - arr[WRIST]) / scale).ravel()
+
+
+def palm_factor(pts, palm=1.0, limits=PALM_LIMITS):
+    """Factor that resizes the hand so its palm measures `palm`
+
+    The measured palm is clamped to limits times PALM_REFERENCE pixels; a degenerate hand
+    with no palm length is taken to be PALM_REFERENCE pixels.
+    """
+    arr = np.asarray(pts, dtype=np.float64)
+    size = float(np.hypot(*(arr[MIDDLE_MCP, :2] - arr[WRIST, :2]))) or PALM_REFERENCE
+    if limits:
+        size = min(max(size, limits[0] * PALM_REFERENCE), limits[1] * PALM_REFERENCE)
+    return palm / size
+
+
+def scale_to_palm(pts, palm=1.0, origin=None):
+    """Scale (21, 2) landmarks about origin (default the wrist) so the palm measures `palm`"""
+    arr = np.asarray(pts, dtype=np.float64)[:, :2]
+    origin = arr[WRIST] if origin is None else np.asarray(origin, dtype=np.float64)
+    return origin + (arr - origin) * palm_factor(arr, palm)
+
+
+def palm_size_stats(landmark_sets, percentiles=(5, 25, 50, 75, 95)):
+    """{'count', 'mean', 'p5', ...} of palm_size over (21, 2+) landmark sets, in their pixels"""
+    sizes = np.array([palm_size(pts) for pts in landmark_sets], dtype=np.float64)
+    if not len(sizes):
+        return {'count': 0}
+    stats = {'count': len(sizes), 'mean': float(sizes.mean())}
+    stats.update({f"p{q}": float(v) for q, v in zip(percentiles, np.percentile(sizes, percentiles))})
+    return stats
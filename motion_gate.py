@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+from landmarks import normalize_landmarks
+
+# Costs a skipped frame avoids, used to estimate the time saved from profiler snapshots
+GATED_STAGES = ("render", "inference", "rules")
+
+
+class MotionGate:
+    """Reuse the last prediction while the hand holds still
+
+    Landmarks are compared in hand-relative units (wrist origin, palm-size scale, see
+    landmarks.normalize_landmarks). The comparison is against the landmarks that were
+    last inferred, not the previous frame, so slow drift still triggers a new inference.
+    After refresh_every skipped frames in a row the next frame is inferred regardless.
+    A tolerance of 0 disables the gate.
+    """
+
+    def __init__(self, tolerance=0.03, refresh_every=30):
+        self.tolerance = tolerance
+        self.refresh_every = refresh_every
+        self.reference = None
+        self.pending = None
+        self.cached = None
+        self.streak = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def lookup(self, pts):
+        """The cached prediction if pts has not moved beyond tolerance, otherwise None"""
+        self.checked += 1
+        if self.tolerance <= 0:
+            return None
+        vector = normalize_landmarks(pts)
+        if (self.cached is not None and self.streak < self.refresh_every
+                and np.abs(vector - self.reference).max() <= self.tolerance):
+            self.streak += 1
+            self.skipped += 1
+            return self.cached
+        self.pending = vector
+        return None
+
+    def store(self, prediction):
+        """Remember the prediction made for the landmarks of the last lookup() miss"""
+        if self.pending is not None:
+            self.reference, self.pending = self.pending, None
+            self.cached = prediction
+            self.streak = 0
+
+    def reset(self):
+        """Forget the cached prediction, e.g. when the hand leaves the frame"""
+        self.reference = self.pending = self.cached = None
+        self.streak = 0
+
+    def skip_ratio(self):
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def saved_ms(self, snapshot):
+        """Estimated time saved, from the mean cost of the gated stages in a profiler snapshot"""
+        return self.skipped * sum(snapshot[s]['mean'] for s in GATED_STAGES if s in snapshot)
+
+    def summary_text(self, snapshot=None):
+        text = f"skipped {self.skipped}/{self.checked} frames ({self.skip_ratio():.0%})"
+        if snapshot:
+            text += f", ~{self.saved_ms(snapshot) / 1000.0:.1f} s saved"
+        return text
+
+
+def motion_gate_from_env(default=0.03):
+    """SIGN_MOTION_TOLERANCE: largest landmark change, in palm sizes, that reuses the prediction"""
+    return MotionGate(float(os.environ.get("SIGN_MOTION_TOLERANCE", default)),
+                      int(os.environ.get("SIGN_MOTION_REFRESH", 30)))
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Pid, ready and cached camera settings files shared by the supervisor and the recognizer
+STATE_DIR = os.environ.get("SIGN_STATE_DIR", os.path.join(tempfile.gettempdir(), "sign_recognizer"))
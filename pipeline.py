@@ -0,0 +1,182 @@
+import queue
+import threading
+import time
+
+from profiling import StageProfiler, get_logger
+
+log = get_logger("sign.pipeline")
+
+# Returned by a CapturePipeline read() callable when the source has no more frames
+END_OF_STREAM = object()
+
+
+class LatestFrame:
+    """Single-slot buffer: a new frame replaces one that was never taken"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.frame = None
+        self.seq = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        with self.cond:
+            if self.frame is not None:
+                self.dropped += 1
+            self.frame = frame
+            self.seq += 1
+            self.cond.notify()
+
+    def empty(self):
+        with self.cond:
+            return self.frame is None
+
+    def take(self, timeout=None):
+        """Wait for a frame and remove it; None on timeout"""
+        with self.cond:
+            if self.frame is None:
+                self.cond.wait(timeout)
+            frame, self.frame = self.frame, None
+            return frame
+
+
+def put_dropping_oldest(q, item):
+    """Put into a bounded queue, discarding the oldest entry when it is full; returns the drop count"""
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class CapturePipeline:
+    """Camera thread -> latest-frame slot -> worker thread -> bounded result queue
+
+    read() is called on the capture thread and returns a frame or None; process(frame,
+    profiler) runs on the worker and returns whatever the consumer paints. The consumer
+    calls latest() from its own loop and only ever sees the newest result.
+    pace(), if given, returns how many seconds the capture thread waits after each frame.
+    Each result carries its capture time and the time processing finished. latest() records
+    the processing latency (capture to result ready, last_processing), the wait for the
+    consumer ("paint_wait", last_wait) and their sum, the age of the result ("latency").
+    read() returns END_OF_STREAM when a file source has run out; the capture thread then
+    stops, the worker finishes the last frame and finished() turns True. An exception from
+    read() is logged and retried; after max_read_errors in a row the source is treated as
+    ended, with the exception kept in `error`.
+    """
+
+    def __init__(self, read, process, result_size=2, profiler=None, pace=None, max_read_errors=10):
+        self.read = read
+        self.process = process
+        self.pace = pace
+        self.frames = LatestFrame()
+        self.results = queue.Queue(maxsize=result_size)
+        self.profiler = profiler or StageProfiler()
+        self.processed = 0
+        self.dropped_results = 0
+        self.last_age = None
+        self.last_processing = None
+        self.last_wait = None
+        self.max_read_errors = max_read_errors
+        self.error = None
+        self.exhausted = False
+        self.drained = False
+        self.running = False
+        self.threads = []
+
+    def start(self):
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._capture, name="capture", daemon=True),
+            threading.Thread(target=self._work, name="inference", daemon=True),
+        ]
+        for t in self.threads:
+            t.start()
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        with self.frames.cond:
+            self.frames.cond.notify_all()
+        for t in self.threads:
+            t.join(timeout)
+
+    def latest(self):
+        """Newest result not yet consumed, or None"""
+        item = None
+        while True:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+        if item is None:
+            return None
+        captured, ready, result = item
+        now = time.monotonic()
+        self.last_processing = ready - captured
+        self.last_wait = now - ready
+        self.last_age = now - captured
+        self.profiler.add("paint_wait", self.last_wait)
+        self.profiler.add("latency", self.last_age)
+        return result
+
+    def finished(self):
+        """True once the source has ended and every result has been taken"""
+        return self.drained and self.results.empty()
+
+    def dropped_frames(self):
+        return self.frames.dropped
+
+    def _capture(self):
+        errors = 0
+        while self.running:
+            start = time.monotonic()
+            try:
+                frame = self.read()
+            except Exception as e:
+                errors += 1
+                log.exception("Capture error %d/%d: %s", errors, self.max_read_errors, e)
+                if errors >= self.max_read_errors:
+                    self.error = e
+                    self.exhausted = True
+                    return
+                time.sleep(0.1)
+                continue
+            errors = 0
+            if frame is END_OF_STREAM:
+                self.exhausted = True
+                return
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            self.profiler.add("capture", time.monotonic() - start)
+            self.frames.put((time.monotonic(), frame))
+            delay = self.pace() if self.pace else 0.0
+            if delay:
+                time.sleep(delay)
+
+    def _work(self):
+        while self.running:
+            item = self.frames.take(timeout=0.1)
+            if item is None:
+                # exhausted is set after the last put, so an empty slot now means no more frames
+                if self.exhausted and self.frames.empty():
+                    self.drained = True
+                    return
+                continue
+            captured, frame = item
+            start = time.monotonic()
+            try:
+                result = self.process(frame, self.profiler)
+            except Exception as e:
+                log.exception("Pipeline worker error: %s", e)
+                continue
+            ready = time.monotonic()
+            self.profiler.add("process", ready - start)
+            self.processed += 1
+            self.dropped_results += put_dropping_oldest(self.results, (captured, ready, result))
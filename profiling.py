@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+# Stages in pipeline order; anything else measured is listed after them
+STAGES = ("capture", "track", "detect", "crop", "render", "inference", "rules", "suggest", "persist", "process",
+          "paint_wait", "latency")
+PERCENTILES = (50, 95, 99)
+
+
+def get_logger(name="sign"):
+    """Logger for the recognizer scripts; SIGN_LOG_LEVEL picks the level (default INFO)
+
+    Per-frame messages use log.debug with %-style arguments, so they are neither formatted
+    nor written unless DEBUG is enabled.
+    """
+    logger = logging.getLogger(name)
+    if not logging.getLogger().handlers and not logger.handlers:
+        logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logger.setLevel(os.environ.get("SIGN_LOG_LEVEL", "INFO").upper())
+    return logger
+
+
+class StageProfiler:
+    """Rolling per-stage latency samples, timed with the monotonic clock
+
+    Each stage keeps its last `window` durations; percentiles are computed only when a
+    snapshot is taken. A disabled profiler makes measure() a no-op.
+    """
+
+    def __init__(self, window=300, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.counts = {}
+        self.export_file = None
+        self.export_interval = None
+        self.last_export = 0.0
+
+    def add(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+                self.counts[name] = 0
+            self.samples[name].append(seconds)
+            self.counts[name] += 1
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def measure(self, name):
+        return self._timed(name) if self.enabled else nullcontext()
+
+    def snapshot(self):
+        """{stage: {'count', 'mean', 'p50', 'p95', 'p99'}} in milliseconds, pipeline order"""
+        with self.lock:
+            samples = {name: np.array(values) * 1000.0 for name, values in self.samples.items()}
+            counts = dict(self.counts)
+        order = [s for s in STAGES if s in samples] + sorted(s for s in samples if s not in STAGES)
+        out = {}
+        for name in order:
+            values = samples[name]
+            stats = {'count': counts[name], 'mean': float(values.mean())}
+            for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                stats[f'p{p}'] = float(v)
+            out[name] = stats
+        return out
+
+    def summary_text(self, snapshot=None):
+        """One line per stage, suitable for a console dump or the Tk overlay"""
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        return "\n".join(
+            f"{name:<10} p50 {s['p50']:6.1f}  p95 {s['p95']:6.1f}  p99 {s['p99']:6.1f} ms"
+            for name, s in snapshot.items())
+
+    def export_to(self, path, interval=1.0):
+        """Append a JSON line with the current snapshot to path every interval seconds"""
+        self.export_file = open(path, "a", encoding="utf-8")
+        self.export_interval = interval
+
+    def maybe_export(self, extra=None):
+        if self.export_file is None:
+            return
+        now = time.monotonic()
+        if now - self.last_export < self.export_interval:
+            return
+        self.last_export = now
+        record = {'time': time.time(), 'stages': self.snapshot()}
+        if extra:
+            record.update(extra)
+        self.export_file.write(json.dumps(record) + "\n")
+        self.export_file.flush()
+
+    def close(self):
+        if self.export_file is not None:
+            self.export_file.close()
+            self.export_file = None
+
+
+def profiler_from_env():
+    """SIGN_PROFILE=0 disables timing; SIGN_PROFILE_EXPORT=path writes JSON lines"""
+    profiler = StageProfiler(enabled=os.environ.get("SIGN_PROFILE", "1") != "0")
+    if profiler.enabled and os.environ.get("SIGN_PROFILE_EXPORT"):
+        profiler.export_to(os.environ["SIGN_PROFILE_EXPORT"])
+    return profiler
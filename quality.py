@@ -0,0 +1,105 @@
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from profiling import get_logger
+
+log = get_logger("sign.quality")
+
+# Operating points from full quality to cheapest. scale resizes every captured frame
+# before the worker sees it (the camera still delivers and decodes full frames), infer_every runs detection and inference on one frame in that many, paint_ms is the
+# delay between UI repaints.
+OPERATING_POINTS = (
+    {'scale': 1.0, 'infer_every': 1, 'paint_ms': 10},
+    {'scale': 1.0, 'infer_every': 2, 'paint_ms': 10},
+    {'scale': 1.0, 'infer_every': 2, 'paint_ms': 33},
+    {'scale': 0.75, 'infer_every': 2, 'paint_ms': 33},
+    {'scale': 0.5, 'infer_every': 3, 'paint_ms': 50},
+)
+
+
+def describe(point):
+    return f"{point['scale']:.0%} resolution, inference every {point['infer_every']}, repaint {point['paint_ms']} ms"
+
+
+class QualityController:
+    """Trade resolution, inference rate and repaint rate for processing latency
+
+    observe() takes the processing latency of each painted frame, from capture until its
+    result is ready. The time the result then waits for a repaint is left out: it grows
+    with paint_ms, so a slower repaint would read as more load and push the level down
+    further. Every
+    `interval` seconds the 90th percentile of the recent ages is compared with
+    target_ms: above it the controller steps down one operating point, below
+    headroom * target_ms for `hold` checks in a row it steps back up. Changes are
+    logged. A target of 0 keeps full quality.
+    """
+
+    def __init__(self, target_ms=150.0, points=OPERATING_POINTS, interval=1.0, headroom=0.6, hold=3,
+                 window=60):
+        self.target_ms = target_ms
+        self.points = points
+        self.interval = interval
+        self.headroom = headroom
+        self.hold = hold
+        self.ages = deque(maxlen=window)
+        self.level = 0
+        self.calm = 0
+        self.frames = 0
+        self.changes = 0
+        self.last_check = time.monotonic()
+
+    @property
+    def point(self):
+        return self.points[self.level]
+
+    def scale(self):
+        return self.point['scale']
+
+    def paint_ms(self):
+        return self.point['paint_ms']
+
+    def should_infer(self):
+        """Worker thread: whether this frame gets detection and inference"""
+        self.frames += 1
+        return self.frames % self.point['infer_every'] == 0
+
+    def observe(self, age):
+        """Record the capture-to-result latency of a frame in seconds; returns the current level"""
+        if self.target_ms <= 0:
+            return self.level
+        self.ages.append(1000.0 * age)
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return self.level
+        self.last_check = now
+
+        p90 = float(np.percentile(self.ages, 90))
+        if p90 > self.target_ms and self.level < len(self.points) - 1:
+            self._set(self.level + 1, p90)
+        elif p90 < self.headroom * self.target_ms and self.level > 0:
+            self.calm += 1
+            if self.calm >= self.hold:
+                self._set(self.level - 1, p90)
+        else:
+            self.calm = 0
+        return self.level
+
+    def _set(self, level, p90):
+        self.level = level
+        self.calm = 0
+        self.changes += 1
+        # Ages measured at the old operating point say nothing about the new one
+        self.ages.clear()
+        log.info("Quality level %d: %s (latency p90 %.0f ms, target %.0f ms)",
+                 level, describe(self.point), p90, self.target_ms)
+
+    def summary_text(self):
+        return f"level {self.level} ({describe(self.point)}), {self.changes} changes"
+
+
+def quality_controller_from_env(default=150.0):
+    """SIGN_LATENCY_TARGET_MS: capture-to-result latency budget, 0 keeps full quality"""
+    return QualityController(float(os.environ.get("SIGN_LATENCY_TARGET_MS", default)))
@@ -0,0 +1,33 @@
+import json
+
+import numpy as np
+
+
+class LandmarkRecorder:
+    """Append one JSON line per recognised frame: crop landmarks, group probabilities and symbol"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, pts, prob=None, symbol=None, bbox=None):
+        record = {'pts': np.asarray(pts).tolist()}
+        if prob is not None:
+            record['prob'] = np.asarray(prob, dtype=float).tolist()
+        if symbol is not None:
+            record['symbol'] = str(symbol)
+        if bbox is not None:
+            record['bbox'] = [int(v) for v in bbox]
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def read_recording(path):
+    """Yield the frames written by LandmarkRecorder"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
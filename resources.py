@@ -0,0 +1,157 @@
+import atexit
+import os
+import threading
+import time
+
+MONGO_URI = os.environ.get("SIGN_MONGO_URI", 'mongodb://localhost:27017/SIGN')
+MONGO_DB = 'SIGN'
+MONGO_COLLECTION = 'sentences'
+
+_lock = threading.RLock()
+_client = None
+_translators = {}
+_tts = None
+_history = None
+_translation = None
+# (monotonic time of the last ping, its result); refreshed at most every HEALTH_TTL seconds
+HEALTH_TTL = float(os.environ.get("SIGN_HEALTH_TTL", 10.0))
+_mongo_health = None
+_health_refreshing = False
+
+
+def get_mongo_client():
+    """The process-wide pooled MongoClient; reused by every Streamlit rerun and session"""
+    global _client
+    with _lock:
+        if _client is None:
+            import pymongo
+            _client = pymongo.MongoClient(
+                MONGO_URI,
+                maxPoolSize=int(os.environ.get("SIGN_MONGO_POOL", 20)),
+                serverSelectionTimeoutMS=int(os.environ.get("SIGN_MONGO_TIMEOUT_MS", 3000)),
+            )
+        return _client
+
+
+def get_collection(name=MONGO_COLLECTION):
+    return get_mongo_client()[MONGO_DB][name]
+
+
+def get_history_store():
+    """The shared HistoryStore; its indexes are created on first use"""
+    global _history
+    with _lock:
+        if _history is None:
+            from history_store import HistoryStore
+            store = HistoryStore(get_collection())
+            store.ensure_indexes()
+            _history = store
+        return _history
+
+
+def get_translation_service():
+    """Cached, concurrent translation configured by translation.translation_service_from_env"""
+    global _translation
+    with _lock:
+        if _translation is None:
+            from translation import translation_service_from_env
+            _translation = translation_service_from_env()
+        return _translation
+
+
+def get_translator(target_lang):
+    """One GoogleTranslator per target language"""
+    with _lock:
+        translator = _translators.get(target_lang)
+        if translator is None:
+            from deep_translator import GoogleTranslator
+            translator = _translators[target_lang] = GoogleTranslator(source='auto', target=target_lang)
+        return translator
+
+
+def get_tts_worker():
+    """The shared text-to-speech worker; it owns the only pyttsx3 engine in the process"""
+    global _tts
+    with _lock:
+        if _tts is None:
+            from tts import tts_worker_from_env
+            _tts = tts_worker_from_env()
+        return _tts
+
+
+def speak(text, rate=150):
+    """Queue text on the shared worker without waiting for it to be spoken
+
+    Returns True when queued, otherwise a message saying why not.
+    """
+    from tts import DUPLICATE, EMPTY
+
+    worker = get_tts_worker()
+    if not worker.alive():
+        return "Text-to-speech is not available."
+    result = worker.say(text, rate)
+    if result is True:
+        return True
+    if result == EMPTY:
+        return "Nothing to speak."
+    if result == DUPLICATE:
+        return "This text is already being spoken."
+    return "Too much text is waiting to be spoken; try again shortly."
+
+
+def _ping_mongo():
+    global _mongo_health, _health_refreshing
+    try:
+        get_mongo_client().admin.command('ping')
+        result = 'ok'
+    except Exception as e:
+        result = str(e)
+    with _lock:
+        _mongo_health = (time.monotonic(), result)
+        _health_refreshing = False
+    return result
+
+
+def health():
+    """{'mongo': 'ok' or the error, 'translators': count, 'tts': bool}
+
+    The MongoDB ping can block for the whole server selection timeout, so only the first
+    call waits for it. Later calls get the last result and, once it is HEALTH_TTL seconds
+    old, refresh it on a background thread.
+    """
+    global _health_refreshing
+    status = {'translators': len(_translators), 'tts': _tts is not None and _tts.alive()}
+    with _lock:
+        cached = _mongo_health
+        stale = cached is not None and time.monotonic() - cached[0] > HEALTH_TTL and not _health_refreshing
+        if stale:
+            _health_refreshing = True
+    if cached is None:
+        status['mongo'] = _ping_mongo()
+        return status
+    if stale:
+        threading.Thread(target=_ping_mongo, name="mongo-health", daemon=True).start()
+    status['mongo'] = cached[1]
+    return status
+
+
+def shutdown():
+    """Stop the sentence feeds and TTS worker and close the shared client"""
+    global _client, _tts, _history, _translation
+    from sentence_feed import stop_feeds
+    stop_feeds()
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        _history = None
+        if _tts is not None:
+            _tts.stop()
+            _tts = None
+        _translators.clear()
+        if _translation is not None:
+            _translation.close()
+            _translation = None
+
+
+atexit.register(shutdown)
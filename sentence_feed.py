@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from profiling import get_logger
+
+log = get_logger("sign.feed")
+
+CURRENT_FILTER = {'_id': 'current'}
+
+
+class SentenceFeed:
+    """Keep the {'_id': 'current'} sentence in memory, updated by a background thread
+
+    The thread follows a MongoDB change stream restricted to the current document. Change
+    streams need a replica set, so on a standalone server (or any server refusing
+    $changeStream) it falls back to reading just that document every poll_interval
+    seconds. Readers call snapshot() and never touch the database themselves.
+    """
+
+    def __init__(self, collection, poll_interval=None):
+        self.collection = collection
+        self.poll_interval = float(os.environ.get("SIGN_FEED_POLL", 0.25)) if poll_interval is None else poll_interval
+        self.cond = threading.Condition()
+        self.sentence = ""
+        self.version = 0
+        self.mode = None
+        try:
+            self.sentence = self._read()
+        except PyMongoError as e:
+            log.warning("Could not read the current sentence: %s", e)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="sentence-feed", daemon=True)
+        self.thread.start()
+
+    def snapshot(self):
+        """(version, sentence); version increases on every change"""
+        with self.cond:
+            return self.version, self.sentence
+
+    def wait(self, version, timeout=None):
+        """Block until the sentence moves past version; returns the new snapshot"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.version != version or not self.running, timeout)
+            return self.version, self.sentence
+
+    def stop(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
+        self.thread.join(2.0)
+
+    def _set(self, sentence):
+        with self.cond:
+            if sentence != self.sentence:
+                self.sentence = sentence
+                self.version += 1
+                self.cond.notify_all()
+
+    def _read(self):
+        doc = self.collection.find_one(CURRENT_FILTER, {'sentence': 1})
+        return doc.get('sentence', "") if doc else ""
+
+    def _watch(self):
+        pipeline = [{'$match': {'documentKey._id': 'current'}}]
+        with self.collection.watch(pipeline, full_document='updateLookup', max_await_time_ms=500) as stream:
+            self.mode = "change_stream"
+            # Read after opening the stream so no change between the two is missed
+            self._set(self._read())
+            while self.running and stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    continue
+                if change['operationType'] == 'delete':
+                    self._set("")
+                else:
+                    self._set((change.get('fullDocument') or {}).get('sentence', ""))
+
+    def _poll(self):
+        self.mode = "poll"
+        while self.running:
+            self._set(self._read())
+            time.sleep(self.poll_interval)
+
+    def _run(self):
+        use_stream = True
+        backoff = 0.5
+        while self.running:
+            try:
+                if use_stream:
+                    self._watch()
+                else:
+                    self._poll()
+                backoff = 0.5
+            except OperationFailure as e:
+                if use_stream:
+                    log.info("Change streams unavailable (%s), polling the current sentence", e)
+                    use_stream = False
+                    continue
+                log.warning("Sentence feed error: %s", e)
+                time.sleep(backoff)
+            except PyMongoError as e:
+                log.warning("Sentence feed lost MongoDB, retrying in %.1f s: %s", backoff, e)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def stop_feeds():
+    with _feeds_lock:
+        for feed in _feeds.values():
+            feed.stop()
+        _feeds.clear()
+
+
+def shared_feed(collection):
+    """One feed per collection per process, so Streamlit reruns reuse the running thread"""
+    with _feeds_lock:
+        feed = _feeds.get(collection.full_name)
+        if feed is None:
+            feed = _feeds[collection.full_name] = SentenceFeed(collection)
+        return feed
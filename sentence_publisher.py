@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+from pymongo.errors import PyMongoError
+
+from profiling import get_logger
+
+log = get_logger("sign.publisher")
+
+
+class SentencePublisher:
+    """Write-behind copy of the current sentence into the {'_id': 'current'} document
+
+    publish() only records the newest sentence. A background thread waits `window`
+    seconds after the first change to coalesce a burst, then writes if the sentence
+    differs from what was last written. If MongoDB is unreachable the write is retried
+    with backoff; recognition never waits for it and only the newest sentence is kept.
+    """
+
+    def __init__(self, collection, window=None, max_backoff=5.0, profiler=None):
+        self.collection = collection
+        self.window = float(os.environ.get("SIGN_SENTENCE_WINDOW", 0.1)) if window is None else window
+        self.max_backoff = max_backoff
+        self.profiler = profiler
+        self.cond = threading.Condition()
+        self.latest = None
+        self.written = None
+        self.writes = 0
+        self.failures = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="sentence-publisher", daemon=True)
+        self.thread.start()
+
+    def publish(self, sentence):
+        with self.cond:
+            if sentence == self.latest:
+                return
+            self.latest = sentence
+            self.cond.notify()
+
+    def flush(self, timeout=2.0):
+        """Wait until the newest sentence is written, or timeout seconds pass"""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.latest != self.written and time.monotonic() < deadline:
+                self.cond.wait(0.05)
+        return self.latest == self.written
+
+    def stop(self, timeout=2.0):
+        self.flush(timeout)
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join(timeout)
+
+    def _write(self, sentence):
+        with self.profiler.measure("persist") if self.profiler else nullcontext():
+            self.collection.update_one({'_id': 'current'}, {'$set': {'sentence': sentence}}, upsert=True)
+
+    def _run(self):
+        backoff = 0.0
+        while True:
+            with self.cond:
+                while self.running and self.latest == self.written:
+                    self.cond.wait()
+                if not self.running:
+                    return
+            # Let a burst of changes settle (or back off after a failure) before writing
+            time.sleep(max(self.window, backoff))
+            with self.cond:
+                sentence = self.latest
+            try:
+                self._write(sentence)
+            except PyMongoError as e:
+                self.failures += 1
+                backoff = min(self.max_backoff, max(0.5, backoff * 2))
+                log.warning("Sentence update failed, retrying in %.1f s: %s", backoff, e)
+                continue
+            backoff = 0.0
+            with self.cond:
+                self.written = sentence
+                self.writes += 1
+                self.cond.notify_all()
@@ -0,0 +1,100 @@
+import os
+
+import cv2
+import numpy as np
+
+from landmarks import palm_factor
+
+CANVAS_SIZE = 400
+BONE_COLOR = (0, 255, 0)
+BONE_THICKNESS = 3
+JOINT_COLOR = (0, 0, 255)
+JOINT_RADIUS = 2
+
+# Landmark index pairs joined by a bone: thumb, the four fingers, the knuckle line and the palm base
+EDGES = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (5, 6), (6, 7), (7, 8),
+    (9, 10), (10, 11), (11, 12),
+    (13, 14), (14, 15), (15, 16),
+    (17, 18), (18, 19), (19, 20),
+    (5, 9), (9, 13), (13, 17),
+    (0, 5), (0, 17),
+], dtype=np.int32)
+
+
+def _joint_stamp(radius):
+    """Pixel offsets covered by cv2.circle(radius, thickness=1) around its centre"""
+    size = 2 * radius + 3
+    stamp = np.zeros((size, size), np.uint8)
+    cv2.circle(stamp, (size // 2, size // 2), radius, 255, 1)
+    dy, dx = np.nonzero(stamp)
+    return dx - size // 2, dy - size // 2
+
+
+JOINT_DX, JOINT_DY = _joint_stamp(JOINT_RADIUS)
+
+
+def skeleton_shift(w, h, size=CANVAS_SIZE):
+    """Offset that centres a hand of bbox size (w, h) on the canvas, as the training data was drawn"""
+    return ((size - w) // 2) - 15, ((size - h) // 2) - 15
+
+
+def skeleton_input(pts, w, h, origin=0, palm=None):
+    """Landmarks and shift for SkeletonRenderer.render, with the hand drawn at palm size `palm`
+
+    palm=None draws the hand at its crop size, as the original recognizer and the shipped
+    CNN's training data did. With a palm size, crop-space landmarks are scaled about the
+    bbox corner at (origin, origin), where the tracker's crop margin puts it, so the shift
+    still centres the hand; the factor is limited so the hand stays on the canvas.
+    """
+    if palm:
+        # The shift puts the bbox centre at CANVAS_SIZE / 2 + origin - 15
+        room = CANVAS_SIZE - 2 * max(origin - 15, 0)
+        factor = min(palm_factor(pts, palm), room / max(w, h, 1))
+        pts = origin + (np.asarray(pts, dtype=np.float64)[:, :2] - origin) * factor
+        w, h = int(w * factor), int(h * factor)
+    return pts, skeleton_shift(w, h)
+
+
+def skeleton_palm_from_env(default=0):
+    """SIGN_SKELETON_PALM: palm size in pixels for the rendered skeleton, 0 (default) for the crop size
+
+    Only set it for a CNN trained on skeletons drawn at that palm size.
+    """
+    return float(os.environ.get("SIGN_SKELETON_PALM", default)) or None
+
+
+def as_landmark_array(pts):
+    """Return a (21, 2) int32 array from an lmList or a (21, 2+) NumPy array"""
+    return np.asarray(pts)[:, :2].astype(np.int32)
+
+
+class SkeletonRenderer:
+    """Draw hand skeletons onto a single preallocated white canvas"""
+
+    def __init__(self, size=CANVAS_SIZE):
+        self.size = size
+        self.canvas = np.full((size, size, 3), 255, np.uint8)
+
+    def clear(self):
+        """Reset the canvas to white in place and return it"""
+        self.canvas.fill(255)
+        return self.canvas
+
+    def render(self, pts, shift=(0, 0)):
+        """Reset the canvas and draw the skeleton for 21 landmarks translated by shift
+
+        The returned array is reused by the next call, copy it if it has to outlive the frame.
+        """
+        canvas = self.clear()
+
+        points = as_landmark_array(pts) + np.asarray(shift, dtype=np.int32)
+        cv2.polylines(canvas, points[EDGES], False, BONE_COLOR, BONE_THICKNESS)
+
+        # Stamp every joint at once; pixel-identical to 21 cv2.circle calls
+        xs = (points[:, 0:1] + JOINT_DX).ravel()
+        ys = (points[:, 1:2] + JOINT_DY).ravel()
+        inside = (xs >= 0) & (xs < self.size) & (ys >= 0) & (ys < self.size)
+        canvas[ys[inside], xs[inside]] = JOINT_COLOR
+        return canvas
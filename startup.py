@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from profiling import get_logger
+
+log = get_logger("sign.startup")
+
+
+class StartupLoader:
+    """Run named loading tasks on background threads and time them against a budget
+
+    Each task is a callable taking the loader, so it can split its time into phases with
+    loader.phase(task, "import") / loader.phase(task, "init"). value(name) is None until a
+    task has finished; milestone() records seconds since `origin`, normally the monotonic
+    time taken before the heavy imports started.
+    """
+
+    def __init__(self, origin=None, budget=None):
+        self.origin = origin if origin is not None else time.monotonic()
+        self.budget = budget
+        self.lock = threading.Lock()
+        self.values = {}
+        self.errors = {}
+        self.timings = {}
+        self.milestones = {}
+        self.threads = {}
+
+    def start(self, tasks):
+        """tasks: {name: callable(loader)}; every task starts at once on its own thread"""
+        for name, task in tasks.items():
+            thread = threading.Thread(target=self._run, args=(name, task), name=f"load-{name}", daemon=True)
+            self.threads[name] = thread
+            thread.start()
+
+    def _run(self, name, task):
+        start = time.monotonic()
+        try:
+            value = task(self)
+        except Exception as e:
+            log.error("Loading %s failed: %s", name, e)
+            with self.lock:
+                self.errors[name] = e
+        else:
+            with self.lock:
+                self.values[name] = value
+        finally:
+            self.record(name, "total", time.monotonic() - start)
+
+    def record(self, name, phase, seconds):
+        with self.lock:
+            self.timings.setdefault(name, {})[phase] = seconds
+
+    @contextmanager
+    def phase(self, name, phase):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, phase, time.monotonic() - start)
+
+    def milestone(self, name):
+        """Record the first time `name` is reached; later calls are ignored"""
+        with self.lock:
+            if name not in self.milestones:
+                self.milestones[name] = time.monotonic() - self.origin
+            return self.milestones[name]
+
+    def value(self, name):
+        with self.lock:
+            return self.values.get(name)
+
+    def done(self, name=None):
+        """True once the task (or every task) has finished, successfully or not"""
+        names = [name] if name else list(self.threads)
+        with self.lock:
+            return all(n in self.values or n in self.errors for n in names)
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads.values():
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return self.done()
+
+    def status_text(self):
+        """One line per task: ✓ loaded in n s, ✗ failed, or ⏳ loading"""
+        lines = []
+        with self.lock:
+            for name in self.threads:
+                if name in self.values:
+                    lines.append(f"✓ {name} {self.timings[name]['total']:.1f}s")
+                elif name in self.errors:
+                    lines.append(f"✗ {name}")
+                else:
+                    lines.append(f"⏳ {name}")
+        return "  ".join(lines)
+
+    def report(self):
+        """{'milestones', 'tasks', 'budget', 'over_budget'}; over_budget compares first_prediction"""
+        with self.lock:
+            milestones = dict(self.milestones)
+            tasks = {name: dict(phases) for name, phases in self.timings.items()}
+        first = milestones.get("first_prediction")
+        return {
+            'milestones': milestones,
+            'tasks': tasks,
+            'budget': self.budget,
+            'over_budget': bool(self.budget and first is not None and first > self.budget),
+        }
+
+    def log_report(self):
+        report = self.report()
+        log.info("Startup milestones (s): %s",
+                 ", ".join(f"{k} {v:.2f}" for k, v in report['milestones'].items()))
+        for name, phases in report['tasks'].items():
+            log.info("  %-12s %s", name, ", ".join(f"{k} {v:.2f}" for k, v in phases.items()))
+        if report['over_budget']:
+            log.warning("Time to first prediction %.2fs is over the %.1fs budget",
+                        report['milestones']['first_prediction'], self.budget)
+        return report
+
+
+def startup_budget_from_env(default=5.0):
+    """SIGN_STARTUP_BUDGET: seconds allowed from launch to the first prediction (0 disables the check)"""
+    return float(os.environ.get("SIGN_STARTUP_BUDGET", default)) or None
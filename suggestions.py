@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+
+class SuggestionService:
+    """Spelling suggestions for the word being signed, looked up off the video thread
+
+    Results are kept in an LRU cache keyed by word. request() returns straight away:
+    asking again for the word already wanted is a no-op, a cached word is answered on the
+    caller's thread, and anything else is handed to a worker that only ever looks up the
+    most recent request. on_result(word, suggestions) is called for the word still wanted.
+    """
+
+    def __init__(self, dictionary, on_result, max_suggestions=4, cache_size=1024, profiler=None):
+        self.dictionary = dictionary
+        self.profiler = profiler
+        self.on_result = on_result
+        self.max_suggestions = max_suggestions
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.cond = threading.Condition()
+        self.wanted = None
+        self.pending = None
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="suggestions", daemon=True)
+        self.thread.start()
+
+    def lookup(self, word):
+        """Suggestions for word, from the cache or the dictionary"""
+        with self.cond:
+            cached = self._cached(word)
+        if cached is not None:
+            return cached
+        with self.profiler.measure("suggest") if self.profiler else nullcontext():
+            suggestions = self.dictionary.suggest(word)[:self.max_suggestions]
+        with self.cond:
+            self.misses += 1
+            self.cache[word] = suggestions
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return suggestions
+
+    def request(self, word):
+        with self.cond:
+            if word == self.wanted:
+                return
+            self.wanted = word
+            cached = self._cached(word)
+            if cached is None:
+                self.pending = word
+                self.cond.notify()
+                return
+            self.pending = None
+        self.on_result(word, cached)
+
+    def cancel(self):
+        """Forget the wanted word so a lookup still in flight is not delivered"""
+        with self.cond:
+            self.wanted = None
+            self.pending = None
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(1.0)
+
+    def _cached(self, word):
+        suggestions = self.cache.get(word)
+        if suggestions is not None:
+            self.cache.move_to_end(word)
+            self.hits += 1
+        return suggestions
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and self.pending is None:
+                    self.cond.wait()
+                if not self.running:
+                    return
+                word, self.pending = self.pending, None
+            suggestions = self.lookup(word)
+            with self.cond:
+                deliver = word == self.wanted
+            if deliver:
+                self.on_result(word, suggestions)
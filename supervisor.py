@@ -0,0 +1,206 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from paths import STATE_DIR
+
+RECOGNIZER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "final_pred.py")
+
+
+def _pid_alive(pid):
+    try:
+        import psutil
+        return psutil.pid_exists(pid) and psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # Reap our own child if it has exited, otherwise it lingers as a zombie
+    try:
+        done, _ = os.waitpid(pid, os.WNOHANG)
+        return done == 0
+    except ChildProcessError:
+        return True
+
+
+def _command_line(pid):
+    """Arguments of a running process, or None where they cannot be read"""
+    try:
+        import psutil
+        return psutil.Process(pid).cmdline()
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [arg.decode(errors="replace") for arg in f.read().split(b"\0") if arg]
+    except OSError:
+        return None
+
+
+def _create_time(pid):
+    """Wall-clock start time of a process, or None without psutil"""
+    try:
+        import psutil
+        return psutil.Process(pid).create_time()
+    except Exception:
+        return None
+
+
+def _is_recognizer(info):
+    """Whether the pid recorded in info is still the process that was started
+
+    A recognizer that crashed leaves its pid file behind, and the OS may give the pid to
+    another process. That process has a different command line, or started after the
+    recognizer was recorded.
+    """
+    pid = info['pid']
+    if not _pid_alive(pid):
+        return False
+    args = _command_line(pid)
+    # Just after Popen the child may not have exec'd the interpreter yet
+    if args is not None and info.get('script') not in args and time.time() - info['started'] > 5.0:
+        return False
+    created = _create_time(pid)
+    # Popen returns before 'started' is taken; allow for coarse process clocks
+    return created is None or created <= info['started'] + 1.0
+
+
+def mark_ready(**info):
+    """Called by the recognizer once it can predict; a no-op when not run by the supervisor
+
+    Extra keyword arguments (e.g. the startup report) are stored in the ready file.
+    """
+    path = os.environ.get("SIGN_READY_FILE")
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(info, pid=os.getpid(), ready_at=time.time()), f)
+
+
+class RecognizerSupervisor:
+    """Start final_pred.py once per host and track it through files in STATE_DIR
+
+    Every Streamlit session and rerun sees the same pid and ready files, so a second
+    launch finds the running instance instead of paying the model warm-up again.
+    """
+
+    def __init__(self, script=RECOGNIZER_SCRIPT, state_dir=STATE_DIR):
+        self.script = script
+        self.state_dir = state_dir
+        self.pid_file = os.path.join(state_dir, "recognizer.pid")
+        self.ready_file = os.path.join(state_dir, "recognizer.ready")
+        self.log_file = os.path.join(state_dir, "recognizer.log")
+
+    def _read_json(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _clear(self):
+        for path in (self.pid_file, self.ready_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def status(self):
+        """{'alive', 'ready', 'pid', 'uptime'} for the recorded instance"""
+        info = self._read_json(self.pid_file)
+        if not info or not _is_recognizer(info):
+            if info and _pid_alive(info['pid']):
+                # The pid now belongs to another process; forget the stale recognizer
+                self._clear()
+            return {'alive': False, 'ready': False, 'pid': None, 'uptime': 0.0}
+        ready = self._read_json(self.ready_file)
+        return {
+            'alive': True,
+            'ready': bool(ready and ready.get('pid') == info['pid']),
+            'pid': info['pid'],
+            'uptime': time.time() - info['started'],
+        }
+
+    def start(self):
+        """Start the recognizer unless one is already running; returns (started, status)"""
+        current = self.status()
+        if current['alive']:
+            return False, current
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        self._clear()
+        env = dict(os.environ, SIGN_READY_FILE=self.ready_file)
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Own session, so the recognizer outlives a restarted Streamlit server
+            kwargs['start_new_session'] = True
+        with open(self.log_file, "ab") as log:
+            proc = subprocess.Popen([sys.executable, self.script], cwd=os.path.dirname(self.script),
+                                    env=env, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                    **kwargs)
+        with open(self.pid_file, "w", encoding="utf-8") as f:
+            json.dump({'pid': proc.pid, 'started': time.time(), 'script': self.script}, f)
+        return True, self.status()
+
+    def wait_ready(self, timeout=60.0, poll=0.25):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            current = self.status()
+            if current['ready'] or not current['alive']:
+                return current
+            time.sleep(poll)
+        return self.status()
+
+    def stop(self, timeout=10.0):
+        """Ask the recognizer to close, killing it after timeout seconds; returns True if it was running"""
+        current = self.status()
+        if not current['alive']:
+            self._clear()
+            return False
+        info = self._read_json(self.pid_file)
+        pid = current['pid']
+        if sys.platform == "win32":
+            os.kill(pid, signal.CTRL_BREAK_EVENT)
+        else:
+            os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while _pid_alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if info and _is_recognizer(info):
+            os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+        self._clear()
+        return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the long-lived recognizer process")
+    parser.add_argument("command", choices=("start", "stop", "status"))
+    args = parser.parse_args()
+
+    supervisor = RecognizerSupervisor()
+    if args.command == "start":
+        started, state = supervisor.start()
+        print("Started" if started else "Already running", state)
+    elif args.command == "stop":
+        print("Stopped" if supervisor.stop() else "Not running")
+    else:
+        print(supervisor.status())
@@ -0,0 +1,200 @@
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+
+# "legacy" is the original 10-slot ring buffer, "majority" a confidence-weighted sliding-window
+# vote and "hmm" online Viterbi decoding over a sticky symbol HMM
+DECODERS = ("legacy", "majority", "hmm")
+
+BACKSPACE = "Backspace"
+NEXT = "next"
+SPACE = " "
+
+
+def apply_edits(text, edits):
+    """Apply the edits returned by a decoder's step() to the sentence"""
+    for edit in edits:
+        text = text[:-1] if edit == BACKSPACE else text + edit
+    return text
+
+
+class LegacyDecoder:
+    """The original commit logic of Application.predict, kept as the reference
+
+    A letter is committed on the rising edge of "next" by looking two slots back in a
+    ring of the last ten raw symbols. Every frame counts, so single-frame flicker can
+    commit the wrong letter.
+    """
+
+    def __init__(self):
+        self.prev_char = ""
+        self.count = -1
+        self.ten_prev_char = [" "] * 10
+        self.current = None
+
+    def step(self, symbol, confidence=1.0):
+        """Feed one per-frame symbol; returns the edits to apply to the sentence"""
+        edits = []
+        ring = self.ten_prev_char
+        if symbol == NEXT and self.prev_char != NEXT:
+            if ring[(self.count - 2) % 10] != NEXT:
+                edits.append(ring[(self.count - 2) % 10])
+            elif ring[self.count % 10] != BACKSPACE:
+                edits.append(ring[self.count % 10])
+
+        if symbol == "  " and self.prev_char != "  ":
+            edits.append("  ")
+
+        self.prev_char = symbol
+        self.current = symbol
+        self.count += 1
+        ring[self.count % 10] = symbol
+        return edits
+
+
+class _StableSymbolDecoder(ABC):
+    """Commit on transitions of a smoothed symbol instead of raw per-frame symbols
+
+    Subclasses implement smooth(symbol, confidence) and return the stable symbol, or None
+    while nothing is stable yet. A letter (or Backspace) that becomes stable is held and
+    committed when "next" becomes stable; a stable space is committed at once.
+    """
+
+    def __init__(self):
+        self.stable = None
+        self.held = None
+        self.current = None
+
+    def step(self, symbol, confidence=1.0):
+        stable = self.smooth(symbol, confidence)
+        self.current = stable if stable is not None else symbol
+        if stable is None or stable == self.stable:
+            return []
+        self.stable = stable
+        if stable == NEXT:
+            held, self.held = self.held, None
+            return [held] if held is not None else []
+        if stable == SPACE:
+            self.held = None
+            return [SPACE]
+        if isinstance(stable, str) and (stable == BACKSPACE or (len(stable) == 1 and stable.isalpha())):
+            self.held = stable
+        return []
+
+    @abstractmethod
+    def smooth(self, symbol, confidence):
+        """The stable symbol after this frame, or None while nothing is stable"""
+
+
+class MajorityDecoder(_StableSymbolDecoder):
+    """Confidence-weighted vote over the last `window` frames
+
+    A symbol becomes stable once it holds at least `enter` of the window's total weight;
+    the stable symbol then stays until another one does (hysteresis).
+    """
+
+    def __init__(self, window=7, enter=0.6):
+        super().__init__()
+        self.enter = enter
+        self.votes = deque(maxlen=window)
+
+    def smooth(self, symbol, confidence):
+        self.votes.append((symbol, confidence))
+        totals = {}
+        for s, c in self.votes:
+            totals[s] = totals.get(s, 0.0) + c
+        best = max(totals, key=totals.get)
+        if best != self.stable and totals[best] >= self.enter * sum(totals.values()):
+            return best
+        return self.stable
+
+
+class HmmDecoder(_StableSymbolDecoder):
+    """Online Viterbi over an HMM whose hidden state is the symbol being signed
+
+    Each state stays put with probability `stay` and otherwise switches uniformly. The
+    per-frame symbol is an observation that is right with probability equal to its
+    confidence, clipped to [floor, 1 - floor]. The stable symbol is the end of the best
+    path; a different end must beat it by `margin` (log units) before it takes over.
+    """
+
+    def __init__(self, stay=0.9, floor=0.05, margin=0.0):
+        super().__init__()
+        self.log_stay = math.log(stay)
+        self.switch = 1.0 - stay
+        self.floor = floor
+        self.margin = margin
+        self.scores = {}
+
+    def smooth(self, symbol, confidence):
+        confidence = min(max(confidence, self.floor), 1.0 - self.floor)
+        if symbol not in self.scores:
+            # Enter a symbol seen for the first time as if the path had just switched to it
+            self.scores[symbol] = max(self.scores.values(), default=0.0) + math.log(self.switch)
+        others = max(len(self.scores) - 1, 1)
+        log_switch = math.log(self.switch / others)
+        log_hit = math.log(confidence)
+        log_miss = math.log((1.0 - confidence) / others)
+
+        best_prev = max(self.scores.values())
+        for s, score in self.scores.items():
+            came_from = max(score + self.log_stay, best_prev + log_switch)
+            self.scores[s] = came_from + (log_hit if s == symbol else log_miss)
+        top = max(self.scores.values())
+        for s in self.scores:
+            self.scores[s] -= top
+
+        best = max(self.scores, key=self.scores.get)
+        if self.stable is None or (best != self.stable
+                                   and -self.scores.get(self.stable, -math.inf) >= self.margin):
+            return best
+        return self.stable
+
+
+def make_decoder(kind="legacy", window=7, enter=0.6, stay=0.9):
+    if kind == "legacy":
+        return LegacyDecoder()
+    if kind == "majority":
+        return MajorityDecoder(window, enter)
+    if kind == "hmm":
+        return HmmDecoder(stay)
+    raise ValueError(f"Unknown decoder '{kind}', expected one of {DECODERS}")
+
+
+def decoder_from_env(default="legacy"):
+    """SIGN_DECODER picks the decoder; SIGN_DECODER_WINDOW/_ENTER tune majority, SIGN_DECODER_STAY hmm"""
+    return make_decoder(
+        os.environ.get("SIGN_DECODER", default).strip().lower(),
+        window=int(os.environ.get("SIGN_DECODER_WINDOW", 7)),
+        enter=float(os.environ.get("SIGN_DECODER_ENTER", 0.6)),
+        stay=float(os.environ.get("SIGN_DECODER_STAY", 0.9)),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from recording import read_recording
+
+    parser = argparse.ArgumentParser(description="Decode recorded symbols with each decoder and print the sentences")
+    parser.add_argument("recordings", nargs="+", help="JSON lines written with SIGN_RECORD_LANDMARKS")
+    parser.add_argument("--decoders", default=",".join(DECODERS))
+    parser.add_argument("--window", type=int, default=7)
+    parser.add_argument("--enter", type=float, default=0.6)
+    parser.add_argument("--stay", type=float, default=0.9)
+    args = parser.parse_args()
+
+    for path in args.recordings:
+        frames = [f for f in read_recording(path) if 'symbol' in f]
+        print(f"{path}: {len(frames)} frames")
+        for kind in args.decoders.split(","):
+            decoder = make_decoder(kind, args.window, args.enter, args.stay)
+            text = " "
+            commits = 0
+            for frame in frames:
+                confidence = max(frame['prob']) if 'prob' in frame else 1.0
+                edits = decoder.step(frame['symbol'], confidence)
+                commits += len(edits)
+                text = apply_edits(text, edits)
+            print(f"  {kind:8s} {commits:4d} edits  {text!r}")
@@ -0,0 +1,123 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import activity
+from activity import ACTIVE, IDLE, ActivityScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def process_time(self):
+        return 0.0
+
+
+def still_frame():
+    return np.full((480, 640, 3), 100, np.uint8)
+
+
+def corner_hand_frame():
+    # An 80x80 patch is 2% of the frame, too little to move the mean difference much
+    frame = still_frame()
+    frame[:80, :80] = 220
+    return frame
+
+
+class ActivitySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(activity, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def idle_scheduler(self, **kwargs):
+        scheduler = ActivityScheduler(idle_after=5.0, **kwargs)
+        self.clock.now += 6.0
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, IDLE)
+        return scheduler
+
+    def test_goes_idle_after_idle_after_without_a_hand(self):
+        scheduler = ActivityScheduler(idle_after=5.0)
+        self.clock.now += 4.0
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, ACTIVE)
+        self.clock.now += 2.0
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, IDLE)
+        self.assertEqual(scheduler.capture_delay(), scheduler.idle_interval)
+        self.assertEqual(scheduler.paint_delay_ms(10), scheduler.idle_paint_ms)
+
+    def test_idle_after_zero_never_goes_idle(self):
+        scheduler = ActivityScheduler(idle_after=0)
+        self.clock.now += 3600.0
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, ACTIVE)
+        self.assertEqual(scheduler.capture_delay(), 0.0)
+
+    def test_still_frames_are_skipped(self):
+        scheduler = self.idle_scheduler(detect_every=0)
+        self.assertFalse(any(scheduler.should_detect(still_frame()) for _ in range(20)))
+        self.assertEqual(scheduler.skipped, 20)
+        self.assertEqual(scheduler.state, IDLE)
+
+    def test_hand_entering_a_corner_wakes(self):
+        scheduler = self.idle_scheduler(detect_every=0)
+        scheduler.should_detect(still_frame())
+        scheduler.should_detect(still_frame())
+        self.assertFalse(scheduler.should_detect(still_frame()))
+        self.assertTrue(scheduler.should_detect(corner_hand_frame()))
+        self.assertEqual(scheduler.state, ACTIVE)
+
+    def test_idle_detection_catches_a_hand_already_in_view(self):
+        scheduler = self.idle_scheduler(detect_every=10)
+        allowed = [scheduler.should_detect(still_frame()) for _ in range(20)]
+        self.assertEqual([i for i, a in enumerate(allowed, 1) if a], [10, 20])
+        self.assertEqual(scheduler.state, IDLE)
+
+        scheduler.report(True)
+        self.assertEqual(scheduler.state, ACTIVE)
+        self.assertEqual(scheduler.stats()['wakeups'], 1)
+        self.assertEqual(scheduler.stats()['idle_detections'], 2)
+
+    def test_idle_detection_without_a_hand_stays_idle(self):
+        scheduler = self.idle_scheduler(detect_every=2, every=3)
+        scheduler.should_detect(still_frame())
+        self.assertTrue(scheduler.should_detect(still_frame()))
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, IDLE)
+        self.assertEqual(scheduler.false_wakeups, 0)
+
+    def test_wake_up_latency_and_false_wake_ups(self):
+        scheduler = self.idle_scheduler(detect_every=0, every=1)
+        scheduler.should_detect(still_frame())
+        self.clock.now += 0.2
+        scheduler.should_detect(still_frame())
+        self.clock.now += 0.2
+        scheduler.should_detect(corner_hand_frame())
+        self.clock.now += 0.1
+        scheduler.report(True)
+        stats = scheduler.stats()
+        self.assertEqual(stats['wakeups'], 1)
+        self.assertAlmostEqual(stats['wake_latency_max'], 0.3)
+
+        # Motion that brings no hand goes back to sleep after idle_after
+        self.clock.now += 6.0
+        scheduler.report(False)
+        scheduler.should_detect(still_frame())
+        scheduler.should_detect(corner_hand_frame())
+        self.clock.now += 6.0
+        scheduler.report(False)
+        self.assertEqual(scheduler.state, IDLE)
+        self.assertEqual(scheduler.stats()['false_wakeups'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
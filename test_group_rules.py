@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from group_rules import GROUP_RULES, RuleEngine, top_two
+from replay_rules import legacy_classify, replay, synthetic_frames
+
+
+class RuleEngineTest(unittest.TestCase):
+    """The table-driven rules against the original if-chain kept in replay_rules.py"""
+
+    def test_pixel_engine_matches_legacy_rules(self):
+        total, mismatches, _ = replay(synthetic_frames(3000, seed=1))
+        self.assertEqual(total, 3000)
+        self.assertEqual(mismatches, [])
+
+    def test_palm_engine_matches_legacy_rules_on_rescaled_hands(self):
+        total, mismatches, _ = replay(synthetic_frames(1000, seed=2), RuleEngine(palm=100.0),
+                                      scales=(1.0, 0.5, 2.0))
+        self.assertEqual(total, 3000)
+        self.assertEqual(mismatches, [])
+
+    def test_palm_engine_ignores_hand_size(self):
+        engine = RuleEngine(palm=100.0)
+        for frame in synthetic_frames(200, seed=3):
+            pts = np.asarray(frame['pts'], dtype=np.float64)
+            palm = np.linalg.norm(pts[9] - pts[0])
+            # Inside PALM_LIMITS at both sizes, so nothing is clamped
+            if not 60 <= palm <= 160:
+                continue
+            self.assertEqual(engine.classify(frame['ch1'], frame['ch2'], pts),
+                             engine.classify(frame['ch1'], frame['ch2'], pts * 1.2))
+
+    def test_classify_accepts_lmlist_with_depth(self):
+        frame = next(synthetic_frames(1, seed=4))
+        lm_list = [pt + [0] for pt in frame['pts']]
+        self.assertEqual(RuleEngine().classify(frame['ch1'], frame['ch2'], lm_list),
+                         legacy_classify(frame['ch1'], frame['ch2'], np.asarray(frame['pts'])))
+
+    def test_unknown_predicate_is_rejected(self):
+        rules = GROUP_RULES + [("bad", [(0, 1)], "no_such_predicate", 1)]
+        with self.assertRaises(KeyError):
+            RuleEngine(group_rules=rules)
+
+    def test_top_two_breaks_ties_like_argmax(self):
+        self.assertEqual(top_two([0.1, 0.4, 0.4, 0.1]), (1, 2))
+        self.assertEqual(top_two([0.0, 0.0, 0.7, 0.3]), (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+if mongomock is not None:
+    from history_store import LAST_STORED_ID, HistoryStore
+
+
+@unittest.skipIf(mongomock is None, "needs mongomock")
+class HistoryStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = mongomock.MongoClient().db.sentences
+        self.store = HistoryStore(self.collection)
+        self.store.ensure_indexes()
+
+    def test_add_strips_and_counts(self):
+        self.assertEqual(self.store.add("  HELLO WORLD "), "HELLO WORLD")
+        doc = self.store.recent()[0]
+        self.assertEqual((doc['sentence'], doc['word_count'], doc['char_count']), ("HELLO WORLD", 2, 11))
+        self.assertNotIn('full_text', doc)
+
+    def test_consecutive_duplicate_is_not_stored(self):
+        self.assertEqual(self.store.add("HI"), "HI")
+        self.assertIsNone(self.store.add("HI "))
+        self.assertEqual(self.store.add("BYE"), "BYE")
+        self.assertEqual(self.store.add("HI"), "HI")
+        self.assertEqual([d['sentence'] for d in self.store.recent()], ["HI", "BYE", "HI"])
+
+    def test_pages_cover_history_newest_first(self):
+        for i in range(7):
+            self.store.add(f"S{i}")
+        seen = []
+        cursor = None
+        while True:
+            docs, cursor = self.store.page(limit=3, after=cursor)
+            seen += [d['sentence'] for d in docs]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"S{i}" for i in reversed(range(7))])
+
+    def test_delete_moves_the_duplicate_marker(self):
+        self.store.add("A")
+        self.store.add("B")
+        newest = self.store.recent()[0]
+        self.store.delete(newest['_id'])
+        self.assertEqual(self.store.last_sentence(), "A")
+        self.assertIsNone(self.store.add("A"))
+        self.assertEqual(self.store.add("B"), "B")
+
+    def test_ensure_indexes_seeds_the_marker_from_existing_history(self):
+        collection = mongomock.MongoClient().db.other
+        collection.insert_one({'sentence': "OLD ", 'timestamp': 1})
+        store = HistoryStore(collection)
+        store.ensure_indexes()
+        self.assertEqual(collection.find_one({'_id': LAST_STORED_ID})['sentence'], "OLD")
+        self.assertIsNone(store.add("OLD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from quality import OPERATING_POINTS, QualityController
+
+
+def controller(**kwargs):
+    # interval=0 checks the percentile on every observation
+    return QualityController(target_ms=100.0, interval=0.0, **kwargs)
+
+
+class QualityControllerTest(unittest.TestCase):
+
+    def test_steps_down_one_level_per_check_over_target(self):
+        quality = controller()
+        self.assertEqual(quality.observe(0.2), 1)
+        self.assertEqual(quality.observe(0.2), 2)
+        self.assertEqual(quality.changes, 2)
+
+    def test_stops_at_the_cheapest_point(self):
+        quality = controller()
+        for _ in range(20):
+            quality.observe(0.5)
+        self.assertEqual(quality.level, len(OPERATING_POINTS) - 1)
+        self.assertEqual(quality.scale(), OPERATING_POINTS[-1]['scale'])
+
+    def test_recovers_after_hold_calm_checks(self):
+        quality = controller(hold=3)
+        quality.observe(0.2)
+        self.assertEqual([quality.observe(0.01) for _ in range(3)], [1, 1, 0])
+
+    def test_latency_between_headroom_and_target_holds_the_level(self):
+        quality = controller(hold=2)
+        quality.observe(0.2)
+        for _ in range(10):
+            quality.observe(0.08)
+        self.assertEqual(quality.level, 1)
+
+    def test_a_spike_resets_the_calm_count(self):
+        quality = controller(hold=3, window=1)
+        quality.observe(0.2)
+        quality.observe(0.01)
+        quality.observe(0.01)
+        quality.observe(0.08)
+        quality.observe(0.01)
+        quality.observe(0.01)
+        self.assertEqual(quality.level, 1)
+        quality.observe(0.01)
+        self.assertEqual(quality.level, 0)
+
+    def test_target_zero_keeps_full_quality(self):
+        quality = QualityController(target_ms=0, interval=0.0)
+        for _ in range(10):
+            quality.observe(5.0)
+        self.assertEqual(quality.level, 0)
+
+    def test_should_infer_follows_the_operating_point(self):
+        points = ({'scale': 1.0, 'infer_every': 1, 'paint_ms': 10},
+                  {'scale': 1.0, 'infer_every': 3, 'paint_ms': 10})
+        quality = controller(points=points)
+        self.assertTrue(all(quality.should_infer() for _ in range(4)))
+        quality.observe(0.2)
+        quality.frames = 0
+        self.assertEqual([quality.should_infer() for _ in range(6)], [False, False, True, False, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
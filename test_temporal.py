@@ -0,0 +1,74 @@
+import unittest
+
+from temporal import (BACKSPACE, NEXT, SPACE, HmmDecoder, LegacyDecoder, MajorityDecoder, _StableSymbolDecoder,
+                      apply_edits, make_decoder)
+
+
+def decode(decoder, symbols):
+    edits = []
+    for symbol in symbols:
+        edits += decoder.step(symbol)
+    return edits
+
+
+# One frame of B while A is held, two frames before "next"
+FLICKER = ['A'] * 5 + ['B'] + ['A'] * 2 + [NEXT] * 5
+
+
+class ApplyEditsTest(unittest.TestCase):
+
+    def test_letters_spaces_and_backspace(self):
+        self.assertEqual(apply_edits("HI", [SPACE, "Y", "O", BACKSPACE]), "HI Y")
+
+    def test_backspace_on_empty_text(self):
+        self.assertEqual(apply_edits("", [BACKSPACE]), "")
+
+
+class LegacyDecoderTest(unittest.TestCase):
+
+    def test_commits_on_rising_edge_of_next(self):
+        self.assertEqual(decode(LegacyDecoder(), ['A'] * 6 + [NEXT] * 4), ['A'])
+
+    def test_commits_the_symbol_two_frames_back(self):
+        self.assertEqual(decode(LegacyDecoder(), FLICKER), ['B'])
+
+
+class StableDecoderTest(unittest.TestCase):
+
+    def test_flicker_does_not_commit(self):
+        self.assertEqual(decode(MajorityDecoder(), FLICKER), ['A'])
+        self.assertEqual(decode(HmmDecoder(), FLICKER), ['A'])
+
+    def test_letters_space_and_backspace(self):
+        symbols = ['A'] * 7 + [NEXT] * 7 + ['B'] * 7 + [NEXT] * 7 + [SPACE] * 7 + [BACKSPACE] * 7 + [NEXT] * 7
+        self.assertEqual(decode(MajorityDecoder(), symbols), ['A', 'B', SPACE, BACKSPACE])
+
+    def test_next_without_a_held_letter_commits_nothing(self):
+        self.assertEqual(decode(MajorityDecoder(), [NEXT] * 10), [])
+
+    def test_low_confidence_symbol_does_not_take_over(self):
+        decoder = HmmDecoder()
+        edits = []
+        for symbol, confidence in [('A', 0.9)] * 5 + [('B', 0.2)] * 2 + [('A', 0.9)] * 2 + [(NEXT, 0.9)] * 6:
+            edits += decoder.step(symbol, confidence)
+        self.assertEqual(edits, ['A'])
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            _StableSymbolDecoder()
+
+
+class MakeDecoderTest(unittest.TestCase):
+
+    def test_kinds(self):
+        self.assertIsInstance(make_decoder("legacy"), LegacyDecoder)
+        self.assertIsInstance(make_decoder("majority"), MajorityDecoder)
+        self.assertIsInstance(make_decoder("hmm"), HmmDecoder)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            make_decoder("beam")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import unittest
+from unittest import mock
+
+import translation
+from translation import TranslationCache, TranslationService, stub_backend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class TranslationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(translation, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = TranslationCache(":memory:", ttl=60, max_entries=3)
+        self.addCleanup(self.cache.close)
+
+    def test_get_returns_what_was_put(self):
+        self.assertIsNone(self.cache.get("HELLO", "fr"))
+        self.cache.put("HELLO", "fr", "BONJOUR")
+        self.assertEqual(self.cache.get("HELLO", "fr"), "BONJOUR")
+        self.assertIsNone(self.cache.get("HELLO", "de"))
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.put("HELLO", "fr", "BONJOUR")
+        self.clock.now += 59
+        self.assertEqual(self.cache.get("HELLO", "fr"), "BONJOUR")
+        self.clock.now += 2
+        self.assertIsNone(self.cache.get("HELLO", "fr"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for text in "ABC":
+            self.clock.now += 1
+            self.cache.put(text, "fr", text.lower())
+        self.clock.now += 1
+        self.cache.get("A", "fr")
+        self.clock.now += 1
+        self.cache.put("D", "fr", "d")
+        self.assertIsNone(self.cache.get("B", "fr"))
+        self.assertEqual([self.cache.get(t, "fr") for t in "ACD"], ["a", "c", "d"])
+
+
+class TranslationServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.cache = TranslationCache(":memory:")
+        self.service = TranslationService(self.backend, self.cache, max_workers=2, timeout=5.0)
+        self.addCleanup(self.service.close)
+
+    def backend(self, text, target):
+        self.calls.append((text, target))
+        if target == "xx":
+            raise ValueError("unsupported language")
+        return stub_backend(text, target)
+
+    def test_translations_are_cached(self):
+        self.assertEqual(self.service.translate("HI", "fr"), "[fr] HI")
+        self.assertEqual(self.service.translate("HI", "fr"), "[fr] HI")
+        self.assertEqual(self.calls, [("HI", "fr")])
+
+    def test_translate_many_reports_errors_per_pair(self):
+        results = self.service.translate_many(["HI", "HI", "BYE"], ["fr", "xx"])
+        self.assertEqual(set(results), {("HI", "fr"), ("HI", "xx"), ("BYE", "fr"), ("BYE", "xx")})
+        self.assertEqual(results[("BYE", "fr")], "[fr] BYE")
+        self.assertIsInstance(results[("HI", "xx")], ValueError)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_slow_translation_times_out(self):
+        release = threading.Event()
+        service = TranslationService(lambda text, target: release.wait(), timeout=0.05)
+        self.addCleanup(service.close)
+        self.addCleanup(release.set)
+        results = service.translate_many(["HI"], ["fr"])
+        self.assertIsInstance(results[("HI", "fr")], TimeoutError)
+
+
+if __name__ == "__main__":
+    unittest.main()
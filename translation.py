@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from paths import STATE_DIR
+
+TRANSLATION_CACHE_PATH = os.path.join(STATE_DIR, 'translations.sqlite')
+# "google" calls GoogleTranslator, "stub" answers locally for offline runs
+TRANSLATOR_BACKENDS = ("google", "stub")
+
+
+class TranslationCache:
+    """Persistent (text, target) -> translation cache in SQLite
+
+    Entries older than ttl seconds are ignored and purged; past max_entries the least
+    recently used rows are evicted.
+    """
+
+    def __init__(self, path=TRANSLATION_CACHE_PATH, ttl=7 * 24 * 3600, max_entries=20000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " text TEXT NOT NULL, target TEXT NOT NULL, translation TEXT NOT NULL,"
+            " created REAL NOT NULL, used REAL NOT NULL, PRIMARY KEY (text, target))")
+        self.db.execute("CREATE INDEX IF NOT EXISTS translations_used ON translations (used)")
+        self.db.commit()
+
+    def get(self, text, target):
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT translation FROM translations WHERE text = ? AND target = ? AND created > ?",
+                (text, target, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE translations SET used = ? WHERE text = ? AND target = ?", (now, text, target))
+            self.db.commit()
+            return row[0]
+
+    def put(self, text, target, translation):
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                            (text, target, translation, now, now))
+            self._evict(now)
+            self.db.commit()
+
+    def _evict(self, now):
+        self.db.execute("DELETE FROM translations WHERE created <= ?", (now - self.ttl,))
+        (count,) = self.db.execute("SELECT COUNT(*) FROM translations").fetchone()
+        if count > self.max_entries:
+            self.db.execute(
+                "DELETE FROM translations WHERE rowid IN"
+                " (SELECT rowid FROM translations ORDER BY used LIMIT ?)", (count - self.max_entries,))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def google_backend(text, target):
+    from resources import get_translator
+    return get_translator(target).translate(text)
+
+
+def stub_backend(text, target):
+    return f"[{target}] {text}"
+
+
+class TranslationService:
+    """Cached, concurrent translation; errors and timeouts are raised to the caller"""
+
+    def __init__(self, backend=google_backend, cache=None, max_workers=8, timeout=10.0):
+        self.backend = backend
+        self.cache = cache
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+
+    def _cached(self, text, target):
+        return self.cache.get(text, target) if self.cache else None
+
+    def _call(self, text, target):
+        translation = self.backend(text, target)
+        if self.cache:
+            self.cache.put(text, target, translation)
+        return translation
+
+    def translate(self, text, target):
+        cached = self._cached(text, target)
+        if cached is not None:
+            return cached
+        return self.pool.submit(self._call, text, target).result(timeout=self.timeout)
+
+    def translate_many(self, texts, targets):
+        """{(text, target): translation or the exception it raised} for every pair
+
+        Cache misses are translated concurrently; anything still running after the
+        timeout is reported as a TimeoutError.
+        """
+        results = {}
+        futures = {}
+        for text in dict.fromkeys(texts):
+            for target in dict.fromkeys(targets):
+                cached = self._cached(text, target)
+                if cached is not None:
+                    results[(text, target)] = cached
+                else:
+                    futures[self.pool.submit(self._call, text, target)] = (text, target)
+        done, _ = wait(futures, timeout=self.timeout)
+        for future, key in futures.items():
+            if future in done:
+                results[key] = future.exception() or future.result()
+            else:
+                future.cancel()
+                results[key] = TimeoutError(f"translation to {key[1]} timed out")
+        return results
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.close()
+
+
+def translation_service_from_env():
+    """SIGN_TRANSLATOR picks the backend, SIGN_TRANSLATION_CACHE the SQLite file ('' disables it)
+
+    The cache defaults to translations.sqlite in STATE_DIR, not the working directory.
+    """
+    backend = os.environ.get("SIGN_TRANSLATOR", "google").strip().lower()
+    if backend not in TRANSLATOR_BACKENDS:
+        raise ValueError(f"Unknown translator '{backend}', expected one of {TRANSLATOR_BACKENDS}")
+    path = os.environ.get("SIGN_TRANSLATION_CACHE", TRANSLATION_CACHE_PATH)
+    cache = TranslationCache(path, ttl=float(os.environ.get("SIGN_TRANSLATION_TTL", 7 * 24 * 3600))) if path else None
+    return TranslationService(google_backend if backend == "google" else stub_backend, cache,
+                              timeout=float(os.environ.get("SIGN_TRANSLATION_TIMEOUT", 10.0)))
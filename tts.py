@@ -0,0 +1,172 @@
+import hashlib
+import os
+import queue
+import sys
+import threading
+
+from profiling import get_logger
+
+log = get_logger("sign.tts")
+
+# Why say() did not queue a text
+EMPTY = "empty"
+DUPLICATE = "duplicate"
+QUEUE_FULL = "queue full"
+
+
+def can_play_wav():
+    """Whether _play_wav has a player on this system"""
+    if sys.platform == "win32":
+        return True
+    try:
+        import simpleaudio
+    except ImportError:
+        return False
+    return True
+
+
+def _play_wav(path):
+    """Play a cached utterance; returns False when no player is available"""
+    if sys.platform == "win32":
+        import winsound
+        winsound.PlaySound(path, winsound.SND_FILENAME)
+        return True
+    try:
+        import simpleaudio
+    except ImportError:
+        return False
+    simpleaudio.WaveObject.from_wave_file(path).play().wait_done()
+    return True
+
+
+class TtsWorker:
+    """One pyttsx3 engine on its own thread, fed by a queue of utterances
+
+    say() returns immediately. Text already waiting or being spoken is not queued again,
+    and cancel() drops the queue and stops the current utterance at the next word. With
+    cache_dir set, each (text, voice, rate) is synthesized to a wav file once and replayed
+    from disk afterwards; without a wav player (simpleaudio off Windows) the cache is off.
+    """
+
+    def __init__(self, rate=150, voice_index=None, cache_dir=None, max_queue=8):
+        self.rate = rate
+        self.voice_index = voice_index
+        self.cache_dir = cache_dir
+        if cache_dir and not can_play_wav():
+            log.warning("No wav player (install simpleaudio); the speech cache is disabled")
+            self.cache_dir = None
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.lock = threading.Lock()
+        self.waiting = set()
+        self.speaking = None
+        self.cancelled = False
+        self.engine = None
+        # Set once the engine has been created (or failed to be); alive() tells which
+        self.started = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self.thread.start()
+
+    def say(self, text, rate=None):
+        """Queue text; returns True, or EMPTY, DUPLICATE or QUEUE_FULL when it was not queued"""
+        text = text.strip()
+        rate = rate or self.rate
+        key = (text, rate)
+        with self.lock:
+            if not text:
+                return EMPTY
+            if key in self.waiting or key == self.speaking:
+                return DUPLICATE
+            try:
+                self.queue.put_nowait(key)
+            except queue.Full:
+                return QUEUE_FULL
+            self.waiting.add(key)
+        return True
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            self.waiting.clear()
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def stop(self):
+        self.cancel()
+        self.queue.put(None)
+        self.thread.join(2.0)
+
+    def alive(self):
+        return self.thread.is_alive()
+
+    def _on_word(self, name, location, length):
+        if self.cancelled:
+            self.engine.stop()
+
+    def _init_engine(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        if self.voice_index is not None:
+            voices = self.engine.getProperty("voices")
+            self.engine.setProperty("voice", voices[self.voice_index].id)
+        self.engine.connect('started-word', self._on_word)
+
+    def _cache_path(self, text, rate):
+        voice = self.engine.getProperty("voice")
+        digest = hashlib.sha1(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".wav")
+
+    def _speak(self, text, rate):
+        self.engine.setProperty("rate", rate)
+        if self.cache_dir:
+            path = self._cache_path(text, rate)
+            if not os.path.exists(path):
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # A cancel() stops synthesis midway; only a complete file may be replayed later
+                partial = f"{path[:-4]}.{os.getpid()}.part.wav"
+                self.engine.save_to_file(text, partial)
+                self.engine.runAndWait()
+                if self.cancelled or not os.path.exists(partial) or not os.path.getsize(partial):
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                    if self.cancelled:
+                        return
+                else:
+                    os.replace(partial, path)
+            if os.path.exists(path) and _play_wav(path):
+                return
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def _run(self):
+        try:
+            self._init_engine()
+        except Exception as e:
+            log.error("Text-to-speech unavailable: %s", e)
+            return
+        finally:
+            self.started.set()
+        while True:
+            key = self.queue.get()
+            if key is None:
+                return
+            with self.lock:
+                if key not in self.waiting:
+                    continue
+                self.waiting.discard(key)
+                self.speaking = key
+                self.cancelled = False
+            try:
+                self._speak(*key)
+            except Exception as e:
+                log.warning("Text-to-speech error: %s", e)
+            finally:
+                with self.lock:
+                    self.speaking = None
+
+
+def tts_worker_from_env(rate=150, voice_index=None):
+    """SIGN_TTS_CACHE=dir enables the synthesized audio cache"""
+    return TtsWorker(rate, voice_index, os.environ.get("SIGN_TTS_CACHE") or None)